@@ -0,0 +1,1064 @@
+#!/usr/bin/env python
+"""Benchmark formatting the boxscore after each gumbo data update
+
+Compares the original Bot.format_boxscore_data() in bots/game_threads, which
+formats every row on every update, with the current version, which reformats
+only the rows for players touched by each game_diff patch. By default the
+timeline is a synthetic nine inning game, one diff per pitch, with the boxscore
+fields the formatter reads. Recorded data can be used instead:
+
+    gumbo.json = statsapi.get("game", {"gamePk": pk}) at the start of the game
+    diffs.json = list of statsapi.get("game_diff", ...) responses, in order
+
+Usage: python benchmarks/boxscore.py [gumbo.json diffs.json]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+tmpDir = tempfile.mkdtemp()
+args = sys.argv[1:]
+
+# redball parses command line args on import
+sys.argv = [sys.argv[0], "--quiet", "--data", tmpDir, "--log", tmpDir]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from redball import logger  # noqa: E402
+from bots import game_threads  # noqa: E402
+
+log = logger.get_logger(logger_name="benchmark", log_level="INFO", propagate=True)
+ROSTER = 13  # Position players per team, 9 start
+STAFF = 8  # Pitchers per team, 1 starts
+
+
+def legacy_format_boxscore_data(gumbo):
+    """Adapted from MLB-StatsAPI module.
+    Given gumbo data, format lists of batters, pitchers, and other boxscore data
+    """
+
+    boxData = {}
+    """boxData holds the dict to be returned"""
+
+    # Add away column headers
+    awayBatters = [
+        {
+            "namefield": gumbo["gameData"]["teams"]["away"]["teamName"]
+            + " Batters",
+            "ab": "AB",
+            "r": "R",
+            "h": "H",
+            "rbi": "RBI",
+            "bb": "BB",
+            "k": "K",
+            "lob": "LOB",
+            "avg": "AVG",
+            "ops": "OPS",
+            "personId": 0,
+            "substitution": False,
+            "note": "",
+            "name": gumbo["gameData"]["teams"]["away"]["teamName"] + " Batters",
+            "position": "",
+            "obp": "OBP",
+            "slg": "SLG",
+            "battingOrder": "",
+        }
+    ]
+    for batterId_int in [
+        x
+        for x in gumbo["liveData"]["boxscore"]["teams"]["away"]["batters"]
+        if gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+            "ID" + str(x)
+        ].get("battingOrder")
+    ]:
+        batterId = str(batterId_int)
+        namefield = (
+            str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            )[0]
+            if str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            )[-1]
+            == "0"
+            else "   "
+        )
+        namefield += " " + gumbo["liveData"]["boxscore"]["teams"]["away"][
+            "players"
+        ]["ID" + batterId]["stats"]["batting"].get("note", "")
+        namefield += (
+            gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"]
+            + "  "
+            + gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + batterId
+            ]["position"]["abbreviation"]
+        )
+        batter = {
+            "namefield": namefield,
+            "ab": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["atBats"]
+            ),
+            "r": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["runs"]
+            ),
+            "h": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["hits"]
+            ),
+            "rbi": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["rbi"]
+            ),
+            "bb": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["baseOnBalls"]
+            ),
+            "k": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["strikeOuts"]
+            ),
+            "lob": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["leftOnBase"]
+            ),
+            "avg": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["avg"]
+            ),
+            "ops": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["ops"]
+            ),
+            "personId": batterId_int,
+            "battingOrder": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            ),
+            "substitution": (
+                False
+                if str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                        "ID" + batterId
+                    ]["battingOrder"]
+                )[-1]
+                == "0"
+                else True
+            ),
+            "note": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + batterId
+            ]["stats"]["batting"].get("note", ""),
+            "name": gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"],
+            "position": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + batterId
+            ]["position"]["abbreviation"],
+            "obp": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["obp"]
+            ),
+            "slg": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["slg"]
+            ),
+        }
+        awayBatters.append(batter)
+
+    # Add home column headers
+    homeBatters = [
+        {
+            "namefield": gumbo["gameData"]["teams"]["home"]["teamName"]
+            + " Batters",
+            "ab": "AB",
+            "r": "R",
+            "h": "H",
+            "rbi": "RBI",
+            "bb": "BB",
+            "k": "K",
+            "lob": "LOB",
+            "avg": "AVG",
+            "ops": "OPS",
+            "personId": 0,
+            "substitution": False,
+            "note": "",
+            "name": gumbo["gameData"]["teams"]["home"]["teamName"] + " Batters",
+            "position": "",
+            "obp": "OBP",
+            "slg": "SLG",
+            "battingOrder": "",
+        }
+    ]
+    for batterId_int in [
+        x
+        for x in gumbo["liveData"]["boxscore"]["teams"]["home"]["batters"]
+        if gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+            "ID" + str(x)
+        ].get("battingOrder")
+    ]:
+        batterId = str(batterId_int)
+        namefield = (
+            str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            )[0]
+            if str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            )[-1]
+            == "0"
+            else "   "
+        )
+        namefield += " " + gumbo["liveData"]["boxscore"]["teams"]["home"][
+            "players"
+        ]["ID" + batterId]["stats"]["batting"].get("note", "")
+        namefield += (
+            gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"]
+            + "  "
+            + gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + batterId
+            ]["position"]["abbreviation"]
+        )
+        batter = {
+            "namefield": namefield,
+            "ab": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["atBats"]
+            ),
+            "r": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["runs"]
+            ),
+            "h": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["hits"]
+            ),
+            "rbi": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["rbi"]
+            ),
+            "bb": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["baseOnBalls"]
+            ),
+            "k": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["strikeOuts"]
+            ),
+            "lob": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["stats"]["batting"]["leftOnBase"]
+            ),
+            "avg": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["avg"]
+            ),
+            "ops": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["ops"]
+            ),
+            "personId": batterId_int,
+            "battingOrder": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["battingOrder"]
+            ),
+            "substitution": (
+                False
+                if str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                        "ID" + batterId
+                    ]["battingOrder"]
+                )[-1]
+                == "0"
+                else True
+            ),
+            "note": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + batterId
+            ]["stats"]["batting"].get("note", ""),
+            "name": gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"],
+            "position": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + batterId
+            ]["position"]["abbreviation"],
+            "obp": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["obp"]
+            ),
+            "slg": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + batterId
+                ]["seasonStats"]["batting"]["slg"]
+            ),
+        }
+        homeBatters.append(batter)
+
+    boxData.update({"awayBatters": awayBatters})
+    boxData.update({"homeBatters": homeBatters})
+
+    # Add away team totals
+    boxData.update(
+        {
+            "awayBattingTotals": {
+                "namefield": "Totals",
+                "ab": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["atBats"]
+                ),
+                "r": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["runs"]
+                ),
+                "h": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["hits"]
+                ),
+                "rbi": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["rbi"]
+                ),
+                "bb": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["baseOnBalls"]
+                ),
+                "k": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["strikeOuts"]
+                ),
+                "lob": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "batting"
+                    ]["leftOnBase"]
+                ),
+                "avg": "",
+                "ops": "",
+                "obp": "",
+                "slg": "",
+                "name": "Totals",
+                "position": "",
+                "note": "",
+                "substitution": False,
+                "battingOrder": "",
+                "personId": 0,
+            }
+        }
+    )
+    # Add home team totals
+    boxData.update(
+        {
+            "homeBattingTotals": {
+                "namefield": "Totals",
+                "ab": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["atBats"]
+                ),
+                "r": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["runs"]
+                ),
+                "h": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["hits"]
+                ),
+                "rbi": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["rbi"]
+                ),
+                "bb": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["baseOnBalls"]
+                ),
+                "k": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["strikeOuts"]
+                ),
+                "lob": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "batting"
+                    ]["leftOnBase"]
+                ),
+                "avg": "",
+                "ops": "",
+                "obp": "",
+                "slg": "",
+                "name": "Totals",
+                "position": "",
+                "note": "",
+                "substitution": False,
+                "battingOrder": "",
+                "personId": 0,
+            }
+        }
+    )
+
+    # Get batting notes
+    awayBattingNotes = {}
+    for n in gumbo["liveData"]["boxscore"]["teams"]["away"]["note"]:
+        awayBattingNotes.update(
+            {len(awayBattingNotes): n["label"] + "-" + n["value"]}
+        )
+
+    homeBattingNotes = {}
+    for n in gumbo["liveData"]["boxscore"]["teams"]["home"]["note"]:
+        homeBattingNotes.update(
+            {len(homeBattingNotes): n["label"] + "-" + n["value"]}
+        )
+
+    boxData.update({"awayBattingNotes": awayBattingNotes})
+    boxData.update({"homeBattingNotes": homeBattingNotes})
+
+    # Get pitching box
+    # Add away column headers
+    awayPitchers = [
+        {
+            "namefield": gumbo["gameData"]["teams"]["away"]["teamName"]
+            + " Pitchers",
+            "ip": "IP",
+            "h": "H",
+            "r": "R",
+            "er": "ER",
+            "bb": "BB",
+            "k": "K",
+            "hr": "HR",
+            "era": "ERA",
+            "p": "P",
+            "s": "S",
+            "name": gumbo["gameData"]["teams"]["away"]["teamName"] + " Pitchers",
+            "personId": 0,
+            "note": "",
+        }
+    ]
+    for pitcherId_int in gumbo["liveData"]["boxscore"]["teams"]["away"]["pitchers"]:
+        if pitcherId_int == 0:
+            log.warning("Invalid pitcher id found: 0")
+            continue
+
+        pitcherId = str(pitcherId_int)
+        namefield = gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"]
+        namefield += (
+            "  "
+            + gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note", "")
+            if gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note")
+            else ""
+        )
+        pitcher = {
+            "namefield": namefield,
+            "ip": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("inningsPitched", 0)
+            ),
+            "h": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("hits", 0)
+            ),
+            "r": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("runs", 0)
+            ),
+            "er": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("earnedRuns", 0)
+            ),
+            "bb": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("baseOnBalls", 0)
+            ),
+            "k": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("strikeOuts", 0)
+            ),
+            "hr": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("homeRuns", 0)
+            ),
+            "p": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get(
+                    "pitchesThrown",
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                        "ID" + pitcherId
+                    ]["stats"]["pitching"].get("numberOfPitches", 0),
+                )
+            ),
+            "s": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("strikes", 0)
+            ),
+            "era": str(
+                gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                    "ID" + pitcherId
+                ]["seasonStats"]["pitching"]["era"]
+            ),
+            "name": gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"],
+            "personId": pitcherId_int,
+            "note": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note", ""),
+        }
+        awayPitchers.append(pitcher)
+
+    boxData.update({"awayPitchers": awayPitchers})
+
+    # Add home column headers
+    homePitchers = [
+        {
+            "namefield": gumbo["gameData"]["teams"]["home"]["teamName"]
+            + " Pitchers",
+            "ip": "IP",
+            "h": "H",
+            "r": "R",
+            "er": "ER",
+            "bb": "BB",
+            "k": "K",
+            "hr": "HR",
+            "era": "ERA",
+            "p": "P",
+            "s": "S",
+            "name": gumbo["gameData"]["teams"]["home"]["teamName"] + " Pitchers",
+            "personId": 0,
+            "note": "",
+        }
+    ]
+    for pitcherId_int in gumbo["liveData"]["boxscore"]["teams"]["home"]["pitchers"]:
+        if pitcherId_int == 0:
+            log.warning("Invalid pitcher id found: 0")
+            continue
+
+        pitcherId = str(pitcherId_int)
+        namefield = gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"]
+        namefield += (
+            "  "
+            + gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note", "")
+            if gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note")
+            else ""
+        )
+        pitcher = {
+            "namefield": namefield,
+            "ip": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("inningsPitched", 0)
+            ),
+            "h": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("hits", 0)
+            ),
+            "r": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("runs", 0)
+            ),
+            "er": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("earnedRuns", 0)
+            ),
+            "bb": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("baseOnBalls", 0)
+            ),
+            "k": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("strikeOuts", 0)
+            ),
+            "hr": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("homeRuns", 0)
+            ),
+            "p": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get(
+                    "pitchesThrown",
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                        "ID" + pitcherId
+                    ]["stats"]["pitching"].get("numberOfPitches", 0),
+                )
+            ),
+            "s": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["stats"]["pitching"].get("strikes", 0)
+            ),
+            "era": str(
+                gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                    "ID" + pitcherId
+                ]["seasonStats"]["pitching"]["era"]
+            ),
+            "name": gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"],
+            "personId": pitcherId_int,
+            "note": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
+                "ID" + pitcherId
+            ]["stats"]["pitching"].get("note", ""),
+        }
+        homePitchers.append(pitcher)
+
+    boxData.update({"homePitchers": homePitchers})
+
+    # Get away team totals
+    boxData.update(
+        {
+            "awayPitchingTotals": {
+                "namefield": "Totals",
+                "ip": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["inningsPitched"]
+                ),
+                "h": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["hits"]
+                ),
+                "r": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["runs"]
+                ),
+                "er": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["earnedRuns"]
+                ),
+                "bb": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["baseOnBalls"]
+                ),
+                "k": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["strikeOuts"]
+                ),
+                "hr": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
+                        "pitching"
+                    ]["homeRuns"]
+                ),
+                "p": "",
+                "s": "",
+                "era": "",
+                "name": "Totals",
+                "personId": 0,
+                "note": "",
+            }
+        }
+    )
+
+    # Get home team totals
+    boxData.update(
+        {
+            "homePitchingTotals": {
+                "namefield": "Totals",
+                "ip": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["inningsPitched"]
+                ),
+                "h": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["hits"]
+                ),
+                "r": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["runs"]
+                ),
+                "er": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["earnedRuns"]
+                ),
+                "bb": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["baseOnBalls"]
+                ),
+                "k": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["strikeOuts"]
+                ),
+                "hr": str(
+                    gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
+                        "pitching"
+                    ]["homeRuns"]
+                ),
+                "p": "",
+                "s": "",
+                "era": "",
+                "name": "Totals",
+                "personId": 0,
+                "note": "",
+            }
+        }
+    )
+
+    # Get game info
+    boxData.update({"gameBoxInfo": gumbo["liveData"]["boxscore"].get("info", [])})
+
+    return boxData
+
+
+def make_player(personId, order=None, pitcher=False):
+    player = {
+        "person": {"id": personId, "fullName": "Player {}".format(personId)},
+        "position": {"abbreviation": "P" if pitcher else "CF"},
+        "stats": {
+            "batting": {
+                "atBats": 0,
+                "runs": 0,
+                "hits": 0,
+                "rbi": 0,
+                "baseOnBalls": 0,
+                "strikeOuts": 0,
+                "leftOnBase": 0,
+            },
+            "pitching": {},
+        },
+        "seasonStats": {
+            "batting": {"avg": ".250", "ops": ".700", "obp": ".320", "slg": ".380"},
+            "pitching": {"era": "3.50"},
+        },
+    }
+    if order:
+        player["battingOrder"] = str(order)
+
+    if pitcher:
+        player["stats"]["pitching"] = {
+            "inningsPitched": "0.0",
+            "hits": 0,
+            "runs": 0,
+            "earnedRuns": 0,
+            "baseOnBalls": 0,
+            "strikeOuts": 0,
+            "homeRuns": 0,
+            "numberOfPitches": 0,
+            "pitchesThrown": 0,
+            "strikes": 0,
+        }
+
+    return player
+
+
+def team_stats():
+    return {
+        "batting": {
+            "atBats": 0,
+            "runs": 0,
+            "hits": 0,
+            "rbi": 0,
+            "baseOnBalls": 0,
+            "strikeOuts": 0,
+            "leftOnBase": 0,
+        },
+        "pitching": {
+            "inningsPitched": "0.0",
+            "hits": 0,
+            "runs": 0,
+            "earnedRuns": 0,
+            "baseOnBalls": 0,
+            "strikeOuts": 0,
+            "homeRuns": 0,
+        },
+    }
+
+
+def person_id(side, n):
+    return (1000 if side == "away" else 2000) + n
+
+
+def make_gumbo():
+    # Starting gumbo data with starters in the lineup
+    gameData = {"teams": {}, "players": {}}
+    teams = {}
+    for side in ["away", "home"]:
+        gameData["teams"][side] = {"teamName": side.title() + "s"}
+        players = {}
+        for n in range(ROSTER + STAFF):
+            personId = person_id(side, n)
+            players["ID{}".format(personId)] = make_player(
+                personId,
+                order=(n + 1) * 100 if n < 9 else None,
+                pitcher=n >= ROSTER,
+            )
+            gameData["players"]["ID{}".format(personId)] = {
+                "boxscoreName": "Player{}".format(personId)
+            }
+
+        teams[side] = {
+            "team": {"id": 1 if side == "away" else 2},
+            "teamStats": team_stats(),
+            "players": players,
+            "batters": [person_id(side, n) for n in range(9)],
+            "pitchers": [person_id(side, ROSTER)],
+            "note": [],
+        }
+
+    return {
+        "gamePk": 1,
+        "metaData": {"timeStamp": "20240401_170000"},
+        "gameData": gameData,
+        "liveData": {
+            "plays": {"allPlays": []},
+            "boxscore": {"teams": teams, "info": [{"label": "Weather", "value": ""}]},
+        },
+    }
+
+
+def make_diffs():
+    # One game_diff response per pitch: [{"diff": [operations]}]
+    diffs = []
+    ts = 0
+    counts = {}  # path: value
+    lineup = {"away": 0, "home": 0}
+    pitcher = {"away": 0, "home": 0}
+    plays = 0
+
+    def inc(ops, path, amount=1):
+        counts[path] = counts.get(path, 0) + amount
+        ops.append({"op": "replace", "path": path, "value": counts[path]})
+
+    for inning in range(9):
+        for batting, pitching in [("away", "home"), ("home", "away")]:
+            box = "/liveData/boxscore/teams/"
+            if inning in [5, 7]:
+                # Pitching change
+                pitcher[pitching] += 1
+                newId = person_id(pitching, ROSTER + pitcher[pitching])
+                diffs.append(
+                    [
+                        {
+                            "diff": [
+                                {
+                                    "op": "add",
+                                    "path": box + pitching + "/pitchers/-",
+                                    "value": newId,
+                                }
+                            ]
+                        }
+                    ]
+                )
+
+            pitcherPath = box + "{}/players/ID{}/stats/pitching/".format(
+                pitching,
+                person_id(pitching, ROSTER + pitcher[pitching]),
+            )
+            for pa in range(4):
+                batterNum = lineup[batting] % 9
+                lineup[batting] += 1
+                batterId = person_id(batting, batterNum)
+                if inning == 6 and pa == 0:
+                    # Pinch hitter
+                    subId = person_id(batting, 9 + batterNum % 4)
+                    diffs.append(
+                        [
+                            {
+                                "diff": [
+                                    {
+                                        "op": "add",
+                                        "path": box + batting + "/batters/-",
+                                        "value": subId,
+                                    },
+                                    {
+                                        "op": "add",
+                                        "path": box
+                                        + "{}/players/ID{}/battingOrder".format(
+                                            batting, subId
+                                        ),
+                                        "value": str((batterNum + 1) * 100 + 1),
+                                    },
+                                    {
+                                        "op": "add",
+                                        "path": box + batting + "/note/-",
+                                        "value": {"label": "a", "value": "Batted for"},
+                                    },
+                                ]
+                            }
+                        ]
+                    )
+                    batterId = subId
+
+                batterPath = box + "{}/players/ID{}/stats/batting/".format(
+                    batting, batterId
+                )
+                for pitch in range(4):
+                    ts += 1
+                    ops = [
+                        {
+                            "op": "replace",
+                            "path": "/metaData/timeStamp",
+                            "value": "20240401_{:06d}".format(170000 + ts),
+                        },
+                        {
+                            "op": "add",
+                            "path": "/liveData/plays/allPlays/{}".format(plays),
+                            "value": {"pitch": pitch},
+                        }
+                        if pitch == 0
+                        else {
+                            "op": "replace",
+                            "path": "/liveData/plays/allPlays/{}/pitch".format(plays),
+                            "value": pitch,
+                        },
+                    ]
+                    inc(ops, pitcherPath + "numberOfPitches")
+                    inc(ops, pitcherPath + "pitchesThrown")
+                    inc(ops, pitcherPath + "strikes")
+                    if pitch == 3:
+                        # Result of the plate appearance
+                        inc(ops, batterPath + "atBats")
+                        inc(ops, box + batting + "/teamStats/batting/atBats")
+                        if pa % 2:
+                            inc(ops, batterPath + "hits")
+                            inc(ops, box + batting + "/teamStats/batting/hits")
+                            inc(ops, pitcherPath + "hits")
+                            inc(ops, box + pitching + "/teamStats/pitching/hits")
+                        else:
+                            inc(ops, batterPath + "strikeOuts")
+                            inc(ops, box + batting + "/teamStats/batting/strikeOuts")
+                            inc(ops, pitcherPath + "strikeOuts")
+                            inc(ops, box + pitching + "/teamStats/pitching/strikeOuts")
+
+                    diffs.append([{"diff": ops}])
+
+                plays += 1
+
+    return diffs
+
+
+def run(gumboJson, diffsJson, format):
+    # Apply each diff and format the boxscore after it, like collect_data()
+    # return (seconds spent formatting, list of formatted boxscores)
+    bot = game_threads.Bot(None, {})
+    bot.log = log
+    bot.boxscoreCache = {}
+    gumbo = json.loads(gumboJson)
+    total = 0
+    results = []
+    for diff in json.loads(diffsJson):
+        paths = []
+        if not bot.patch_dict(gumbo, diff, paths):
+            raise Exception("Patch failed")
+
+        start = time.perf_counter()
+        results.append(format(bot, gumbo, paths))
+        total += time.perf_counter() - start
+
+    return total, results
+
+
+def bench(label, gumboJson, diffsJson, format, repeat=5):
+    best = min(run(gumboJson, diffsJson, format)[0] for i in range(repeat))
+    updates = len(json.loads(diffsJson))
+    print(
+        "{:<40} {:8.2f} ms total, {:7.1f} us per update".format(
+            label, best * 1000, best / updates * 1000000
+        )
+    )
+    return best
+
+
+if __name__ == "__main__":
+    logging.getLogger("redball").setLevel("INFO")
+    if len(args) > 1:
+        with open(args[0]) as f:
+            gumboJson = f.read()
+
+        with open(args[1]) as f:
+            diffsJson = f.read()
+    else:
+        gumboJson = json.dumps(make_gumbo())
+        diffsJson = json.dumps(make_diffs())
+
+    print("Updates: {}".format(len(json.loads(diffsJson))))
+    before = bench(
+        "format_boxscore_data (before)",
+        gumboJson,
+        diffsJson,
+        lambda bot, gumbo, paths: legacy_format_boxscore_data(gumbo),
+    )
+    after = bench(
+        "format_boxscore_data (after)",
+        gumboJson,
+        diffsJson,
+        lambda bot, gumbo, paths: bot.format_boxscore_data(gumbo, pk=1, paths=paths),
+    )
+    full = bench(
+        "format_boxscore_data (after, no cache)",
+        gumboJson,
+        diffsJson,
+        lambda bot, gumbo, paths: bot.format_boxscore_data(gumbo),
+    )
+    print("Speedup: {:.1f}x".format(before / after))
+    print(
+        "Results match: {}".format(
+            run(gumboJson, diffsJson, lambda b, g, p: legacy_format_boxscore_data(g))[1]
+            == run(
+                gumboJson,
+                diffsJson,
+                lambda b, g, p: b.format_boxscore_data(g, pk=1, paths=p),
+            )[1]
+        )
+    )
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Benchmark per-row cost of materializing query results as dicts
+
+Compares the original dict_factory (walking cursor.description for every row)
+with the current db_qry path, using tables shaped like the game thread bots'
+processedAtBats and comments tables.
+
+Usage: python benchmarks/db_rows.py [rows]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+tmpDir = tempfile.mkdtemp()
+
+# redball parses command line args on import
+sys.argv = [sys.argv[0], "--quiet", "--data", tmpDir, "--log", tmpDir]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import redball  # noqa: E402
+from redball import database  # noqa: E402
+
+redball.DB_FILE = os.path.join(tmpDir, "bench.db")
+redball.log.setLevel("INFO")
+database.log.setLevel("INFO")
+
+
+def legacy_dict_factory(cursor, row):
+    d = {}
+    for idx, col in enumerate(cursor.description):
+        d[col[0]] = row[idx]
+
+    return d
+
+
+def legacy_db_qry(query):
+    # Original db_qry behavior: dict_factory per row and eager debug formatting
+    con = sqlite3.connect(redball.DB_FILE, timeout=30)
+    con.row_factory = legacy_dict_factory
+    res = con.cursor().execute(query).fetchall()
+    database.log.debug("Query result: {}.".format(res))
+    con.close()
+    return res
+
+
+def setup():
+    database.db_qry(
+        [
+            """CREATE TABLE IF NOT EXISTS rb_bot_1_processedAtBats (
+                id integer primary key autoincrement,
+                gamePk integer not null,
+                gameThreadId text not null,
+                processedAtBats text not null,
+                dateCreated text not null,
+                dateUpdated text not null
+            );""",
+            """CREATE TABLE IF NOT EXISTS rb_bot_1_comments (
+                id integer primary key autoincrement,
+                gamePk integer not null,
+                gameThreadId text not null,
+                atBatIndex integer not null,
+                actionIndex integer,
+                isScoringPlay integer,
+                eventType text,
+                myTeamBatting integer,
+                commentId text not null,
+                dateCreated text not null,
+                dateUpdated text not null,
+                deleted integer default 0
+            );""",
+        ],
+        commit=True,
+    )
+    database.db_qry_many(
+        "INSERT INTO rb_bot_1_processedAtBats (gamePk, gameThreadId, processedAtBats, dateCreated, dateUpdated) VALUES (?,?,?,?,?);",
+        (
+            (700000 + i, "abc{}".format(i), str(list(range(80))), "0", "0")
+            for i in range(ROWS)
+        ),
+    )
+    database.db_qry_many(
+        "INSERT INTO rb_bot_1_comments (gamePk, gameThreadId, atBatIndex, actionIndex, isScoringPlay, eventType, myTeamBatting, commentId, dateCreated, dateUpdated) VALUES (?,?,?,?,?,?,?,?,?,?);",
+        (
+            (
+                700000 + i // 80,
+                "abc",
+                i % 80,
+                None,
+                i % 7 == 0,
+                "single",
+                1,
+                "c",
+                "0",
+                "0",
+            )
+            for i in range(ROWS)
+        ),
+    )
+
+
+def bench(label, fn):
+    # Best of several runs, to reduce noise from other processes
+    best = min(timeit.repeat(fn, number=1, repeat=7))
+    print("{:<40} {:>8.0f} ns/row".format(label, best / ROWS * 1e9))
+
+
+if __name__ == "__main__":
+    setup()
+    print("Rows per table: {}".format(ROWS))
+    for table in ["rb_bot_1_processedAtBats", "rb_bot_1_comments"]:
+        q = "SELECT * FROM {};".format(table)
+        bench("{} (before)".format(table), lambda: legacy_db_qry(q))
+        bench("{} (after)".format(table), lambda: database.db_qry(q))
+
+    database.close_connections(allThreads=True)
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+"""Benchmark applying StatsAPI game_diff patches to cached gumbo data
+
+Compares the original Bot.patch_dict() path walker in bots/game_threads with
+redball.jsonpatch, over a game_diff sequence. By default the sequence is a
+synthetic nine inning game, one diff per pitch, shaped like live gumbo data.
+Recorded data can be used instead:
+
+    gumbo.json = statsapi.get("game", {"gamePk": pk}) at the start of the game
+    diffs.json = list of statsapi.get("game_diff", ...) responses, in order
+
+Usage: python benchmarks/json_patch.py [gumbo.json diffs.json]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+tmpDir = tempfile.mkdtemp()
+args = sys.argv[1:]
+
+# redball parses command line args on import
+sys.argv = [sys.argv[0], "--quiet", "--data", tmpDir, "--log", tmpDir]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from redball import jsonpatch, logger  # noqa: E402
+
+log = logger.get_logger(logger_name="benchmark", log_level="INFO", propagate=True)
+
+
+def notify(msg):
+    pass
+
+
+def legacy_patch_dict(theDict, patch):
+    # theDict = dict to patch
+    # patch = patch to apply to theDict
+    # return patched dict
+    for x in patch:
+        log.debug(f"x:{patch.index(x)}, len(patch): {len(patch)}")
+        for d in x.get("diff", []):
+            try:
+                if d.get("op") is not None:
+                    value = d.get("value")
+                    if value is not None or d.get("op") == "remove":
+                        path = d.get("path", "").split("/")
+                        target = theDict
+                        for i, p in enumerate(path[1:]):
+                            if i == len(path) - 2:
+                                # end of the path--set the value
+                                if d.get("op") == "add":
+                                    if isinstance(target, list):
+                                        target.append(value)
+                                        continue
+                                    elif isinstance(target, dict):
+                                        target[p] = value
+                                        continue
+                                elif d.get("op") == "remove":
+                                    try:
+                                        if isinstance(target, list):
+                                            if int(p) < len(target):
+                                                target.pop(
+                                                    int(p)
+                                                    if isinstance(target, list)
+                                                    else p
+                                                )
+                                            else:
+                                                log.warning(
+                                                    f"Index {p} does not exist in target list: {target}"
+                                                )
+                                        elif isinstance(target, dict):
+                                            if p in target.keys():
+                                                target.pop(p)
+                                            else:
+                                                log.warning(
+                                                    f"Key {p} does not exist in target dict: {target}"
+                                                )
+                                        else:
+                                            log.warning(
+                                                f"Not sure how to remove {p} from target: {target}"
+                                            )
+                                    except Exception as e:
+                                        log.error(
+                                            f"Error removing {path}: {e}"
+                                        )
+                                        notify(
+                                            f"Error patching dict--cannot remove {path} from target [{target}]"
+                                        )
+                                    continue
+                                elif d.get("op") == "replace":
+                                    if isinstance(target, list):
+                                        if len(target) > 0 and len(target) > int(p):
+                                            target[int(p)] = value
+                                        elif int(p) == len(target):
+                                            target.append(value)
+                                        else:
+                                            log.warning(
+                                                f"Data discrepancy found while patching gumbo data: List is not long enough to replace index {p} (len: {len(target)})"
+                                            )
+                                            return False
+                                    else:
+                                        target[p] = value
+                                    continue
+                            elif (
+                                isinstance(target, dict)
+                                and target.get(
+                                    int(p) if isinstance(target, list) else p
+                                )
+                                is None
+                            ) or (
+                                isinstance(target, list) and len(target) <= int(p)
+                            ):
+                                # key does not exist
+                                if isinstance(path[i + 1], int):
+                                    # next hop is a list
+                                    if isinstance(target, list):
+                                        if len(target) == int(p):
+                                            target.append([])
+                                        else:
+                                            log.warning(
+                                                f"Data discrepancy found while patching gumbo data: List is not long enough to append index [{p}] (len: {len(target)})."
+                                            )
+                                            return False
+                                    else:
+                                        target[p] = []
+                                elif i == len(path) - 3 and d.get("op") == "add":
+                                    # next hop is the target key to add
+                                    # do nothing, because it will be handled on the next loop
+                                    continue
+                                else:
+                                    # next hop is a dict
+                                    if isinstance(target, list):
+                                        if len(target) == int(p):
+                                            target.append({})
+                                        else:
+                                            log.warning(
+                                                f"Data discrepancy found while patching gumbo data: List is not long enough (len: {len(target)}) to append index [{p}]."
+                                            )
+                                            return False
+                                    else:
+                                        target[p] = {}
+                            # point to next key in the path
+                            target = target[
+                                int(p) if isinstance(target, list) else p
+                            ]
+            except Exception as e:
+                log.error(f"Error patching gumbo data: {e}")
+                notify(f"Error patching gumbo data: {e}")
+                return False
+
+    log.debug("Patch complete.")
+    return True
+
+
+def make_gumbo(players=26):
+    # Starting gumbo data with the parts live game diffs touch most
+    def team(side):
+        return {
+            "team": {"id": 1 if side == "away" else 2},
+            "teamStats": {"batting": {"runs": 0, "hits": 0}, "pitching": {"runs": 0}},
+            "players": {
+                "ID{}".format(n): {
+                    "person": {"id": n, "fullName": "Player {}".format(n)},
+                    "battingOrder": str(n % 9 * 100 + 100),
+                    "stats": {
+                        "batting": {"atBats": 0, "hits": 0, "runs": 0, "rbi": 0},
+                        "pitching": {"numberOfPitches": 0, "strikes": 0, "outs": 0},
+                    },
+                    "seasonStats": {"batting": {"avg": ".250", "ops": ".700"}},
+                }
+                for n in range(
+                    (0 if side == "away" else players) + 1,
+                    (players if side == "away" else players * 2) + 1,
+                )
+            },
+        }
+
+    return {
+        "gamePk": 1,
+        "metaData": {"timeStamp": "20240401_170000", "gameEvents": []},
+        "gameData": {"status": {"abstractGameState": "Live", "statusCode": "I"}},
+        "liveData": {
+            "plays": {
+                "allPlays": [],
+                "currentPlay": {"count": {"balls": 0, "strikes": 0, "outs": 0}},
+                "scoringPlays": [],
+            },
+            "linescore": {
+                "currentInning": 1,
+                "inningHalf": "Top",
+                "balls": 0,
+                "strikes": 0,
+                "outs": 0,
+                "innings": [],
+                "teams": {"away": {"runs": 0, "hits": 0}, "home": {"runs": 0, "hits": 0}},
+            },
+            "boxscore": {"teams": {"away": team("away"), "home": team("home")}},
+        },
+    }
+
+
+def make_diffs(players=26):
+    # One game_diff response per pitch: [{"diff": [operations]}]
+    diffs = []
+    playIndex = 0
+    ts = 0
+    for inning in range(9):
+        diffs.append(
+            [
+                {
+                    "diff": [
+                        {
+                            "op": "add",
+                            "path": "/liveData/linescore/innings/{}".format(inning),
+                            "value": {"num": inning + 1, "away": {}, "home": {}},
+                        },
+                        {
+                            "op": "replace",
+                            "path": "/liveData/linescore/currentInning",
+                            "value": inning + 1,
+                        },
+                    ]
+                }
+            ]
+        )
+        for half, batting, pitching in [("Top", "away", "home"), ("Bottom", "home", "away")]:
+            pitcher = "ID{}".format((players + 1) if pitching == "home" else 1)
+            for batter in range(4):
+                batterId = "ID{}".format(
+                    (batter % players) + (1 if batting == "away" else players + 1)
+                )
+                diffs.append(
+                    [
+                        {
+                            "diff": [
+                                {
+                                    "op": "add",
+                                    "path": "/liveData/plays/allPlays/{}".format(
+                                        playIndex
+                                    ),
+                                    "value": {
+                                        "atBatIndex": playIndex,
+                                        "about": {"inning": inning + 1, "halfInning": half},
+                                        "matchup": {"batter": {"id": batterId}},
+                                        "playEvents": [],
+                                        "result": {},
+                                    },
+                                },
+                                {
+                                    "op": "replace",
+                                    "path": "/liveData/linescore/inningHalf",
+                                    "value": half,
+                                },
+                            ]
+                        }
+                    ]
+                )
+                for pitch in range(4):
+                    ts += 1
+                    ops = [
+                        {
+                            "op": "replace",
+                            "path": "/metaData/timeStamp",
+                            "value": "20240401_{:06d}".format(170000 + ts),
+                        },
+                        {
+                            "op": "add",
+                            "path": "/liveData/plays/allPlays/{}/playEvents/{}".format(
+                                playIndex, pitch
+                            ),
+                            "value": {
+                                "index": pitch,
+                                "isPitch": True,
+                                "details": {"description": "Ball", "code": "B"},
+                                "pitchData": {"startSpeed": 95.1, "zone": 11},
+                            },
+                        },
+                        {
+                            "op": "replace",
+                            "path": "/liveData/linescore/balls",
+                            "value": pitch,
+                        },
+                        {
+                            "op": "replace",
+                            "path": "/liveData/plays/currentPlay/count/balls",
+                            "value": pitch,
+                        },
+                        {
+                            "op": "replace",
+                            "path": "/liveData/boxscore/teams/{}/players/{}/stats/pitching/numberOfPitches".format(
+                                pitching, pitcher
+                            ),
+                            "value": ts,
+                        },
+                    ]
+                    if pitch == 3:
+                        ops += [
+                            {
+                                "op": "replace",
+                                "path": "/liveData/boxscore/teams/{}/players/{}/stats/batting/hits".format(
+                                    batting, batterId
+                                ),
+                                "value": inning + 1,
+                            },
+                            {
+                                "op": "replace",
+                                "path": "/liveData/plays/allPlays/{}/result".format(
+                                    playIndex
+                                ),
+                                "value": {"event": "Single", "rbi": 0},
+                            },
+                            {
+                                "op": "remove",
+                                "path": "/liveData/plays/allPlays/{}/playEvents/0/pitchData".format(
+                                    playIndex
+                                ),
+                            },
+                        ]
+
+                    diffs.append([{"diff": ops}])
+
+                playIndex += 1
+
+    return diffs
+
+
+# Cases where the original walker re-downloaded the gumbo or patched it wrong:
+# (description, document, operations, expected document or None if it can't apply)
+EDGE_CASES = [
+    (
+        "replace the next list index",
+        {"allPlays": [{"i": 0}]},
+        [{"op": "replace", "path": "/allPlays/1", "value": {"i": 1}}],
+        {"allPlays": [{"i": 0}, {"i": 1}]},
+    ),
+    (
+        "add under a missing parent",
+        {"allPlays": [{"i": 0}]},
+        [{"op": "add", "path": "/allPlays/0/runners/0", "value": {"r": 1}}],
+        {"allPlays": [{"i": 0, "runners": [{"r": 1}]}]},
+    ),
+    (
+        "add a null value",
+        {"result": {"rbi": 1}},
+        [{"op": "add", "path": "/result/description", "value": None}],
+        {"result": {"rbi": 1, "description": None}},
+    ),
+    (
+        "move",
+        {"a": {"x": 1}, "b": {}},
+        [{"op": "move", "from": "/a/x", "path": "/b/x"}],
+        {"a": {}, "b": {"x": 1}},
+    ),
+    (
+        "copy",
+        {"a": {"x": 1}, "b": {}},
+        [{"op": "copy", "from": "/a/x", "path": "/b/x"}],
+        {"a": {"x": 1}, "b": {"x": 1}},
+    ),
+    (
+        "escaped key",
+        {"a/b": 1},
+        [{"op": "replace", "path": "/a~1b", "value": 2}],
+        {"a/b": 2},
+    ),
+    (
+        "list index past the end",
+        {"allPlays": []},
+        [
+            {"op": "replace", "path": "/x", "value": 1},
+            {"op": "replace", "path": "/allPlays/5", "value": {}},
+        ],
+        None,
+    ),
+]
+
+
+def check_edge_cases(patch):
+    # Return the number of edge cases patched correctly, including leaving
+    # the document unchanged when the patch can't apply
+    passed = 0
+    for desc, doc, ops, expected in EDGE_CASES:
+        doc = json.loads(json.dumps(doc))
+        original = json.loads(json.dumps(doc))
+        ok = patch(doc, [{"diff": json.loads(json.dumps(ops))}])
+        if (expected is None and not ok and doc == original) or (
+            expected is not None and ok and doc == expected
+        ):
+            passed += 1
+
+    return passed
+
+
+def run(patch, gumbo, diffs):
+    # Apply each response in order, return the number that failed
+    failed = 0
+    for d in diffs:
+        if not patch(gumbo, d):
+            failed += 1
+
+    return failed
+
+
+def new_patch_dict(theDict, patch):
+    # Same as Bot.patch_dict()
+    try:
+        jsonpatch.apply_patch(
+            theDict, [d for x in patch for d in x.get("diff", [])], lenient=True
+        )
+    except jsonpatch.PatchError:
+        return False
+
+    return True
+
+
+def bench(label, patch, gumboJson, diffsJson, ops):
+    # Best of several runs; decoding the starting gumbo and diffs is not timed,
+    # and each run gets its own copy since patched values are not copied
+    data = []
+    best = min(
+        timeit.repeat(
+            "run(patch, *data[-1])",
+            setup="data.append((json.loads(gumboJson), json.loads(diffsJson)))",
+            number=1,
+            repeat=15,
+            globals={
+                "run": run,
+                "patch": patch,
+                "data": data,
+                "json": json,
+                "gumboJson": gumboJson,
+                "diffsJson": diffsJson,
+            },
+        )
+    )
+    doc = json.loads(gumboJson)
+    failed = run(patch, doc, json.loads(diffsJson))
+    print(
+        "{:<30} {:>8.1f} ms {:>8.2f} us/op {:>6} failed".format(
+            label, best * 1000, best / ops * 1e6, failed
+        )
+    )
+    return doc
+
+
+if __name__ == "__main__":
+    if len(args) > 1:
+        with open(args[0]) as f:
+            gumboJson = f.read()
+
+        with open(args[1]) as f:
+            diffsJson = f.read()
+    else:
+        gumboJson = json.dumps(make_gumbo())
+        diffsJson = json.dumps(make_diffs())
+
+    diffs = json.loads(diffsJson)
+    ops = sum(len(x.get("diff", [])) for d in diffs for x in d)
+    print("Diffs: {}, operations: {}".format(len(diffs), ops))
+    before = bench("patch_dict (before)", legacy_patch_dict, gumboJson, diffsJson, ops)
+    after = bench(
+        "jsonpatch.apply_patch (after)", new_patch_dict, gumboJson, diffsJson, ops
+    )
+    print("Results match: {}".format(before == after))
+    for label, patch in [
+        ("patch_dict (before)", legacy_patch_dict),
+        ("jsonpatch.apply_patch (after)", new_patch_dict),
+    ]:
+        print(
+            "{:<30} {}/{} edge cases handled".format(
+                label, check_edge_cases(patch), len(EDGE_CASES)
+            )
+        )
+
+    final = json.dumps(after)
+    t = min(timeit.repeat(lambda: json.loads(final), number=1, repeat=7))
+    print(
+        "Decoding full gumbo ({} KB) for comparison: {:.2f} ms".format(
+            len(final) // 1024, t * 1000
+        )
+    )
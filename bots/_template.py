@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 
-import time
 import threading
 
 import redball
@@ -41,7 +40,7 @@ def run(bot, settings):
             if i == 10:  # Log that you're still running every 10 minutes
                 tl.log.debug("Still alive...")
                 i = 0
-            time.sleep(1)
+            bot.sleep(1)
         else:  # If main thread has said to stop, we stop!
             tl.log.info("Bot {} (id={}) exiting...".format(bot.name, bot.id))
             break  # Exit the infinite loop to stop the bot
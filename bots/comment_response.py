@@ -346,7 +346,7 @@ def run(bot, settings):
                         limits
                     )
                 )
-                time.sleep(60)
+                bot.sleep(60)
             else:
                 tl.log.debug("Reddit API limits: {}".format(limits))
         else:  # If main thread has said to stop, we stop!
@@ -3,7 +3,6 @@
 by Todd Roberts
 """
 
-import time
 import threading
 
 import redball
@@ -58,7 +57,7 @@ def run(bot, settings):
             if i == 60:  # Log that you're still running every 60 seconds
                 tl.log.debug("Still alive...")
                 i = 0
-            time.sleep(1)
+            bot.sleep(1)
         else:  # If main thread has said to stop, we stop!
             tl.log.info("Bot {} (id={}) exiting...".format(bot.name, bot.id))
             break  # Exit the infinite loop to stop the bot
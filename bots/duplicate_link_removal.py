@@ -335,7 +335,7 @@ def run(bot, settings):
                 tl.log.error(
                     f"Sleeping for 10 seconds and then continuing after exception: {e}"
                 )
-                time.sleep(10)
+                bot.sleep(10)
         else:  # If main thread has said to stop, we stop!
             tl.log.info(f"Bot {bot.name} (id={bot.id}) exiting...")
             break  # Exit the infinite loop to stop the bot
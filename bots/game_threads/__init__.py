@@ -7,6 +7,7 @@ by Todd Roberts
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.schedulers import SchedulerNotRunningError
 from datetime import datetime, timedelta
+import hashlib
 import json
 import pytz
 import requests
@@ -18,13 +19,15 @@ import time
 import threading
 
 import redball
-from redball import database as rbdb, logger
+from redball import apicache, database as rbdb, jsonpatch, logger, metrics
 
 import os
 
 from mako.lookup import TemplateLookup
 import mako.exceptions
 
+from . import feed_watcher
+
 import pyprowl
 import statsapi
 import twitter
@@ -35,6 +38,31 @@ __version__ = "1.5.5"
 
 GENERIC_DATA_LOCK = threading.Lock()
 GAME_DATA_LOCK = threading.Lock()
+FEED_WATCHER_LOCK = threading.Lock()
+# commonData slices each thread type's templates depend on, hashed to skip
+# rendering when none changed: 0 = generic data, "pk" = the thread's game(s).
+# Gumbo data is represented by its timestamp, and boxscore is formatted from it.
+# "clock" = seconds per time bucket included for templates comparing times with
+# now (scoreboards, next game, game start), so they render at least that often
+GENERIC_DEPENDENCIES = ["today", "standings", "leagueSchedule", "myTeam", "teamSubs"]
+GAME_DEPENDENCIES = [
+    "schedule",
+    "gameTime",
+    "homeAway",
+    "oppTeam",
+    "gumbo",
+    "awayBattersVsProb",
+    "homeBattersVsProb",
+]
+RENDER_DEPENDENCIES = {
+    "weekly": {0: GENERIC_DEPENDENCIES, "clock": 60},
+    "off": {0: GENERIC_DEPENDENCIES, "clock": 60},
+    "gameday": {0: GENERIC_DEPENDENCIES, "pk": GAME_DEPENDENCIES, "clock": 60},
+    "game": {0: GENERIC_DEPENDENCIES, "pk": GAME_DEPENDENCIES, "clock": 60},
+    "post": {0: GENERIC_DEPENDENCIES, "pk": GAME_DEPENDENCIES, "clock": 60},
+}
+RENDER_MAX_AGE = 300  # Seconds, render anyway in case data changed in place
+SCHEDULE_MAX_AGE = 300  # Seconds to reuse schedule data while the feed is unchanged
 
 
 def run(bot, settings):
@@ -47,6 +75,7 @@ class Bot(object):
         self.bot = bot
         self.settings = settings
         self.staleThreads = []
+        self.lastSummary = (None, None)  # (summary, summary with Last Changed)
         self.BOT_PATH = os.path.dirname(os.path.realpath(__file__))
         self.BOT_TEMPLATE_PATH = []
         if self.settings.get("Bot", {}).get("TEMPLATE_PATH", "") != "":
@@ -69,8 +98,11 @@ class Bot(object):
             propagate=False,
         )
         self.log.debug(
-            "Game Thread Bot v{} received settings: {}. Template path: {}".format(
-                __version__, self.settings, self.BOT_TEMPLATE_PATH
+            logger.lazy(
+                "Game Thread Bot v{} received settings: {}. Template path: {}",
+                __version__,
+                self.settings,
+                self.BOT_TEMPLATE_PATH,
             )
         )
 
@@ -78,6 +110,7 @@ class Bot(object):
         self.dbTablePrefix = self.settings.get("Database").get(
             "dbTablePrefix", "gdt{}_".format(self.bot.id)
         )
+        self.db = rbdb.BotTables(self.dbTablePrefix, logg=self.log)
         self.build_tables()
 
         # Initialize Reddit API connection
@@ -199,17 +232,21 @@ class Bot(object):
                 "Ymd": todayObj.strftime("%Y%m%d"),
                 "Y": todayObj.strftime("%Y"),
             }
-            self.log.debug("Today is {}".format(self.today["Y-m-d"]))
+            self.log.debug(logger.lazy("Today is {}", self.today["Y-m-d"]))
 
             # Get season state
             self.seasonState = self.get_seasonState(self.myTeam["id"])
-            self.log.debug("Season state: {}".format(self.seasonState))
+            self.log.debug(logger.lazy("Season state: {}", self.seasonState))
 
             # Get today's games
             todayGamePks = self.get_gamePks(t=self.myTeam["id"], d=self.today["Y-m-d"])
             self.THREADS = {}  # Clear yesterday's threads
             self.activeGames = {}  # Clear yesterday's flags
             self.commonData = {}  # Clear data dict every day to save memory
+            self.feedWatchers = {}  # Yesterday's watchers stop when idle
+            self.boxscoreCache = {}  # Formatted boxscore rows by gamePk
+            self.renderFingerprints = {}  # key: (data fingerprint, time rendered)
+            self.genericFingerprint = (None, None)  # (commonData[0], fingerprint)
             self.collect_data(0)  # Collect generic data
 
             # Weekly thread
@@ -240,8 +277,8 @@ class Bot(object):
                     )
                     self.THREADS["WEEKLY_THREAD"].start()
                     self.log.debug(
-                        "Started weekly thread {}.".format(
-                            self.THREADS["WEEKLY_THREAD"]
+                        logger.lazy(
+                            "Started weekly thread {}.", self.THREADS["WEEKLY_THREAD"]
                         )
                     )
 
@@ -268,7 +305,7 @@ class Bot(object):
                     {"gameday": {"STOP_FLAG": False}}
                 )  # Game day thread is not specific to a gamePk
 
-                self.log.debug("activeGames: {}".format(self.activeGames))
+                self.log.debug(logger.lazy("activeGames: {}", self.activeGames))
 
                 for pk in todayGamePks:
                     self.commonData.update({pk: {"gamePk": pk}})
@@ -319,8 +356,9 @@ class Bot(object):
                         )
                         self.THREADS["GAMEDAY_THREAD"].start()
                         self.log.debug(
-                            "Started game day thread {}.".format(
-                                self.THREADS["GAMEDAY_THREAD"]
+                            logger.lazy(
+                                "Started game day thread {}.",
+                                self.THREADS["GAMEDAY_THREAD"],
                             )
                         )
 
@@ -348,8 +386,9 @@ class Bot(object):
                             )
                             self.THREADS[pk]["GAME_THREAD"].start()
                             self.log.debug(
-                                "Started game thread {}.".format(
-                                    self.THREADS[pk]["GAME_THREAD"]
+                                logger.lazy(
+                                    "Started game thread {}.",
+                                    self.THREADS[pk]["GAME_THREAD"],
                                 )
                             )
                         else:
@@ -378,8 +417,9 @@ class Bot(object):
                             )
                             self.THREADS[pk]["POSTGAME_THREAD"].start()
                             self.log.debug(
-                                "Started post game thread {}.".format(
-                                    self.THREADS[pk]["POSTGAME_THREAD"]
+                                logger.lazy(
+                                    "Started post game thread {}.",
+                                    self.THREADS[pk]["POSTGAME_THREAD"],
                                 )
                             )
                         else:
@@ -427,8 +467,8 @@ class Bot(object):
                                     and self.THREADS[pk]["GAME_THREAD"].is_alive()
                                 ):
                                     self.log.debug(
-                                        "Game thread for game {} looks fine...".format(
-                                            pk
+                                        logger.lazy(
+                                            "Game thread for game {} looks fine...", pk
                                         )
                                     )  # debug - need this here to see if the condition is working when the thread crashes
                                     # pass
@@ -467,8 +507,9 @@ class Bot(object):
                                     )
                                     self.THREADS[pk]["GAME_THREAD"].start()
                                     self.log.debug(
-                                        "Started game thread {}.".format(
-                                            self.THREADS[pk]["GAME_THREAD"]
+                                        logger.lazy(
+                                            "Started game thread {}.",
+                                            self.THREADS[pk]["GAME_THREAD"],
                                         )
                                     )
                                 else:
@@ -492,8 +533,9 @@ class Bot(object):
                                     and self.THREADS[pk]["POSTGAME_THREAD"].is_alive()
                                 ):
                                     self.log.debug(
-                                        "Post game thread for game {} looks fine...".format(
-                                            pk
+                                        logger.lazy(
+                                            "Post game thread for game {} looks fine...",
+                                            pk,
                                         )
                                     )  # debug - need this here to see if the condition is working when the thread crashes
                                     # pass
@@ -532,8 +574,9 @@ class Bot(object):
                                     )
                                     self.THREADS[pk]["POSTGAME_THREAD"].start()
                                     self.log.debug(
-                                        "Started post game thread {}.".format(
-                                            self.THREADS[pk]["POSTGAME_THREAD"]
+                                        logger.lazy(
+                                            "Started post game thread {}.",
+                                            self.THREADS[pk]["POSTGAME_THREAD"],
                                         )
                                     )
                                 else:
@@ -559,8 +602,9 @@ class Bot(object):
                                     and self.THREADS[pk]["COMMENT_THREAD"].is_alive()
                                 ):
                                     self.log.debug(
-                                        "Comment thread for game {} looks fine...".format(
-                                            pk
+                                        logger.lazy(
+                                            "Comment thread for game {} looks fine...",
+                                            pk,
                                         )
                                     )  # debug - need this here to see if the condition is working when the thread crashes
                                     pass
@@ -636,8 +680,9 @@ class Bot(object):
                                     )
                                     self.THREADS[pk]["COMMENT_THREAD"].start()
                                     self.log.debug(
-                                        "Started comment thread {}.".format(
-                                            self.THREADS[pk]["COMMENT_THREAD"]
+                                        logger.lazy(
+                                            "Started comment thread {}.",
+                                            self.THREADS[pk]["COMMENT_THREAD"],
                                         )
                                     )
                                 else:
@@ -694,8 +739,9 @@ class Bot(object):
                                 )
                                 self.THREADS["GAMEDAY_THREAD"].start()
                                 self.log.debug(
-                                    "Started game day thread {}.".format(
-                                        self.THREADS["GAMEDAY_THREAD"]
+                                    logger.lazy(
+                                        "Started game day thread {}.",
+                                        self.THREADS["GAMEDAY_THREAD"],
                                     )
                                 )
                             else:
@@ -714,17 +760,19 @@ class Bot(object):
                         ):
                             # There are still games pending/in progress
                             self.log.debug(
-                                "Active games/threads: {}".format(
+                                logger.lazy(
+                                    "Active games/threads: {}",
                                     [
                                         k
                                         for k, v in self.activeGames.items()
                                         if not v.get("STOP_FLAG", True)
                                         or not v.get("POST_STOP_FLAG", True)
-                                    ]
+                                    ],
                                 )
                             )
                             self.log.debug(
-                                "Active threads: {}".format(
+                                logger.lazy(
+                                    "Active threads: {}",
                                     [
                                         t
                                         for t in threading.enumerate()
@@ -734,7 +782,7 @@ class Bot(object):
                                                 self.bot.name.replace(" ", "-"),
                                             )
                                         )
-                                    ]
+                                    ],
                                 )
                             )
                             self.sleep(30)
@@ -785,7 +833,7 @@ class Bot(object):
             )
             self.THREADS["OFFDAY_THREAD"].start()
             self.log.debug(
-                "Started off day thread {}.".format(self.THREADS["OFFDAY_THREAD"])
+                logger.lazy("Started off day thread {}.", self.THREADS["OFFDAY_THREAD"])
             )
 
         while (
@@ -832,7 +880,9 @@ class Bot(object):
                 )
                 self.THREADS["OFFDAY_THREAD"].start()
                 self.log.debug(
-                    "Started off day thread {}.".format(self.THREADS["OFFDAY_THREAD"])
+                    logger.lazy(
+                        "Started off day thread {}.", self.THREADS["OFFDAY_THREAD"]
+                    )
                 )
 
             if (
@@ -848,16 +898,18 @@ class Bot(object):
             ):
                 # There are still active threads
                 self.log.debug(
-                    "Active games/threads: {}".format(
+                    logger.lazy(
+                        "Active games/threads: {}",
                         [
                             k
                             for k, v in self.activeGames.items()
                             if not v["STOP_FLAG"] or not v.get("POST_STOP_FLAG", True)
-                        ]
+                        ],
                     )
                 )
                 self.log.debug(
-                    "Active threads: {}".format(
+                    logger.lazy(
+                        "Active threads: {}",
                         [
                             t
                             for t in threading.enumerate()
@@ -866,7 +918,7 @@ class Bot(object):
                                     self.bot.id, self.bot.name.replace(" ", "-")
                                 )
                             )
-                        ]
+                        ],
                     )
                 )
                 self.sleep(30)
@@ -905,19 +957,15 @@ class Bot(object):
             return
 
         # Check DB for existing weekly thread
-        wq = "select * from {}threads where gamePk in ({}) and type='weekly' and deleted=0;".format(
-            self.dbTablePrefix,
-            ",".join(
-                [
-                    str(x)
-                    for x in range(
-                        int(self.weekly["weeklyDate"]["Ymd"]),
-                        int(datetime.today().strftime("%Y%m%d")) + 1,
-                    )
-                ]
-            ),
+        # Weekly threads are stored with gamePk = Ymd of the day they were posted
+        weeklyStart = datetime.strptime(self.weekly["weeklyDate"]["Ymd"], "%Y%m%d")
+        wThread = self.db.threads.find(
+            "weekly",
+            [
+                int((weeklyStart + timedelta(days=x)).strftime("%Y%m%d"))
+                for x in range((datetime.today() - weeklyStart).days + 1)
+            ],
         )
-        wThread = rbdb.db_qry(wq, closeAfter=True, logg=self.log)
 
         weeklyThread = None
         if len(wThread) > 0:
@@ -927,10 +975,7 @@ class Bot(object):
             weeklyThread = self.reddit.submission(wThread[0]["id"])
             if not weeklyThread.author:
                 self.log.warning("Weekly thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, weeklyThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(weeklyThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1136,10 +1181,7 @@ class Bot(object):
                 self.staleThreads = []
 
         # Check DB for existing off day thread
-        oq = "select * from {}threads where gamePk = {} and type='off' and deleted=0;".format(
-            self.dbTablePrefix, self.today["Ymd"]
-        )
-        offThread = rbdb.db_qry(oq, closeAfter=True, logg=self.log)
+        offThread = self.db.threads.find("off", int(self.today["Ymd"]))
 
         offDayThread = None
         if len(offThread) > 0:
@@ -1149,10 +1191,7 @@ class Bot(object):
             offDayThread = self.reddit.submission(offThread[0]["id"])
             if not offDayThread.author:
                 self.log.warning("Off day thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, offDayThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(offDayThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1228,14 +1267,25 @@ class Bot(object):
                     # Update generic data for division games and no-no/perfect game watch
                     self.collect_data(0)
                     # self.log.debug('data passed into render_template: {}'.format(self.commonData))#debug
-                    text = self.render_template(
-                        thread="off",
-                        templateType="thread",
-                        data=self.commonData,
-                        settings=self.settings,
-                    )
-                    self.log.debug("Rendered off day thread text: {}".format(text))
-                    if (
+                    fingerprint = self.data_fingerprint("off")
+                    text = None
+                    if self.render_needed(("off", "thread"), fingerprint):
+                        text = self.render_template(
+                            thread="off",
+                            templateType="thread",
+                            data=self.commonData,
+                            settings=self.settings,
+                        )
+                        self.log.debug(
+                            logger.lazy("Rendered off day thread text: {}", text)
+                        )
+                        if text:
+                            self.render_done(("off", "thread"), fingerprint)
+
+                    if text is None:
+                        self.log.info("No data changes for off day thread.")
+                        self.count_check_edit(offDayThread.id, "NA", edit=False)
+                    elif (
                         text != self.activeGames["off"]["offDayThreadText"]
                         and text != ""
                     ):
@@ -1255,6 +1305,7 @@ class Bot(object):
                             )
                         )
                         offDayThread.edit(text)
+                        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                         self.log.info("Off day thread edits submitted.")
                         self.count_check_edit(offDayThread.id, "NA", edit=True)
                         self.log_last_updated_date_in_db(offDayThread.id)
@@ -1326,8 +1377,9 @@ class Bot(object):
                     break
 
             self.log.debug(
-                "Off day thread stop criteria not met ({}).".format(
-                    update_off_thread_until
+                logger.lazy(
+                    "Off day thread stop criteria not met ({}).",
+                    update_off_thread_until,
                 )
             )  # debug - need this to tell if logic is working
 
@@ -1367,8 +1419,8 @@ class Bot(object):
             }
         )
         self.log.debug(
-            "Game day thread post time: {}".format(
-                self.activeGames[pk]["postTime_local"]
+            logger.lazy(
+                "Game day thread post time: {}", self.activeGames[pk]["postTime_local"]
             )
         )
         while (
@@ -1434,12 +1486,7 @@ class Bot(object):
                 self.staleThreads = []
 
         # Check if game day thread already posted (record in threads table with gamePk and type='gameday' for any of today's gamePks)
-        gdq = "select * from {}threads where type='gameday' and gamePk in ({}) and gameDate = '{}' and deleted=0;".format(
-            self.dbTablePrefix,
-            ",".join(str(i) for i in todayGamePks),
-            self.today["Y-m-d"],
-        )
-        gdThread = rbdb.db_qry(gdq, closeAfter=True, logg=self.log)
+        gdThread = self.db.threads.find("gameday", todayGamePks, self.today["Y-m-d"])
 
         gameDayThread = None
         if len(gdThread) > 0:
@@ -1449,10 +1496,7 @@ class Bot(object):
             gameDayThread = self.reddit.submission(gdThread[0]["id"])
             if not gameDayThread.author:
                 self.log.warning("Game day thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, gameDayThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(gameDayThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1502,18 +1546,15 @@ class Bot(object):
             self.activeGames[pk].update({"STOP_FLAG": True})
         else:
             # Check DB (record in pkThreads with gamePk and type='post' and gameDate=today)
-            pgq = "select * from {}threads where type='post' and gamePk in ({}) and gameDate = '{}' and deleted=0;".format(
-                self.dbTablePrefix,
-                ",".join(
-                    [
-                        str(x)
-                        for x in self.activeGames.keys()
-                        if isinstance(x, int) and x > 0 and x != pk
-                    ]
-                ),
+            pgThread = self.db.threads.find(
+                "post",
+                [
+                    x
+                    for x in self.activeGames.keys()
+                    if isinstance(x, int) and x > 0 and x != pk
+                ],
                 self.today["Y-m-d"],
             )
-            pgThread = rbdb.db_qry(pgq, closeAfter=True, logg=self.log)
 
             if len(pgThread) == len(self.activeGames) - 1:
                 self.log.info(
@@ -1555,7 +1596,9 @@ class Bot(object):
             for x in todayGamePks:
                 # Associate game day thread with each of today's gamePks
                 self.activeGames[x].update({"gameDayThread": gameDayThread})
-                self.log.debug("Associated game day thread with gamePk {}".format(x))
+                self.log.debug(
+                    logger.lazy("Associated game day thread with gamePk {}", x)
+                )
 
         while (
             not self.activeGames[pk]["STOP_FLAG"]
@@ -1576,14 +1619,27 @@ class Bot(object):
                     # Update generic data for division games and no-no/perfect game watch
                     self.collect_data(0)
                     # self.log.debug('data passed into render_template: {}'.format(self.commonData))#debug
-                    text = self.render_template(
-                        thread="gameday",
-                        templateType="thread",
-                        data=self.commonData,
-                        settings=self.settings,
-                    )
-                    self.log.debug("Rendered game day thread text: {}".format(text))
-                    if (
+                    fingerprint = self.data_fingerprint("gameday", todayGamePks)
+                    text = None
+                    if self.render_needed(("gameday", "thread"), fingerprint):
+                        text = self.render_template(
+                            thread="gameday",
+                            templateType="thread",
+                            data=self.commonData,
+                            settings=self.settings,
+                        )
+                        self.log.debug(
+                            logger.lazy("Rendered game day thread text: {}", text)
+                        )
+                        if text:
+                            self.render_done(("gameday", "thread"), fingerprint)
+
+                    if text is None:
+                        self.log.info("No data changes for game day thread.")
+                        self.count_check_edit(
+                            self.activeGames[pk]["gameDayThread"].id, "NA", edit=False
+                        )
+                    elif (
                         text != self.activeGames[pk].get("gameDayThreadText")
                         and text != ""
                     ):
@@ -1603,6 +1659,7 @@ class Bot(object):
                             )
                         )
                         self.activeGames[pk]["gameDayThread"].edit(text)
+                        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                         self.log.info("Game day thread edits submitted.")
                         self.count_check_edit(
                             self.activeGames[pk]["gameDayThread"].id, "NA", edit=True
@@ -1734,8 +1791,9 @@ class Bot(object):
                     break
 
             self.log.debug(
-                "Game day thread stop criteria not met ({}).".format(
-                    update_gameday_thread_until
+                logger.lazy(
+                    "Game day thread stop criteria not met ({}).",
+                    update_gameday_thread_until,
                 )
             )  # debug - need this to tell if logic is working
 
@@ -1763,10 +1821,7 @@ class Bot(object):
         )
 
         # Check if game thread is already posted
-        gq = "select * from {}threads where type='game' and gamePk = {} and gameDate = '{}' and deleted=0;".format(
-            self.dbTablePrefix, pk, self.today["Y-m-d"]
-        )
-        gThread = rbdb.db_qry(gq, closeAfter=True, logg=self.log)
+        gThread = self.db.threads.find("game", pk, self.today["Y-m-d"])
 
         gameThread = None
         if len(gThread) > 0:
@@ -1776,10 +1831,7 @@ class Bot(object):
             gameThread = self.reddit.submission(gThread[0]["id"])
             if not gameThread.author:
                 self.log.warning("Game thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, gameThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(gameThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1823,10 +1875,7 @@ class Bot(object):
                 self.activeGames[pk].update({"STOP_FLAG": True})
             else:
                 # Check DB (record in pkThreads with gamePk and type='post' and gameDate=today)
-                pgq = "select * from {}threads where type='post' and gamePk = {} and gameDate = '{}' and deleted=0;".format(
-                    self.dbTablePrefix, pk, self.today["Y-m-d"]
-                )
-                pgThread = rbdb.db_qry(pgq, closeAfter=True, logg=self.log)
+                pgThread = self.db.threads.find("post", pk, self.today["Y-m-d"])
 
                 if len(pgThread) > 0:
                     self.log.info(
@@ -1860,7 +1909,8 @@ class Bot(object):
                 }
             )
             self.log.debug(
-                "Game {} thread post time: {} (min of Game Start: {}, Post By: {}, Min Before: {})".format(
+                logger.lazy(
+                    "Game {} thread post time: {} (min of Game Start: {}, Post By: {}, Min Before: {})",
                     pk,
                     self.activeGames[pk]["postTime"],
                     gameStart,
@@ -1885,7 +1935,8 @@ class Bot(object):
                 )
                 if otherGame:
                     self.log.debug(
-                        "Other Game ({}) abstractGameCode: {} - codedGameState: {}".format(
+                        logger.lazy(
+                            "Other Game ({}) abstractGameCode: {} - codedGameState: {}",
                             otherGame["schedule"]["gamePk"],
                             otherGame["schedule"]["status"]["abstractGameCode"],
                             otherGame["schedule"]["status"]["codedGameState"],
@@ -2173,8 +2224,8 @@ class Bot(object):
                 )
                 self.THREADS[pk]["COMMENT_THREAD"].start()
                 self.log.debug(
-                    "Started comment thread {}.".format(
-                        self.THREADS[pk]["COMMENT_THREAD"]
+                    logger.lazy(
+                        "Started comment thread {}.", self.THREADS[pk]["COMMENT_THREAD"]
                     )
                 )
         else:
@@ -2211,8 +2262,9 @@ class Bot(object):
                 # Skip edit since thread was just posted
                 skipFlag = None
                 self.log.debug(
-                    "Skip flag is set, game {} thread does not need to be edited.".format(
-                        pk
+                    logger.lazy(
+                        "Skip flag is set, game {} thread does not need to be edited.",
+                        pk,
                     )
                 )
             else:
@@ -2221,15 +2273,32 @@ class Bot(object):
                 self.collect_data(0)
                 # Update data for this game
                 self.collect_data(pk)
-                text = self.render_template(
-                    thread="game",
-                    templateType="thread",
-                    data=self.commonData,
-                    gamePk=pk,
-                    settings=self.settings,
-                )
-                self.log.debug("rendered game {} thread text: {}".format(pk, text))
-                if text != self.activeGames[pk].get("gameThreadText") and text != "":
+                fingerprint = self.data_fingerprint("game", pk)
+                text = None
+                if self.render_needed(("game", pk, "thread"), fingerprint):
+                    text = self.render_template(
+                        thread="game",
+                        templateType="thread",
+                        data=self.commonData,
+                        gamePk=pk,
+                        settings=self.settings,
+                    )
+                    self.log.debug(
+                        logger.lazy("rendered game {} thread text: {}", pk, text)
+                    )
+                    if text:
+                        self.render_done(("game", pk, "thread"), fingerprint)
+
+                if text is None:
+                    self.log.info("No data changes for {} game thread.".format(pk))
+                    self.count_check_edit(
+                        self.activeGames[pk]["gameThread"].id,
+                        self.commonData[pk]["schedule"]["status"]["statusCode"],
+                        edit=False,
+                    )
+                elif (
+                    text != self.activeGames[pk].get("gameThreadText") and text != ""
+                ):
                     self.activeGames[pk].update({"gameThreadText": text})
                     # Add last updated timestamp
                     text += """
@@ -2240,6 +2309,7 @@ class Bot(object):
                         "%m/%d/%Y ^^^%I:%M:%S ^^^%p ^^^%Z"
                     )
                     self.activeGames[pk]["gameThread"].edit(text)
+                    metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                     self.log.info("Edits submitted for {} game thread.".format(pk))
                     self.count_check_edit(
                         self.activeGames[pk]["gameThread"].id,
@@ -2359,8 +2429,8 @@ class Bot(object):
                     break
 
             self.log.debug(
-                "Game thread stop criteria not met ({}).".format(
-                    update_game_thread_until
+                logger.lazy(
+                    "Game thread stop criteria not met ({}).", update_game_thread_until
                 )
             )  # debug - need this to tell if logic is working
 
@@ -2392,15 +2462,24 @@ class Bot(object):
                 gtWait = self.settings.get("Game Thread", {}).get("UPDATE_INTERVAL", 10)
                 if gtWait < 1:
                     gtWait = 1
+                gtnlWait = max(
+                    1,
+                    self.settings.get("Game Thread", {}).get(
+                        "UPDATE_INTERVAL_NOT_LIVE", 1
+                    ),
+                )
                 self.log.info(
-                    "Game {} is live (abstractGameCode: {}, codedGameState: {}), sleeping for {} seconds...".format(
+                    "Game {} is live (abstractGameCode: {}, codedGameState: {}), sleeping for {} seconds and until the game feed changes (max {} minutes)...".format(
                         pk,
                         self.commonData[pk]["schedule"]["status"]["abstractGameCode"],
                         self.commonData[pk]["schedule"]["status"]["codedGameState"],
                         gtWait,
+                        gtnlWait,
                     )
                 )
-                self.sleep(gtWait)
+                self.get_feed_watcher(pk).wait(
+                    "gameThread", minWait=gtWait, maxWait=gtnlWait * 60
+                )
             else:
                 # Update interval is in minutes (seconds only when game is live)
                 gtnlWait = self.settings.get("Game Thread", {}).get(
@@ -2478,7 +2557,8 @@ class Bot(object):
                 self.collect_data(pk)
             else:
                 self.log.debug(
-                    "Game {} is not yet final (abstractGameCode: {}, codedGameState: {}). Sleeping for 1 minute...".format(
+                    logger.lazy(
+                        "Game {} is not yet final (abstractGameCode: {}, codedGameState: {}). Sleeping for 1 minute...",
                         pk,
                         self.commonData[pk]["schedule"]["status"]["abstractGameCode"],
                         self.commonData[pk]["schedule"]["status"]["codedGameState"],
@@ -2506,10 +2586,7 @@ class Bot(object):
         # TODO: Skip for (straight?) doubleheader game 1?
         # TODO: Loop in case thread creation fails due to title template error or API error? At least break from update loop...
         # Game is over - check if postgame thread already posted (record in pkThreads with gamePk and type='post' and gameDate=today)
-        pgq = "select * from {}threads where type='post' and gamePk = {} and gameDate = '{}' and deleted=0;".format(
-            self.dbTablePrefix, pk, self.today["Y-m-d"]
-        )
-        pgThread = rbdb.db_qry(pgq, closeAfter=True, logg=self.log)
+        pgThread = self.db.threads.find("post", pk, self.today["Y-m-d"])
 
         postGameThread = None
         if len(pgThread) > 0:
@@ -2519,10 +2596,7 @@ class Bot(object):
             postGameThread = self.reddit.submission(pgThread[0]["id"])
             if not postGameThread.author:
                 self.log.warning("Post game thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, postGameThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(postGameThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -2651,7 +2725,9 @@ class Bot(object):
             if skipFlag:
                 skipFlag = None
                 self.log.debug(
-                    "Skipping edit for post game {} thread per skip flag...".format(pk)
+                    logger.lazy(
+                        "Skipping edit for post game {} thread per skip flag...", pk
+                    )
                 )
             else:
                 try:
@@ -2659,17 +2735,34 @@ class Bot(object):
                     self.collect_data(0)
                     # Update data for this game
                     self.collect_data(pk)
-                    text = self.render_template(
-                        thread="post",
-                        templateType="thread",
-                        data=self.commonData,
-                        gamePk=pk,
-                        settings=self.settings,
-                    )
-                    self.log.debug(
-                        "Rendered post game {} thread text: {}".format(pk, text)
-                    )
-                    if (
+                    fingerprint = self.data_fingerprint("post", pk)
+                    text = None
+                    if self.render_needed(("post", pk, "thread"), fingerprint):
+                        text = self.render_template(
+                            thread="post",
+                            templateType="thread",
+                            data=self.commonData,
+                            gamePk=pk,
+                            settings=self.settings,
+                        )
+                        self.log.debug(
+                            logger.lazy(
+                                "Rendered post game {} thread text: {}", pk, text
+                            )
+                        )
+                        if text:
+                            self.render_done(("post", pk, "thread"), fingerprint)
+
+                    if text is None:
+                        self.log.info(
+                            "No data changes for post game {} thread.".format(pk)
+                        )
+                        self.count_check_edit(
+                            self.activeGames[pk]["postGameThread"].id,
+                            self.commonData[pk]["schedule"]["status"]["statusCode"],
+                            edit=False,
+                        )
+                    elif (
                         text != self.activeGames[pk]["postGameThreadText"]
                         and text != ""
                     ):
@@ -2682,6 +2775,7 @@ class Bot(object):
                             "%m/%d/%Y ^^^%I:%M:%S ^^^%p ^^^%Z"
                         )
                         self.activeGames[pk]["postGameThread"].edit(text)
+                        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                         self.log.info("Post game {} thread edits submitted.".format(pk))
                         self.log_last_updated_date_in_db(
                             self.activeGames[pk]["postGameThread"].id
@@ -2815,11 +2909,15 @@ class Bot(object):
         myTeamBattingEvents = self.settings.get("Comments", {}).get(
             "MYTEAM_BATTING_EVENTS", []
         )
-        self.log.debug(f"Monitored myTeamBattingEvents: [{myTeamBattingEvents}]")
+        self.log.debug(
+            logger.lazy("Monitored myTeamBattingEvents: [{}]", myTeamBattingEvents)
+        )
         myTeamPitchingEvents = self.settings.get("Comments", {}).get(
             "MYTEAM_PITCHING_EVENTS", []
         )
-        self.log.debug(f"Monitored myTeamPitchingEvents: [{myTeamPitchingEvents}]")
+        self.log.debug(
+            logger.lazy("Monitored myTeamPitchingEvents: [{}]", myTeamPitchingEvents)
+        )
         processedAtBatRecord = self.get_processedAtBats_from_db(pk, gameThreadId)
         if not processedAtBatRecord:
             self.log.error(
@@ -2829,8 +2927,10 @@ class Bot(object):
         else:
             processedAtBats = processedAtBatRecord.get("processedAtBats", {})
             self.log.debug(
-                "Loaded processedAtBats from db: {}. Full record: {}".format(
-                    processedAtBats, processedAtBatRecord
+                logger.lazy(
+                    "Loaded processedAtBats from db: {}. Full record: {}",
+                    processedAtBats,
+                    processedAtBatRecord,
                 )
             )
 
@@ -2869,18 +2969,29 @@ class Bot(object):
                         {str(atBat["atBatIndex"]): {"c": False, "a": []}}
                     )
                     self.log.debug(
-                        f"Processing atBatIndex [{atBat['atBatIndex']}] - first time seeing this atBatIndex - actionIndex: {atBat['actionIndex']}"
+                        logger.lazy(
+                            "Processing atBatIndex [{}] - first time seeing this atBatIndex - actionIndex: {}",
+                            atBat["atBatIndex"],
+                            atBat["actionIndex"],
+                        )
                     )
                 elif processedAtBats[str(atBat["atBatIndex"])]["c"]:
                     # Already finished processing this at bat
                     self.log.debug(
-                        "Already processed atBatIndex {}.".format(atBat["atBatIndex"])
+                        logger.lazy(
+                            "Already processed atBatIndex {}.", atBat["atBatIndex"]
+                        )
                     )
                     continue
                 else:
                     # Processed this at bat but it wasn't complete yet
                     self.log.debug(
-                        f"Processing atBatIndex [{atBat['atBatIndex']}] - prior processing state: {processedAtBats.get(str(atBat['atBatIndex']),'not found')} - actionIndex: {atBat['actionIndex']}"
+                        logger.lazy(
+                            "Processing atBatIndex [{}] - prior processing state: {} - actionIndex: {}",
+                            atBat["atBatIndex"],
+                            processedAtBats.get(str(atBat["atBatIndex"]), "not found"),
+                            atBat["actionIndex"],
+                        )
                     )
 
                 for actionIndex in (
@@ -2893,7 +3004,8 @@ class Bot(object):
                         break
                     # Process action
                     self.log.debug(
-                        "Processing actionIndex {} for atBatIndex {}: [{}] (myTeamBatting: {}).".format(
+                        logger.lazy(
+                            "Processing actionIndex {} for atBatIndex {}: [{}] (myTeamBatting: {}).",
                             actionIndex,
                             atBat["atBatIndex"],
                             atBat["playEvents"][actionIndex],
@@ -2940,7 +3052,8 @@ class Bot(object):
                     ):
                         # Event type is wanted
                         self.log.debug(
-                            "Detected {}{} event (myTeamBatting: {}).".format(
+                            logger.lazy(
+                                "Detected {}{} event (myTeamBatting: {}).",
                                 atBat["playEvents"][actionIndex]["details"].get(
                                     "eventType",
                                     atBat["playEvents"][actionIndex]["details"]
@@ -2976,10 +3089,13 @@ class Bot(object):
                                 .replace(" ", "_"),
                             ),
                         )
-                        self.log.debug("Rendered comment text: {}".format(text))
+                        self.log.debug(logger.lazy("Rendered comment text: {}", text))
                         if text != "":
                             try:
                                 commentObj = gameThread.reply(text)
+                                metrics.BOT_REDDIT_REQUESTS.inc(
+                                    bot=self.bot.id, action="comment"
+                                )
                                 self.log.info(
                                     "Submitted comment to game thread {} for actionIndex {} for atBatIndex {}: {}".format(
                                         gameThreadId,
@@ -3056,14 +3172,15 @@ class Bot(object):
                     else:
                         # Event not wanted
                         self.log.debug(
-                            "Event {} not wanted.".format(
+                            logger.lazy(
+                                "Event {} not wanted.",
                                 atBat["playEvents"][actionIndex]["details"].get(
                                     "eventType",
                                     atBat["playEvents"][actionIndex]["details"]
                                     .get("event", "")
                                     .lower()
                                     .replace(" ", "_"),
-                                )
+                                ),
                             )
                         )
 
@@ -3073,8 +3190,11 @@ class Bot(object):
                 if atBat["about"]["isComplete"]:
                     # At bat is complete, so process the result
                     self.log.debug(
-                        "Processing result for atBatIndex {}: [{}] (myTeamBatting: {}).".format(
-                            atBat["atBatIndex"], atBat, myTeamBatting
+                        logger.lazy(
+                            "Processing result for atBatIndex {}: [{}] (myTeamBatting: {}).",
+                            atBat["atBatIndex"],
+                            atBat,
+                            myTeamBatting,
                         )
                     )
                     if (
@@ -3113,7 +3233,8 @@ class Bot(object):
                     ):
                         # Event type is wanted
                         self.log.debug(
-                            "Detected {}{} event (myTeamBatting: {}).".format(
+                            logger.lazy(
+                                "Detected {}{} event (myTeamBatting: {}).",
                                 atBat["result"].get(
                                     "eventType",
                                     atBat["result"]
@@ -3147,10 +3268,13 @@ class Bot(object):
                                 .replace(" ", "_"),
                             ),
                         )
-                        self.log.debug("Rendered comment text: {}".format(text))
+                        self.log.debug(logger.lazy("Rendered comment text: {}", text))
                         if text != "":
                             try:
                                 commentObj = gameThread.reply(text)
+                                metrics.BOT_REDDIT_REQUESTS.inc(
+                                    bot=self.bot.id, action="comment"
+                                )
                                 self.log.info(
                                     "Submitted comment to game thread {} for result of atBatIndex {}: {}".format(
                                         gameThreadId, atBat["atBatIndex"], text
@@ -3213,14 +3337,15 @@ class Bot(object):
                     else:
                         # Event not wanted
                         self.log.debug(
-                            "Event {} not wanted.".format(
+                            logger.lazy(
+                                "Event {} not wanted.",
                                 atBat["result"].get(
                                     "eventType",
                                     atBat["result"]
                                     .get("event", "")
                                     .lower()
                                     .replace(" ", "_"),
-                                )
+                                ),
                             )
                         )
 
@@ -3260,19 +3385,24 @@ class Bot(object):
                 )
                 self.sleep(gtnlWait * 60)
             elif self.commonData[pk]["schedule"]["status"]["abstractGameCode"] == "L":
-                # Update interval is in seconds (minutes for all other cases)
-                gtWait = self.settings.get("Game Thread", {}).get("UPDATE_INTERVAL", 10)
-                if gtWait < 1:
-                    gtWait = 1
+                # Woken by the feed watcher when there is new data
+                gtnlWait = max(
+                    1,
+                    self.settings.get("Game Thread", {}).get(
+                        "UPDATE_INTERVAL_NOT_LIVE", 1
+                    ),
+                )
                 self.log.info(
-                    "Game {} is live (abstractGameCode: {}, codedGameState: {}), sleeping for {} seconds...".format(
+                    "Game {} is live (abstractGameCode: {}, codedGameState: {}), waiting until the game feed changes (max {} minutes)...".format(
                         pk,
                         self.commonData[pk]["schedule"]["status"]["abstractGameCode"],
                         self.commonData[pk]["schedule"]["status"]["codedGameState"],
-                        gtWait,
+                        gtnlWait,
                     )
                 )
-                self.sleep(gtWait)
+                self.get_feed_watcher(pk).wait(
+                    "comments", minWait=0, maxWait=gtnlWait * 60
+                )
             else:
                 # Update interval is in minutes (seconds only when game is live)
                 gtnlWait = self.settings.get("Game Thread", {}).get(
@@ -3315,7 +3445,7 @@ class Bot(object):
             )
             if webhook_url:
                 self.log.debug(
-                    "Webhook{} URL for comment: [{}].".format(s, webhook_url)
+                    logger.lazy("Webhook{} URL for comment: [{}].", s, webhook_url)
                 )
                 webhook_text = self.render_template(
                     thread="comment",
@@ -3331,7 +3461,7 @@ class Bot(object):
                     commentText=commentText,
                 )
                 self.log.debug(
-                    "Rendered comment webhook{} text: {}".format(s, webhook_text)
+                    logger.lazy("Rendered comment webhook{} text: {}", s, webhook_text)
                 )
                 if webhook_text:
                     webhook_result = self.post_webhook(webhook_url, webhook_text)
@@ -3363,39 +3493,19 @@ class Bot(object):
         dateUpdated,
         deleted,
     ):
-        q = (
-            """INSERT INTO {}comments (
-                gamePk,
-                gameThreadId,
-                atBatIndex,
-                actionIndex,
-                isScoringPlay,
-                eventType,
-                myTeamBatting,
-                commentId,
-                dateCreated,
-                dateUpdated,
-                deleted
-            ) VALUES (
-                ?,?,?,?,?,?,?,?,?,?,?
-            );""".format(
-                self.dbTablePrefix
-            ),
-            (
-                pk,
-                gameThreadId,
-                atBatIndex,
-                actionIndex,
-                isScoringPlay,
-                eventType,
-                myTeamBatting,
-                commentId,
-                dateCreated,
-                dateUpdated,
-                deleted,
-            ),
+        i = self.db.comments.insert(
+            pk,
+            gameThreadId,
+            atBatIndex,
+            actionIndex,
+            isScoringPlay,
+            eventType,
+            myTeamBatting,
+            commentId,
+            dateCreated,
+            dateUpdated,
+            deleted,
         )
-        i = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
         if isinstance(i, str):
             self.log.error("Error inserting comment into database: {}".format(i))
             return False
@@ -3403,13 +3513,7 @@ class Bot(object):
             return True
 
     def get_processedAtBats_from_db(self, pk, gameThreadId):
-        sq = (
-            "SELECT * FROM {}processedAtBats WHERE gamePk=? and gameThreadId=?;".format(
-                self.dbTablePrefix
-            )
-        )
-        local_args = (pk, gameThreadId)
-        s = rbdb.db_qry((sq, local_args), fetchone=True, closeAfter=True, logg=self.log)
+        s = self.db.processedAtBats.find(pk, gameThreadId)
         if isinstance(s, str):
             # Error querying for existing row
             self.log.error(
@@ -3420,22 +3524,12 @@ class Bot(object):
         elif not s:
             # Row does not exist; insert it
             self.log.debug(
-                "Creating record in {}processedAtBats table...".format(
-                    self.dbTablePrefix
+                logger.lazy(
+                    "Creating record in {}processedAtBats table...", self.dbTablePrefix
                 )
             )
             ts = time.time()
-            emptyDict = json.dumps({})
-            q = "insert into {}processedAtBats (gamePk, gameThreadId, processedAtBats, dateCreated, dateUpdated) values ({}, '{}', '{}', '{}', '{}');".format(
-                self.dbTablePrefix,
-                pk,
-                gameThreadId,
-                emptyDict,
-                ts,
-                ts,
-            )
-
-            r = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+            r = self.db.processedAtBats.insert(pk, gameThreadId, {}, ts)
             if isinstance(r, str):
                 # Error inserting/updating row
                 self.log.error(
@@ -3455,8 +3549,8 @@ class Bot(object):
             # Row already exists; return the record
             s.update({"processedAtBats": json.loads(s.get("processedAtBats", "{}"))})
             self.log.debug(
-                "Found record in {}processedAtBats table: {}".format(
-                    self.dbTablePrefix, s
+                logger.lazy(
+                    "Found record in {}processedAtBats table: {}", self.dbTablePrefix, s
                 )
             )
             return s
@@ -3464,11 +3558,8 @@ class Bot(object):
         return None
 
     def update_processedAtBats_in_db(self, pk, gameThreadId, processedAtBats):
-        q = "UPDATE {}processedAtBats SET processedAtBats=?, dateUpdated=? where gamePk=? and gameThreadId=?;".format(
-            self.dbTablePrefix
-        )
-        local_args = (json.dumps(processedAtBats), time.time(), pk, gameThreadId)
-        r = rbdb.db_qry((q, local_args), commit=True, closeAfter=True, logg=self.log)
+        # Insert the row if it does not exist yet
+        r = self.db.processedAtBats.upsert(pk, gameThreadId, processedAtBats)
         if isinstance(r, str):
             # Error inserting/updating row
             self.log.error(
@@ -3481,187 +3572,47 @@ class Bot(object):
 
         return False
 
-    def patch_dict(self, theDict, patch):
+    def patch_dict(self, theDict, patch, paths=None):
         # theDict = dict to patch
-        # patch = patch to apply to theDict
-        # return patched dict
+        # patch = game_diff response: list of {"diff": [JSON Patch operations]}
+        # paths = list to extend with the paths changed by the patch
+        # return True if theDict was patched in place, False if it is unchanged
+        ops = [d for x in patch for d in x.get("diff", [])]
         if redball.DEV:
-            self.log.debug(f"theDict to be patched: {theDict}")
-            self.log.debug(f"patch to be applied: {patch}")
-        for x in patch:
-            self.log.debug(f"x:{patch.index(x)}, len(patch): {len(patch)}")
-            for d in x.get("diff", []):
-                if redball.DEV:
-                    self.log.debug(f"d:{d}")
-
-                try:
-                    if d.get("op") is not None:
-                        value = d.get("value")
-                        if value is not None or d.get("op") == "remove":
-                            path = d.get("path", "").split("/")
-                            target = theDict
-                            for i, p in enumerate(path[1:]):
-                                if redball.DEV:
-                                    self.log.debug(
-                                        f"i:{i}, p:{p}, type(target):{type(target)}"
-                                    )
-
-                                if i == len(path) - 2:
-                                    # end of the path--set the value
-                                    if d.get("op") == "add":
-                                        if isinstance(target, list):
-                                            if redball.DEV:
-                                                self.log.debug(
-                                                    f"appending [{value}] to target; target type:{type(target)}"
-                                                )
-
-                                            target.append(value)
-                                            continue
-                                        elif isinstance(target, dict):
-                                            if redball.DEV:
-                                                self.log.debug(
-                                                    f"setting target[{p}] to [{value}]; target type:{type(target)}"
-                                                )
-
-                                            target[p] = value
-                                            continue
-                                    elif d.get("op") == "remove":
-                                        if redball.DEV:
-                                            self.log.debug(
-                                                f"removing target[{p}]; target type:{type(target)}, target len:{len(target if not isinstance(target, int) and not isinstance(target, bool) else '')}"
-                                            )
-
-                                        try:
-                                            if isinstance(target, list):
-                                                if int(p) < len(target):
-                                                    target.pop(
-                                                        int(p)
-                                                        if isinstance(target, list)
-                                                        else p
-                                                    )
-                                                else:
-                                                    self.log.warning(
-                                                        f"Index {p} does not exist in target list: {target}"
-                                                    )
-                                            elif isinstance(target, dict):
-                                                if p in target.keys():
-                                                    target.pop(p)
-                                                else:
-                                                    self.log.warning(
-                                                        f"Key {p} does not exist in target dict: {target}"
-                                                    )
-                                            else:
-                                                self.log.warning(
-                                                    f"Not sure how to remove {p} from target: {target}"
-                                                )
-                                        except Exception as e:
-                                            self.log.error(
-                                                f"Error removing {path}: {e}"
-                                            )
-                                            self.error_notification(
-                                                f"Error patching dict--cannot remove {path} from target [{target}]"
-                                            )
-
-                                        continue
-                                    elif d.get("op") == "replace":
-                                        if redball.DEV:
-                                            self.log.debug(
-                                                f"updating target[{p}] to [{value}]; target type:{type(target)}"
-                                            )
+            self.log.debug(
+                logger.lazy("Applying {} patch operation(s): {}", len(ops), ops)
+            )
 
-                                        if isinstance(target, list):
-                                            if len(target) > 0 and len(target) > int(p):
-                                                target[int(p)] = value
-                                            elif int(p) == len(target):
-                                                if redball.DEV:
-                                                    self.log.debug(
-                                                        "op=replace, but provided index does not exist yet (it's next up); appending value to list"
-                                                    )
-
-                                                target.append(value)
-                                            else:
-                                                self.log.warning(
-                                                    f"Data discrepancy found while patching gumbo data: List is not long enough to replace index {p} (len: {len(target)})"
-                                                )
-                                                return False
-                                        else:
-                                            target[p] = value
-
-                                        continue
-                                elif (
-                                    isinstance(target, dict)
-                                    and target.get(
-                                        int(p) if isinstance(target, list) else p
-                                    )
-                                    is None
-                                ) or (
-                                    isinstance(target, list) and len(target) <= int(p)
-                                ):
-                                    # key does not exist
-                                    if isinstance(path[i + 1], int):
-                                        # next hop is a list
-                                        if redball.DEV:
-                                            self.log.debug(
-                                                f"missing key, adding list for target[{p}]"
-                                            )
+        if any(d.get("path") == "" and d.get("op") != "test" for d in ops):
+            # Replacing the whole document can't be done in place
+            self.log.warning(
+                "Patch replaces the whole gumbo document, which can't be applied in place."
+            )
+            return False
 
-                                        if isinstance(target, list):
-                                            if len(target) == int(p):
-                                                target.append([])
-                                            else:
-                                                self.log.warning(
-                                                    f"Data discrepancy found while patching gumbo data: List is not long enough to append index [{p}] (len: {len(target)})."
-                                                )
-                                                return False
-                                        else:
-                                            target[p] = []
-                                    elif i == len(path) - 3 and d.get("op") == "add":
-                                        # next hop is the target key to add
-                                        # do nothing, because it will be handled on the next loop
-                                        if redball.DEV:
-                                            self.log.debug(
-                                                "missing key, but not a problem because op=add; continuing..."
-                                            )
-                                        continue
-                                    else:
-                                        # next hop is a dict
-                                        if redball.DEV:
-                                            self.log.debug(
-                                                f"missing key, adding dict for target[{p}]"
-                                            )
+        try:
+            jsonpatch.apply_patch(theDict, ops, lenient=True)
+        except jsonpatch.PatchError as e:
+            self.log.warning(
+                f"Data discrepancy found while patching gumbo data: {logger.short_repr(str(e))}"
+            )
+            return False
+        except Exception as e:
+            self.log.error(f"Error patching gumbo data: {e}")
+            self.error_notification(f"Error patching gumbo data: {e}")
+            return False
 
-                                        if isinstance(target, list):
-                                            if len(target) == int(p):
-                                                target.append({})
-                                            else:
-                                                self.log.warning(
-                                                    f"Data discrepancy found while patching gumbo data: List is not long enough (len: {len(target)}) to append index [{p}]."
-                                                )
-                                                return False
-                                        else:
-                                            target[p] = {}
-                                # point to next key in the path
-                                target = target[
-                                    int(p) if isinstance(target, list) else p
-                                ]
-                                if redball.DEV:
-                                    self.log.debug(
-                                        f"type(target) after next hop: {type(target)}"
-                                    )
-                        else:
-                            # No value to add
-                            if redball.DEV:
-                                self.log.debug("no value")
-                    else:
-                        # No op
-                        if redball.DEV:
-                            self.log.debug("no op")
-                except Exception as e:
-                    self.log.error(f"Error patching gumbo data: {e}")
-                    self.error_notification(f"Error patching gumbo data: {e}")
-                    return False
+        if paths is not None:
+            # test operations don't change anything
+            paths.extend(
+                p
+                for d in ops
+                if d.get("op") != "test"
+                for p in [d.get("path"), d.get("from")]
+                if p is not None
+            )
 
-        self.log.debug("Patch complete.")
+        self.log.debug(logger.lazy("Patch complete ({} operations).", len(ops)))
         return True
 
     def get_gameStatus(self, pk, d=None):
@@ -3710,7 +3661,10 @@ class Bot(object):
 
     def get_seasonState(self, t=None):
         self.log.debug(
-            f"myteam league seasondateinfo: {self.myTeam['league']['seasonDateInfo']}"
+            logger.lazy(
+                "myteam league seasondateinfo: {}",
+                self.myTeam["league"]["seasonDateInfo"],
+            )
         )
         if self.settings.get("MLB", {}).get("SEASON_STATE_OVERRIDE"):
             self.log.debug("Overriding season state per SEASON_STATE_OVERRIDE setting")
@@ -3929,7 +3883,8 @@ class Bot(object):
                 )  # Date is still the same when time is converted to UTC
             )
             self.log.debug(
-                "Looking for next game starting after {} ({})...".format(
+                logger.lazy(
+                    "Looking for next game starting after {} ({})...",
                     lookAfter,
                     (
                         "start time of game {}".format(max(self.commonData.keys()))
@@ -3980,7 +3935,7 @@ class Bot(object):
                     }
                 )
 
-            self.log.debug("Found next game for team {}: {}".format(t, nextGame))
+            self.log.debug(logger.lazy("Found next game for team {}: {}", t, nextGame))
 
             return nextGame
 
@@ -4003,7 +3958,8 @@ class Bot(object):
                     "lastUpdate", datetime.today() - timedelta(hours=1)
                 ) >= datetime.today() - timedelta(seconds=cache_seconds):
                     self.log.debug(
-                        "Using cached data for gamePk {}, updated {} seconds ago.".format(
+                        logger.lazy(
+                            "Using cached data for gamePk {}, updated {} seconds ago.",
                             gamePk,
                             (
                                 datetime.today() - self.commonData[gamePk]["lastUpdate"]
@@ -4013,8 +3969,10 @@ class Bot(object):
                     return False
                 else:
                     self.log.debug(
-                        "Collecting data for gamePk {} with StatsAPI v{}".format(
-                            gamePk, statsapi.__version__
+                        logger.lazy(
+                            "Collecting data for gamePk {} with StatsAPI v{}",
+                            gamePk,
+                            statsapi.__version__,
                         )
                     )
 
@@ -4025,8 +3983,12 @@ class Bot(object):
 
                 # Update standings info
                 pkData.update(
-                    {"standings": statsapi.standings_data()}
-                )  # TODO: something similar to api_call()?
+                    {
+                        "standings": apicache.get(
+                            "statsapi", "standings_data", {}, self.timed_standings_data
+                        )
+                    }
+                )
 
                 # Update schedule data for today's other games - for no-no watch & division/league scoreboard
                 ls = self.get_schedule_data(
@@ -4082,7 +4044,10 @@ class Bot(object):
                                 None,
                             )
                             self.log.debug(
-                                f"Result of check for DH game 1 in commonData: {otherGame}"
+                                logger.lazy(
+                                    "Result of check for DH game 1 in commonData: {}",
+                                    otherGame,
+                                )
                             )
 
                             if not otherGame:
@@ -4115,13 +4080,20 @@ class Bot(object):
                                     None,
                                 )
                                 self.log.debug(
-                                    f"Result of check for DH game 1 in leagueSchedule: {otherGame}"
+                                    logger.lazy(
+                                        "Result of check for DH game 1 in leagueSchedule: {}",
+                                        otherGame,
+                                    )
                                 )
 
                             if not otherGame:
                                 # Get schedule data from MLB
                                 self.log.debug(
-                                    f"Getting schedule data for team id [{self.myTeam['id']}] and date [{self.today['Y-m-d']}]..."
+                                    logger.lazy(
+                                        "Getting schedule data for team id [{}] and date [{}]...",
+                                        self.myTeam["id"],
+                                        self.today["Y-m-d"],
+                                    )
                                 )
                                 sched = self.api_call(
                                     "schedule",
@@ -4153,12 +4125,17 @@ class Bot(object):
                                     None,
                                 )
                                 self.log.debug(
-                                    f"Result of check for DH game 1 in MLB schedule data: {otherGame}"
+                                    logger.lazy(
+                                        "Result of check for DH game 1 in MLB schedule data: {}",
+                                        otherGame,
+                                    )
                                 )
 
                             if otherGame:
                                 # Replace gameDate for straight doubleheader game 2 to reflect game 1 + 3 hours
-                                self.log.debug(f"DH Game 1: {otherGame['gamePk']}")
+                                self.log.debug(
+                                    logger.lazy("DH Game 1: {}", otherGame["gamePk"])
+                                )
                                 x["gameDate"] = (
                                     datetime.strptime(
                                         otherGame["gameDate"], "%Y-%m-%dT%H:%M:%SZ"
@@ -4170,7 +4147,10 @@ class Bot(object):
                                 )
                             else:
                                 self.log.debug(
-                                    f"Failed to find DH game 1 for DH game 2 [{x['gamePk']}]"
+                                    logger.lazy(
+                                        "Failed to find DH game 1 for DH game 2 [{}]",
+                                        x["gamePk"],
+                                    )
                                 )
 
                         # Convert game time to myTeam's timezone as well as local (homeTeam's) timezone
@@ -4268,7 +4248,8 @@ class Bot(object):
                         "lastUpdate", datetime.today() - timedelta(hours=1)
                     ) >= datetime.today() - timedelta(seconds=cache_seconds):
                         self.log.debug(
-                            "Using cached data for gamePk {}, updated {} seconds ago.".format(
+                            logger.lazy(
+                                "Using cached data for gamePk {}, updated {} seconds ago.",
                                 pk,
                                 (
                                     datetime.today() - self.commonData[pk]["lastUpdate"]
@@ -4278,8 +4259,10 @@ class Bot(object):
                         gamePks.remove(pk)
                     else:
                         self.log.debug(
-                            "Collecting data for gamePk {} with StatsAPI v{}".format(
-                                pk, statsapi.__version__
+                            logger.lazy(
+                                "Collecting data for gamePk {} with StatsAPI v{}",
+                                pk,
+                                statsapi.__version__,
                             )
                         )
 
@@ -4287,30 +4270,51 @@ class Bot(object):
                     self.log.warning("No gamePks to collect data for.")
                     return False
 
-                self.log.debug("Getting schedule data for gamePks: {}".format(gamePks))
-                s = self.get_schedule_data(
-                    ",".join(str(i) for i in gamePks), self.today["Y-m-d"]
+                self.log.debug(
+                    logger.lazy("Getting schedule data for gamePks: {}", gamePks)
                 )
+                # Games with no new feed data since their schedule was fetched keep it
+                schedulePks = [x for x in gamePks if not self.schedule_current(x)]
+                if schedulePks:
+                    s = self.get_schedule_data(
+                        ",".join(str(i) for i in schedulePks), self.today["Y-m-d"]
+                    )
                 for pk in gamePks:
-                    self.log.debug("Collecting data for pk: {}".format(pk))
+                    self.log.debug(logger.lazy("Collecting data for pk: {}", pk))
                     pkData = {}  # temp dict to hold the data until it's complete
 
-                    # Schedule data includes status, highlights, weather, broadcasts, probable pitchers, officials, and team info (incl. score)
-                    games = s["dates"][
-                        next(
-                            (
-                                i
-                                for i, x in enumerate(s["dates"])
-                                if x["date"] == self.today["Y-m-d"]
-                            ),
-                            0,
+                    if pk not in schedulePks:
+                        self.log.debug(
+                            logger.lazy(
+                                "Game feed unchanged, reusing schedule for pk {}", pk
+                            )
                         )
-                    ]["games"]
-                    game = games[
-                        next((i for i, x in enumerate(games) if x["gamePk"] == pk), 0)
-                    ]
-                    pkData.update({"schedule": game})
-                    self.log.debug("Appended schedule for pk {}".format(pk))
+                        pkData.update(
+                            {
+                                "schedule": self.commonData[pk]["schedule"],
+                                "scheduleTime": self.commonData[pk]["scheduleTime"],
+                            }
+                        )
+                        game = pkData["schedule"]
+                    else:
+                        # Schedule data includes status, highlights, weather, broadcasts, probable pitchers, officials, and team info (incl. score)
+                        games = s["dates"][
+                            next(
+                                (
+                                    i
+                                    for i, x in enumerate(s["dates"])
+                                    if x["date"] == self.today["Y-m-d"]
+                                ),
+                                0,
+                            )
+                        ]["games"]
+                        game = games[
+                            next(
+                                (i for i, x in enumerate(games) if x["gamePk"] == pk), 0
+                            )
+                        ]
+                        pkData.update({"schedule": game, "scheduleTime": time.time()})
+                        self.log.debug(logger.lazy("Appended schedule for pk {}", pk))
 
                     if game["doubleHeader"] == "Y" and game["gameNumber"] == 2:
                         # Find DH game 1
@@ -4341,7 +4345,10 @@ class Bot(object):
                             None,
                         )
                         self.log.debug(
-                            f"Result of check for DH game 1 in commonData: {otherGame}"
+                            logger.lazy(
+                                "Result of check for DH game 1 in commonData: {}",
+                                otherGame,
+                            )
                         )
 
                         if not otherGame:
@@ -4370,13 +4377,20 @@ class Bot(object):
                                 None,
                             )
                             self.log.debug(
-                                f"Result of check for DH game 1 in leagueSchedule: {otherGame}"
+                                logger.lazy(
+                                    "Result of check for DH game 1 in leagueSchedule: {}",
+                                    otherGame,
+                                )
                             )
 
                         if not otherGame:
                             # Get schedule data from MLB
                             self.log.debug(
-                                f"Getting schedule data for team id [{self.myTeam['id']}] and date [{self.today['Y-m-d']}]..."
+                                logger.lazy(
+                                    "Getting schedule data for team id [{}] and date [{}]...",
+                                    self.myTeam["id"],
+                                    self.today["Y-m-d"],
+                                )
                             )
                             sched = self.api_call(
                                 "schedule",
@@ -4408,12 +4422,17 @@ class Bot(object):
                                 None,
                             )
                             self.log.debug(
-                                f"Result of check for DH game 1 in MLB schedule data: {otherGame}"
+                                logger.lazy(
+                                    "Result of check for DH game 1 in MLB schedule data: {}",
+                                    otherGame,
+                                )
                             )
 
                         if otherGame:
                             # Replace gameDate for straight doubleheader game 2 to reflect game 1 + 3 hours
-                            self.log.debug(f"DH Game 1: {otherGame['gamePk']}")
+                            self.log.debug(
+                                logger.lazy("DH Game 1: {}", otherGame["gamePk"])
+                            )
                             game["gameDate"] = (
                                 datetime.strptime(
                                     otherGame["gameDate"], "%Y-%m-%dT%H:%M:%SZ"
@@ -4425,7 +4444,10 @@ class Bot(object):
                             )
                         else:
                             self.log.debug(
-                                f"Failed to find DH game 1 for DH game 2 [{game['gamePk']}]"
+                                logger.lazy(
+                                    "Failed to find DH game 1 for DH game 2 [{}]",
+                                    game["gamePk"],
+                                )
                             )
                     # Store game time in myTeam's timezone as well as local (homeTeam's) timezone
                     pkData.update(
@@ -4460,7 +4482,7 @@ class Bot(object):
                             }
                         }
                     )
-                    self.log.debug("Added gameTime for pk {}".format(pk))
+                    self.log.debug(logger.lazy("Added gameTime for pk {}", pk))
 
                     # Store a key to indicate if myTeam is home or away
                     pkData.update(
@@ -4473,7 +4495,7 @@ class Bot(object):
                             )
                         }
                     )
-                    self.log.debug("Added homeAway for pk {}".format(pk))
+                    self.log.debug(logger.lazy("Added homeAway for pk {}", pk))
 
                     # Team info for opponent - same info as myTeam, but stored in pk dict because it's game-specific
                     pkData.update(
@@ -4485,7 +4507,7 @@ class Bot(object):
                             )
                         }
                     )
-                    self.log.debug("Added oppTeam for pk {}".format(pk))
+                    self.log.debug(logger.lazy("Added oppTeam for pk {}", pk))
 
                     # Update gumbo data
                     gumboParams = {
@@ -4493,8 +4515,15 @@ class Bot(object):
                         "hydrate": "credits,alignment,flags",
                     }
                     # Get updated list of timestamps
-                    self.log.debug("Getting timestamps for pk {}".format(pk))
-                    timestamps = self.api_call("game_timestamps", {"gamePk": pk})
+                    self.log.debug(logger.lazy("Getting timestamps for pk {}", pk))
+                    timestamps = None
+                    gumboPaths = None  # Paths patched, None if gumbo was replaced
+                    if self.feedWatchers.get(pk):
+                        # Use the feed watcher's latest poll if it's current
+                        timestamps = self.feedWatchers[pk].fresh_timestamps()
+
+                    if timestamps is None:
+                        timestamps = self.api_call("game_timestamps", {"gamePk": pk})
                     if (
                         not self.commonData.get(pk, {}).get("gumbo")
                         or (
@@ -4534,11 +4563,20 @@ class Bot(object):
                         )
                     ):
                         # Get full gumbo
-                        self.log.debug("Getting full gumbo data for pk {}".format(pk))
+                        self.log.debug(
+                            logger.lazy("Getting full gumbo data for pk {}", pk)
+                        )
                         gumbo = self.api_call("game", gumboParams)
                     else:
                         self.log.debug(
-                            f"Latest timestamp from StatsAPI: {timestamps[-1]}; latest timestamp in gumbo cache: {self.commonData[pk]['gumbo'].get('metaData', {}).get('timeStamp')} for pk {pk}"
+                            logger.lazy(
+                                "Latest timestamp from StatsAPI: {}; latest timestamp in gumbo cache: {} for pk {}",
+                                timestamps[-1],
+                                self.commonData[pk]["gumbo"]
+                                .get("metaData", {})
+                                .get("timeStamp"),
+                                pk,
+                            )
                         )
 
                         gumbo = self.commonData[pk].get("gumbo", {})
@@ -4547,12 +4585,13 @@ class Bot(object):
                         ).get("timeStamp"):
                             # We're up to date
                             self.log.debug(
-                                "Gumbo data is up to date for pk {}".format(pk)
+                                logger.lazy("Gumbo data is up to date for pk {}", pk)
                             )
+                            gumboPaths = []
                         else:
                             # Get diff patch to bring us up to date
                             self.log.debug(
-                                "Getting gumbo diff patch for pk {}".format(pk)
+                                logger.lazy("Getting gumbo diff patch for pk {}", pk)
                             )
                             diffPatch = self.api_call(
                                 "game_diff",
@@ -4567,16 +4606,20 @@ class Bot(object):
                             if isinstance(diffPatch, dict) and diffPatch.get("gamePk"):
                                 # Full gumbo data was returned
                                 self.log.debug(
-                                    f"Full gumbo data was returned instead of a patch for pk {pk}. No need to patch!"
+                                    logger.lazy(
+                                        "Full gumbo data was returned instead of a patch for pk {}. No need to patch!",
+                                        pk,
+                                    )
                                 )
                                 gumbo = diffPatch
                             else:
                                 # Patch the dict
                                 self.log.debug(
-                                    "Patching gumbo data for pk {}".format(pk)
+                                    logger.lazy("Patching gumbo data for pk {}", pk)
                                 )
+                                gumboPaths = []
                                 if self.patch_dict(
-                                    self.commonData[pk]["gumbo"], diffPatch
+                                    self.commonData[pk]["gumbo"], diffPatch, gumboPaths
                                 ):  # Patch in place
                                     # True result —- patching was successful
                                     gumbo = self.commonData[pk][
@@ -4585,19 +4628,27 @@ class Bot(object):
                                 else:
                                     # Get full gumbo
                                     self.log.debug(
-                                        "Since patching encountered an error, getting full gumbo data for pk {}".format(
-                                            pk
+                                        logger.lazy(
+                                            "Since patching encountered an error, getting full gumbo data for pk {}",
+                                            pk,
                                         )
                                     )
                                     gumbo = self.api_call("game", gumboParams)
+                                    gumboPaths = None
 
                     # Include gumbo data
                     pkData.update({"timestamps": timestamps, "gumbo": gumbo})
-                    self.log.debug("Added gumbo data for pk {}".format(pk))
+                    self.log.debug(logger.lazy("Added gumbo data for pk {}", pk))
 
                     # Formatted Boxscore Info
-                    pkData.update({"boxscore": self.format_boxscore_data(gumbo)})
-                    self.log.debug("Added boxscore for pk {}".format(pk))
+                    pkData.update(
+                        {
+                            "boxscore": self.format_boxscore_data(
+                                gumbo, pk=pk, paths=gumboPaths
+                            )
+                        }
+                    )
+                    self.log.debug(logger.lazy("Added boxscore for pk {}", pk))
 
                     # Update hitter stats vs. probable pitchers - only prior to game start if data already exists
                     if (
@@ -4611,7 +4662,9 @@ class Bot(object):
                         and pkData["schedule"]["status"]["abstractGameCode"] != "F"
                     ):
                         self.log.debug(
-                            "Adding batter vs probable pitchers for pk {}".format(pk)
+                            logger.lazy(
+                                "Adding batter vs probable pitchers for pk {}", pk
+                            )
                         )
                         pkData.update(
                             {
@@ -4647,745 +4700,284 @@ class Bot(object):
                     # pkData.update({'homeProbVsTeamStats':self.get_pitching_stats_vs_team()})
 
                     pkData.update({"lastUpdate": datetime.today()})
-                    self.log.debug("Added lastUpdate for pk {}".format(pk))
+                    self.log.debug(logger.lazy("Added lastUpdate for pk {}", pk))
 
                     # Make the data available
                     self.commonData.update({pk: pkData})
-                    self.log.debug("Updated commonData with data for pk {}".format(pk))
+                    self.log.debug(
+                        logger.lazy("Updated commonData with data for pk {}", pk)
+                    )
 
         if redball.DEV:
             self.log.debug(
-                "Data available for threads: {}".format(self.commonData)
+                logger.lazy("Data available for threads: {}", self.commonData)
             )  # debug
 
         return True
 
-    def format_boxscore_data(self, gumbo):
+    def format_boxscore_data(self, gumbo, pk=None, paths=None):
         """Adapted from MLB-StatsAPI module.
         Given gumbo data, format lists of batters, pitchers, and other boxscore data
+        pk = gamePk to reuse player rows formatted from the same gumbo dict,
+        paths = JSON pointers patched since the last call (None to format all rows)
         """
 
+        rows = {}  # playerKey: {(side, "batting"/"pitching"): row}
+        if pk is not None:
+            cache = self.boxscoreCache.get(pk)
+            touched = self.boxscore_touched(paths) if paths is not None else None
+            if cache and cache["gumbo"] is gumbo and touched is not None:
+                # Only reformat rows for players touched by the patch
+                rows = cache["rows"]
+                for playerKey in touched:
+                    rows.pop(playerKey, None)
+            else:
+                self.boxscoreCache[pk] = {"gumbo": gumbo, "rows": rows}
+
+        def row(side, kind, personId):
+            playerKey = "ID" + str(personId)
+            playerRows = rows.setdefault(playerKey, {})
+            r = playerRows.get((side, kind))
+            if r is None:
+                r = playerRows[(side, kind)] = (
+                    self.format_batter_row(gumbo, side, personId)
+                    if kind == "batting"
+                    else self.format_pitcher_row(gumbo, side, personId)
+                )
+
+            return r
+
+        boxscore = gumbo["liveData"]["boxscore"]
         boxData = {}
         """boxData holds the dict to be returned"""
 
-        # Add away column headers
-        awayBatters = [
-            {
-                "namefield": gumbo["gameData"]["teams"]["away"]["teamName"]
-                + " Batters",
-                "ab": "AB",
-                "r": "R",
-                "h": "H",
-                "rbi": "RBI",
-                "bb": "BB",
-                "k": "K",
-                "lob": "LOB",
-                "avg": "AVG",
-                "ops": "OPS",
-                "personId": 0,
-                "substitution": False,
-                "note": "",
-                "name": gumbo["gameData"]["teams"]["away"]["teamName"] + " Batters",
-                "position": "",
-                "obp": "OBP",
-                "slg": "SLG",
-                "battingOrder": "",
-            }
-        ]
-        for batterId_int in [
-            x
-            for x in gumbo["liveData"]["boxscore"]["teams"]["away"]["batters"]
-            if gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                "ID" + str(x)
-            ].get("battingOrder")
-        ]:
-            batterId = str(batterId_int)
-            namefield = (
-                str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                )[0]
-                if str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                )[-1]
-                == "0"
-                else "   "
-            )
-            namefield += " " + gumbo["liveData"]["boxscore"]["teams"]["away"][
-                "players"
-            ]["ID" + batterId]["stats"]["batting"].get("note", "")
-            namefield += (
-                gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"]
-                + "  "
-                + gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + batterId
-                ]["position"]["abbreviation"]
-            )
-            batter = {
-                "namefield": namefield,
-                "ab": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["atBats"]
-                ),
-                "r": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["runs"]
-                ),
-                "h": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["hits"]
-                ),
-                "rbi": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["rbi"]
-                ),
-                "bb": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["baseOnBalls"]
-                ),
-                "k": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["strikeOuts"]
-                ),
-                "lob": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["leftOnBase"]
-                ),
-                "avg": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["avg"]
-                ),
-                "ops": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["ops"]
-                ),
-                "personId": batterId_int,
-                "battingOrder": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                ),
-                "substitution": (
-                    False
-                    if str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                            "ID" + batterId
-                        ]["battingOrder"]
-                    )[-1]
-                    == "0"
-                    else True
-                ),
-                "note": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + batterId
-                ]["stats"]["batting"].get("note", ""),
-                "name": gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"],
-                "position": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + batterId
-                ]["position"]["abbreviation"],
-                "obp": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["obp"]
-                ),
-                "slg": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["slg"]
-                ),
-            }
-            awayBatters.append(batter)
-
-        # Add home column headers
-        homeBatters = [
-            {
-                "namefield": gumbo["gameData"]["teams"]["home"]["teamName"]
-                + " Batters",
-                "ab": "AB",
-                "r": "R",
-                "h": "H",
-                "rbi": "RBI",
-                "bb": "BB",
-                "k": "K",
-                "lob": "LOB",
-                "avg": "AVG",
-                "ops": "OPS",
-                "personId": 0,
-                "substitution": False,
-                "note": "",
-                "name": gumbo["gameData"]["teams"]["home"]["teamName"] + " Batters",
-                "position": "",
-                "obp": "OBP",
-                "slg": "SLG",
-                "battingOrder": "",
-            }
-        ]
-        for batterId_int in [
-            x
-            for x in gumbo["liveData"]["boxscore"]["teams"]["home"]["batters"]
-            if gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                "ID" + str(x)
-            ].get("battingOrder")
-        ]:
-            batterId = str(batterId_int)
-            namefield = (
-                str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                )[0]
-                if str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                )[-1]
-                == "0"
-                else "   "
-            )
-            namefield += " " + gumbo["liveData"]["boxscore"]["teams"]["home"][
-                "players"
-            ]["ID" + batterId]["stats"]["batting"].get("note", "")
-            namefield += (
-                gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"]
-                + "  "
-                + gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + batterId
-                ]["position"]["abbreviation"]
-            )
-            batter = {
-                "namefield": namefield,
-                "ab": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["atBats"]
-                ),
-                "r": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["runs"]
-                ),
-                "h": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["hits"]
-                ),
-                "rbi": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["rbi"]
-                ),
-                "bb": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["baseOnBalls"]
-                ),
-                "k": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["strikeOuts"]
-                ),
-                "lob": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["stats"]["batting"]["leftOnBase"]
-                ),
-                "avg": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["avg"]
-                ),
-                "ops": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["ops"]
-                ),
-                "personId": batterId_int,
-                "battingOrder": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["battingOrder"]
-                ),
-                "substitution": (
-                    False
-                    if str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                            "ID" + batterId
-                        ]["battingOrder"]
-                    )[-1]
-                    == "0"
-                    else True
-                ),
-                "note": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + batterId
-                ]["stats"]["batting"].get("note", ""),
-                "name": gumbo["gameData"]["players"]["ID" + batterId]["boxscoreName"],
-                "position": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + batterId
-                ]["position"]["abbreviation"],
-                "obp": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["obp"]
-                ),
-                "slg": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + batterId
-                    ]["seasonStats"]["batting"]["slg"]
-                ),
-            }
-            homeBatters.append(batter)
-
-        boxData.update({"awayBatters": awayBatters})
-        boxData.update({"homeBatters": homeBatters})
-
-        # Add away team totals
-        boxData.update(
-            {
-                "awayBattingTotals": {
-                    "namefield": "Totals",
-                    "ab": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["atBats"]
-                    ),
-                    "r": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["runs"]
-                    ),
-                    "h": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["hits"]
-                    ),
-                    "rbi": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["rbi"]
-                    ),
-                    "bb": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["baseOnBalls"]
-                    ),
-                    "k": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["strikeOuts"]
-                    ),
-                    "lob": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "batting"
-                        ]["leftOnBase"]
-                    ),
-                    "avg": "",
-                    "ops": "",
-                    "obp": "",
-                    "slg": "",
-                    "name": "Totals",
-                    "position": "",
-                    "note": "",
-                    "substitution": False,
-                    "battingOrder": "",
+        for side in ["away", "home"]:
+            teamName = gumbo["gameData"]["teams"][side]["teamName"]
+            players = boxscore["teams"][side]["players"]
+            # Add column headers
+            batters = [
+                {
+                    "namefield": teamName + " Batters",
+                    "ab": "AB",
+                    "r": "R",
+                    "h": "H",
+                    "rbi": "RBI",
+                    "bb": "BB",
+                    "k": "K",
+                    "lob": "LOB",
+                    "avg": "AVG",
+                    "ops": "OPS",
                     "personId": 0,
-                }
-            }
-        )
-        # Add home team totals
-        boxData.update(
-            {
-                "homeBattingTotals": {
-                    "namefield": "Totals",
-                    "ab": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["atBats"]
-                    ),
-                    "r": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["runs"]
-                    ),
-                    "h": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["hits"]
-                    ),
-                    "rbi": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["rbi"]
-                    ),
-                    "bb": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["baseOnBalls"]
-                    ),
-                    "k": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["strikeOuts"]
-                    ),
-                    "lob": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "batting"
-                        ]["leftOnBase"]
-                    ),
-                    "avg": "",
-                    "ops": "",
-                    "obp": "",
-                    "slg": "",
-                    "name": "Totals",
-                    "position": "",
-                    "note": "",
                     "substitution": False,
+                    "note": "",
+                    "name": teamName + " Batters",
+                    "position": "",
+                    "obp": "OBP",
+                    "slg": "SLG",
                     "battingOrder": "",
-                    "personId": 0,
                 }
-            }
-        )
+            ]
+            for batterId_int in boxscore["teams"][side]["batters"]:
+                if players["ID" + str(batterId_int)].get("battingOrder"):
+                    batters.append(row(side, "batting", batterId_int))
 
-        # Get batting notes
-        awayBattingNotes = {}
-        for n in gumbo["liveData"]["boxscore"]["teams"]["away"]["note"]:
-            awayBattingNotes.update(
-                {len(awayBattingNotes): n["label"] + "-" + n["value"]}
-            )
+            boxData.update({side + "Batters": batters})
 
-        homeBattingNotes = {}
-        for n in gumbo["liveData"]["boxscore"]["teams"]["home"]["note"]:
-            homeBattingNotes.update(
-                {len(homeBattingNotes): n["label"] + "-" + n["value"]}
+        # Add team totals
+        for side in ["away", "home"]:
+            batting = boxscore["teams"][side]["teamStats"]["batting"]
+            boxData.update(
+                {
+                    side
+                    + "BattingTotals": {
+                        "namefield": "Totals",
+                        "ab": str(batting["atBats"]),
+                        "r": str(batting["runs"]),
+                        "h": str(batting["hits"]),
+                        "rbi": str(batting["rbi"]),
+                        "bb": str(batting["baseOnBalls"]),
+                        "k": str(batting["strikeOuts"]),
+                        "lob": str(batting["leftOnBase"]),
+                        "avg": "",
+                        "ops": "",
+                        "obp": "",
+                        "slg": "",
+                        "name": "Totals",
+                        "position": "",
+                        "note": "",
+                        "substitution": False,
+                        "battingOrder": "",
+                        "personId": 0,
+                    }
+                }
             )
 
-        boxData.update({"awayBattingNotes": awayBattingNotes})
-        boxData.update({"homeBattingNotes": homeBattingNotes})
-
-        # Get pitching box
-        # Add away column headers
-        awayPitchers = [
-            {
-                "namefield": gumbo["gameData"]["teams"]["away"]["teamName"]
-                + " Pitchers",
-                "ip": "IP",
-                "h": "H",
-                "r": "R",
-                "er": "ER",
-                "bb": "BB",
-                "k": "K",
-                "hr": "HR",
-                "era": "ERA",
-                "p": "P",
-                "s": "S",
-                "name": gumbo["gameData"]["teams"]["away"]["teamName"] + " Pitchers",
-                "personId": 0,
-                "note": "",
-            }
-        ]
-        for pitcherId_int in gumbo["liveData"]["boxscore"]["teams"]["away"]["pitchers"]:
-            if pitcherId_int == 0:
-                self.log.warning("Invalid pitcher id found: 0")
-                continue
-
-            pitcherId = str(pitcherId_int)
-            namefield = gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"]
-            namefield += (
-                "  "
-                + gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note", "")
-                if gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note")
-                else ""
-            )
-            pitcher = {
-                "namefield": namefield,
-                "ip": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("inningsPitched", 0)
-                ),
-                "h": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("hits", 0)
-                ),
-                "r": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("runs", 0)
-                ),
-                "er": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("earnedRuns", 0)
-                ),
-                "bb": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("baseOnBalls", 0)
-                ),
-                "k": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("strikeOuts", 0)
-                ),
-                "hr": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("homeRuns", 0)
-                ),
-                "p": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get(
-                        "pitchesThrown",
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                            "ID" + pitcherId
-                        ]["stats"]["pitching"].get("numberOfPitches", 0),
-                    )
-                ),
-                "s": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("strikes", 0)
-                ),
-                "era": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                        "ID" + pitcherId
-                    ]["seasonStats"]["pitching"]["era"]
-                ),
-                "name": gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"],
-                "personId": pitcherId_int,
-                "note": gumbo["liveData"]["boxscore"]["teams"]["away"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note", ""),
-            }
-            awayPitchers.append(pitcher)
-
-        boxData.update({"awayPitchers": awayPitchers})
-
-        # Add home column headers
-        homePitchers = [
-            {
-                "namefield": gumbo["gameData"]["teams"]["home"]["teamName"]
-                + " Pitchers",
-                "ip": "IP",
-                "h": "H",
-                "r": "R",
-                "er": "ER",
-                "bb": "BB",
-                "k": "K",
-                "hr": "HR",
-                "era": "ERA",
-                "p": "P",
-                "s": "S",
-                "name": gumbo["gameData"]["teams"]["home"]["teamName"] + " Pitchers",
-                "personId": 0,
-                "note": "",
-            }
-        ]
-        for pitcherId_int in gumbo["liveData"]["boxscore"]["teams"]["home"]["pitchers"]:
-            if pitcherId_int == 0:
-                self.log.warning("Invalid pitcher id found: 0")
-                continue
-
-            pitcherId = str(pitcherId_int)
-            namefield = gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"]
-            namefield += (
-                "  "
-                + gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note", "")
-                if gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note")
-                else ""
-            )
-            pitcher = {
-                "namefield": namefield,
-                "ip": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("inningsPitched", 0)
-                ),
-                "h": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("hits", 0)
-                ),
-                "r": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("runs", 0)
-                ),
-                "er": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("earnedRuns", 0)
-                ),
-                "bb": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("baseOnBalls", 0)
-                ),
-                "k": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("strikeOuts", 0)
-                ),
-                "hr": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("homeRuns", 0)
-                ),
-                "p": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get(
-                        "pitchesThrown",
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                            "ID" + pitcherId
-                        ]["stats"]["pitching"].get("numberOfPitches", 0),
-                    )
-                ),
-                "s": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["stats"]["pitching"].get("strikes", 0)
-                ),
-                "era": str(
-                    gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                        "ID" + pitcherId
-                    ]["seasonStats"]["pitching"]["era"]
-                ),
-                "name": gumbo["gameData"]["players"]["ID" + pitcherId]["boxscoreName"],
-                "personId": pitcherId_int,
-                "note": gumbo["liveData"]["boxscore"]["teams"]["home"]["players"][
-                    "ID" + pitcherId
-                ]["stats"]["pitching"].get("note", ""),
-            }
-            homePitchers.append(pitcher)
+        # Get batting notes
+        for side in ["away", "home"]:
+            battingNotes = {}
+            for n in boxscore["teams"][side]["note"]:
+                battingNotes.update({len(battingNotes): n["label"] + "-" + n["value"]})
 
-        boxData.update({"homePitchers": homePitchers})
+            boxData.update({side + "BattingNotes": battingNotes})
 
-        # Get away team totals
-        boxData.update(
-            {
-                "awayPitchingTotals": {
-                    "namefield": "Totals",
-                    "ip": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["inningsPitched"]
-                    ),
-                    "h": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["hits"]
-                    ),
-                    "r": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["runs"]
-                    ),
-                    "er": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["earnedRuns"]
-                    ),
-                    "bb": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["baseOnBalls"]
-                    ),
-                    "k": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["strikeOuts"]
-                    ),
-                    "hr": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["away"]["teamStats"][
-                            "pitching"
-                        ]["homeRuns"]
-                    ),
-                    "p": "",
-                    "s": "",
-                    "era": "",
-                    "name": "Totals",
+        # Get pitching box
+        for side in ["away", "home"]:
+            teamName = gumbo["gameData"]["teams"][side]["teamName"]
+            # Add column headers
+            pitchers = [
+                {
+                    "namefield": teamName + " Pitchers",
+                    "ip": "IP",
+                    "h": "H",
+                    "r": "R",
+                    "er": "ER",
+                    "bb": "BB",
+                    "k": "K",
+                    "hr": "HR",
+                    "era": "ERA",
+                    "p": "P",
+                    "s": "S",
+                    "name": teamName + " Pitchers",
                     "personId": 0,
                     "note": "",
                 }
-            }
-        )
+            ]
+            for pitcherId_int in boxscore["teams"][side]["pitchers"]:
+                if pitcherId_int == 0:
+                    self.log.warning("Invalid pitcher id found: 0")
+                    continue
 
-        # Get home team totals
-        boxData.update(
-            {
-                "homePitchingTotals": {
-                    "namefield": "Totals",
-                    "ip": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["inningsPitched"]
-                    ),
-                    "h": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["hits"]
-                    ),
-                    "r": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["runs"]
-                    ),
-                    "er": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["earnedRuns"]
-                    ),
-                    "bb": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["baseOnBalls"]
-                    ),
-                    "k": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["strikeOuts"]
-                    ),
-                    "hr": str(
-                        gumbo["liveData"]["boxscore"]["teams"]["home"]["teamStats"][
-                            "pitching"
-                        ]["homeRuns"]
-                    ),
-                    "p": "",
-                    "s": "",
-                    "era": "",
-                    "name": "Totals",
-                    "personId": 0,
-                    "note": "",
+                pitchers.append(row(side, "pitching", pitcherId_int))
+
+            boxData.update({side + "Pitchers": pitchers})
+
+        # Get team totals
+        for side in ["away", "home"]:
+            pitching = boxscore["teams"][side]["teamStats"]["pitching"]
+            boxData.update(
+                {
+                    side
+                    + "PitchingTotals": {
+                        "namefield": "Totals",
+                        "ip": str(pitching["inningsPitched"]),
+                        "h": str(pitching["hits"]),
+                        "r": str(pitching["runs"]),
+                        "er": str(pitching["earnedRuns"]),
+                        "bb": str(pitching["baseOnBalls"]),
+                        "k": str(pitching["strikeOuts"]),
+                        "hr": str(pitching["homeRuns"]),
+                        "p": "",
+                        "s": "",
+                        "era": "",
+                        "name": "Totals",
+                        "personId": 0,
+                        "note": "",
+                    }
                 }
-            }
-        )
+            )
 
         # Get game info
-        boxData.update({"gameBoxInfo": gumbo["liveData"]["boxscore"].get("info", [])})
+        boxData.update({"gameBoxInfo": boxscore.get("info", [])})
 
         return boxData
 
+    def format_batter_row(self, gumbo, side, personId):
+        # Format one row of the batting box for format_boxscore_data()
+        playerKey = "ID" + str(personId)
+        player = gumbo["liveData"]["boxscore"]["teams"][side]["players"][playerKey]
+        batting = player["stats"]["batting"]
+        seasonBatting = player["seasonStats"]["batting"]
+        name = gumbo["gameData"]["players"][playerKey]["boxscoreName"]
+        battingOrder = str(player["battingOrder"])
+        position = player["position"]["abbreviation"]
+        note = batting.get("note", "")
+        return {
+            "namefield": (battingOrder[0] if battingOrder[-1] == "0" else "   ")
+            + " "
+            + note
+            + name
+            + "  "
+            + position,
+            "ab": str(batting["atBats"]),
+            "r": str(batting["runs"]),
+            "h": str(batting["hits"]),
+            "rbi": str(batting["rbi"]),
+            "bb": str(batting["baseOnBalls"]),
+            "k": str(batting["strikeOuts"]),
+            "lob": str(batting["leftOnBase"]),
+            "avg": str(seasonBatting["avg"]),
+            "ops": str(seasonBatting["ops"]),
+            "personId": personId,
+            "battingOrder": battingOrder,
+            "substitution": False if battingOrder[-1] == "0" else True,
+            "note": note,
+            "name": name,
+            "position": position,
+            "obp": str(seasonBatting["obp"]),
+            "slg": str(seasonBatting["slg"]),
+        }
+
+    def format_pitcher_row(self, gumbo, side, personId):
+        # Format one row of the pitching box for format_boxscore_data()
+        playerKey = "ID" + str(personId)
+        player = gumbo["liveData"]["boxscore"]["teams"][side]["players"][playerKey]
+        pitching = player["stats"]["pitching"]
+        name = gumbo["gameData"]["players"][playerKey]["boxscoreName"]
+        return {
+            "namefield": name
+            + ("  " + pitching.get("note", "") if pitching.get("note") else ""),
+            "ip": str(pitching.get("inningsPitched", 0)),
+            "h": str(pitching.get("hits", 0)),
+            "r": str(pitching.get("runs", 0)),
+            "er": str(pitching.get("earnedRuns", 0)),
+            "bb": str(pitching.get("baseOnBalls", 0)),
+            "k": str(pitching.get("strikeOuts", 0)),
+            "hr": str(pitching.get("homeRuns", 0)),
+            "p": str(
+                pitching.get("pitchesThrown", pitching.get("numberOfPitches", 0))
+            ),
+            "s": str(pitching.get("strikes", 0)),
+            "era": str(player["seasonStats"]["pitching"]["era"]),
+            "name": name,
+            "personId": personId,
+            "note": pitching.get("note", ""),
+        }
+
+    def boxscore_touched(self, paths):
+        # paths = JSON pointers changed in gumbo data
+        # return the set of player keys (ID<personId>) with boxscore rows affected,
+        # or None if all rows need to be formatted again
+        touched = set()
+        for path in paths:
+            try:
+                tokens = jsonpatch.compile_pointer(path)
+            except jsonpatch.PatchError:
+                return None
+
+            for prefix, keyIndex in [
+                (("gameData", "players"), 2),
+                (("liveData", "boxscore", "teams"), 5),
+            ]:
+                if tokens[: len(prefix)] == prefix[: len(tokens)]:
+                    if len(tokens) <= len(prefix):
+                        # Replaced a parent of the players
+                        return None
+
+                    if keyIndex == 5 and tokens[4:5] != ("players",):
+                        # Team lists and totals, formatted every time
+                        if len(tokens) == 4:
+                            return None
+
+                        break
+
+                    if len(tokens) <= keyIndex:
+                        return None
+
+                    touched.add(tokens[keyIndex])
+                    break
+
+        return touched
+
     def get_batter_stats_vs_pitcher(self, batters, pitcher):
         # batters = list of personIds, pitcher = personId
         if batters == [] or pitcher == 0:
@@ -5448,11 +5040,7 @@ class Bot(object):
 
     def log_last_updated_date_in_db(self, threadId, t=None):
         # threadId = Reddit thread id that was edited, t = timestamp of edit
-        q = "update {}threads set dateUpdated=? where id=?;".format(self.dbTablePrefix)
-        if not t:
-            t = time.time()
-        localArgs = (t, threadId)
-        i = rbdb.db_qry((q, localArgs), commit=True, closeAfter=True, logg=self.log)
+        i = self.db.threads.set_updated(threadId, t)
         if isinstance(i, str):
             self.log.error("Error updating thread edit date in database: {}".format(i))
             return False
@@ -5461,28 +5049,7 @@ class Bot(object):
 
     def insert_thread_to_db(self, pk, threadId, threadType):
         # pk = gamePk (or list of gamePks), threadId = thread object returned from Reddit (OFF+date for off day threads), threadType = ['gameday', 'game', 'post', 'off', 'weekly']
-        q = "insert or ignore into {}threads (gamePk, type, gameDate, id, dateCreated, dateUpdated) values".format(
-            self.dbTablePrefix
-        )
-        if isinstance(pk, list):
-            for k in pk:
-                if q[:-1] == ")":
-                    q += ","
-                q += " ({}, '{}', '{}', '{}', {}, {})".format(
-                    k,
-                    threadType,
-                    self.today["Y-m-d"],
-                    threadId,
-                    time.time(),
-                    time.time(),
-                )
-        else:
-            q += " ({}, '{}', '{}', '{}', {}, {})".format(
-                pk, threadType, self.today["Y-m-d"], threadId, time.time(), time.time()
-            )
-
-        q += ";"
-        i = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+        i = self.db.threads.insert(pk, threadType, self.today["Y-m-d"], threadId)
         if isinstance(i, str):
             self.log.error("Error inserting thread into database: {}".format(i))
             return False
@@ -5491,40 +5058,7 @@ class Bot(object):
 
     def count_check_edit(self, threadId, status, edit=False):
         # threadId = reddit thread id, status = game status (statusCode, code for detailed state)
-        sq = "select checks,edits from {}thread_edits where threadId='{}' and status='{}';".format(
-            self.dbTablePrefix, threadId, status
-        )
-        s = rbdb.db_qry(sq, closeAfter=True, logg=self.log)
-        if isinstance(s, str):
-            # Error querying for existing row
-            self.log.error(
-                "Error querying for existing row in {}thread_edits table for threadId {} and status {}: {}".format(
-                    self.dbTablePrefix, threadId, status, s
-                )
-            )
-            return False
-        elif s != []:
-            # Row already exists; increment edit count
-            q = "update {}thread_edits set checks=checks+1,{} dateUpdated='{}' where threadId='{}' and status='{}';".format(
-                self.dbTablePrefix,
-                " edits=edits+1," if edit else "",
-                time.time(),
-                threadId,
-                status,
-            )
-        else:
-            # Row does not exist; insert it
-            q = "insert into {}thread_edits (threadId, status, checks, edits, dateCreated, dateUpdated) values ('{}', '{}', {}, {}, '{}', '{}');".format(
-                self.dbTablePrefix,
-                threadId,
-                status,
-                1,
-                1 if edit else 0,
-                time.time(),
-                time.time(),
-            )
-
-        r = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+        r = self.db.thread_edits.increment(threadId, status, edit)
         if isinstance(r, str):
             # Error inserting/updating row
             self.log.error(
@@ -5536,6 +5070,10 @@ class Bot(object):
 
         return True
 
+    @metrics.timed(
+        metrics.BOT_PREP_AND_POST_SECONDS,
+        lambda self, thread, *args, **kwargs: {"bot": self.bot.id, "thread": thread},
+    )
     def prep_and_post(self, thread, pk=None, postFooter=None):
         # thread = ['weekly', 'off', 'gameday', 'game', 'post']
         # pk = gamePk or list of gamePks
@@ -5554,7 +5092,7 @@ class Bot(object):
                 gamePk=pk,
                 settings=self.settings,
             )
-            self.log.debug("Rendered {} title: {}".format(thread, title))
+            self.log.debug(logger.lazy("Rendered {} title: {}", thread, title))
         except Exception as e:
             self.log.error("Error rendering {} title: {}".format(thread, e))
             title = None
@@ -5741,7 +5279,7 @@ class Bot(object):
                     gamePk=pk,
                     settings=self.settings,
                 )
-                self.log.debug("Rendered {} text: {}".format(thread, text))
+                self.log.debug(logger.lazy("Rendered {} text: {}", thread, text))
             except Exception as e:
                 self.log.error("Error rendering {} text: {}".format(thread, e))
                 text = None
@@ -5778,28 +5316,39 @@ class Bot(object):
         if theThread:
             if isinstance(pk, list):
                 self.log.debug(
-                    "List of gamePks to associate in DB with {} thread: {}...".format(
-                        thread, pk
+                    logger.lazy(
+                        "List of gamePks to associate in DB with {} thread: {}...",
+                        thread,
+                        pk,
                     )
                 )
                 for x in pk:
                     self.log.debug(
-                        "Inserting {} thread into DB for game {}...".format(thread, x)
+                        logger.lazy(
+                            "Inserting {} thread into DB for game {}...", thread, x
+                        )
                     )
                     self.insert_thread_to_db(x, theThread, thread)
             elif pk:
                 self.log.debug(
-                    "Inserting {} thread into DB for game {}...".format(thread, pk)
+                    logger.lazy(
+                        "Inserting {} thread into DB for game {}...", thread, pk
+                    )
                 )
                 self.insert_thread_to_db(pk, theThread, thread)
             else:
                 self.log.debug(
-                    "Inserting {} thread into db as {}...".format(
-                        thread, self.today["Ymd"]
+                    logger.lazy(
+                        "Inserting {} thread into db as {}...",
+                        thread,
+                        self.today["Ymd"],
                     )
                 )
                 self.insert_thread_to_db(int(self.today["Ymd"]), theThread, thread)
 
+            # Skip webhooks and tweets already sent for this thread with the same data
+            fingerprint = self.data_fingerprint(thread, pk, clock=False)
+
             # Check for webhooks
             for w in range(0, 10):
                 s = "" if w == 0 else str(w)
@@ -5836,10 +5385,19 @@ class Bot(object):
                 )
                 if webhook_url:
                     self.log.debug(
-                        "Webhook{} URL for {} thread: [{}].".format(
-                            s, thread, webhook_url
+                        logger.lazy(
+                            "Webhook{} URL for {} thread: [{}].", s, thread, webhook_url
                         )
                     )
+                    webhookKey = (thread, theThread.id, "webhook" + s)
+                    if not self.render_needed(webhookKey, fingerprint, maxAge=None):
+                        self.log.info(
+                            "Webhook{} for {} thread was already sent with the same data.".format(
+                                s, thread
+                            )
+                        )
+                        continue
+
                     webhook_text = self.render_template(
                         thread=thread,
                         templateType="webhook" + s,
@@ -5849,10 +5407,15 @@ class Bot(object):
                         theThread=theThread,
                     )
                     self.log.debug(
-                        "Rendered {} webhook{} text: {}".format(thread, s, webhook_text)
+                        logger.lazy(
+                            "Rendered {} webhook{} text: {}", thread, s, webhook_text
+                        )
                     )
                     if webhook_text:
                         webhook_result = self.post_webhook(webhook_url, webhook_text)
+                        if not isinstance(webhook_result, str):
+                            self.render_done(webhookKey, fingerprint)
+
                         self.log.info(
                             "Webhook [{}] result: {}.".format(
                                 webhook_url,
@@ -5914,15 +5477,24 @@ class Bot(object):
                     self.log.error(f"Can't tweet about unknown thread type [{thread}]!")
                     return (None, text)
 
-                tweetResult = self.tweet_thread(
-                    message=message,
-                    consumerKey=tConsumerKey,
-                    consumerSecret=tConsumerSecret,
-                    accessToken=tAccessToken,
-                    accessSecret=tAccessSecret,
-                )
-                if tweetResult:
-                    self.log.info("Tweet submitted successfully!")
+                tweetKey = (thread, theThread.id, "tweet")
+                if not self.render_needed(tweetKey, fingerprint, maxAge=None):
+                    self.log.info(
+                        "Already tweeted about {} thread with the same data.".format(
+                            thread
+                        )
+                    )
+                else:
+                    tweetResult = self.tweet_thread(
+                        message=message,
+                        consumerKey=tConsumerKey,
+                        consumerSecret=tConsumerSecret,
+                        accessToken=tAccessToken,
+                        accessSecret=tAccessSecret,
+                    )
+                    if tweetResult:
+                        self.log.info("Tweet submitted successfully!")
+                        self.render_done(tweetKey, fingerprint)
 
             # Lock previous thread
             if lockPrevious or linkPrevious:
@@ -5971,6 +5543,9 @@ class Bot(object):
                                 "Submitting comment in previous thread with link to new thread..."
                             )
                             lockReply = previousThread.reply(parsedCommentText)
+                            metrics.BOT_REDDIT_REQUESTS.inc(
+                                bot=self.bot.id, action="comment"
+                            )
                             self.log.debug("Distinguishing comment...")
                             lockReply.mod.distinguish(sticky=True)
                             self.log.debug(
@@ -6108,6 +5683,7 @@ class Bot(object):
             send_replies=inboxReplies,
             discussion_type="CHAT" if live_discussion else None,
         )
+        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="submit")
         self.log.info("Thread ({}) submitted: {}".format(title, post))
 
         if sticky:
@@ -6161,6 +5737,77 @@ class Bot(object):
 
         return post
 
+    def data_fingerprint(self, thread, pk=None, clock=True):
+        # thread = ['weekly', 'off', 'gameday', 'game', 'post']
+        # pk = gamePk or list of gamePks
+        # clock = False to leave out the time bucket (for what's sent once)
+        # return a hash of the commonData slices the thread's templates depend on,
+        # or None if RENDER_DEPENDENCIES doesn't list the thread type
+        deps = RENDER_DEPENDENCIES.get(thread)
+        if not deps:
+            return None
+
+        fingerprint = hashlib.sha1()
+        generic = self.commonData.get(0, {})
+        if self.genericFingerprint[0] is not generic:
+            # Generic data is replaced when it's collected, so hash it once per update
+            self.genericFingerprint = (
+                generic,
+                self.slice_fingerprint(generic, deps[0]),
+            )
+
+        fingerprint.update(self.genericFingerprint[1].encode())
+        if clock and deps.get("clock"):
+            fingerprint.update(str(int(time.time() // deps["clock"])).encode())
+
+        for x in pk if isinstance(pk, list) else [pk] if pk else []:
+            fingerprint.update(
+                self.slice_fingerprint(self.commonData.get(x, {}), deps["pk"]).encode()
+            )
+
+        return fingerprint.hexdigest()
+
+    def slice_fingerprint(self, data, keys):
+        # data = commonData[0] or commonData[gamePk], keys = keys to include
+        values = [
+            (
+                data.get("gumbo", {}).get("metaData", {}).get("timeStamp")
+                if k == "gumbo"
+                else data.get(k)
+            )
+            for k in keys
+        ]
+        return hashlib.sha1(
+            json.dumps(values, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def render_needed(self, key, fingerprint, maxAge=RENDER_MAX_AGE):
+        # key = (thread, ..., target), fingerprint = from data_fingerprint()
+        # return False if render_done() recorded the same fingerprint for key,
+        # less than maxAge seconds ago (None = any time)
+        last = self.renderFingerprints.get(key)
+        if (
+            fingerprint
+            and last
+            and last[0] == fingerprint
+            and (maxAge is None or time.time() - last[1] < maxAge)
+        ):
+            metrics.BOT_RENDERS_SKIPPED.inc(bot=self.bot.id, thread=key[0])
+            return False
+
+        return True
+
+    def render_done(self, key, fingerprint):
+        self.renderFingerprints[key] = (fingerprint, time.time())
+
+    @metrics.timed(
+        metrics.BOT_RENDER_SECONDS,
+        lambda self, thread, templateType, **kwargs: {
+            "bot": self.bot.id,
+            "thread": thread,
+            "template": templateType,
+        },
+    )
     def render_template(self, thread, templateType, **kwargs):
         setting = "{}_TEMPLATE".format(templateType.upper())
         template = (
@@ -6237,12 +5884,13 @@ class Bot(object):
     def unsticky_threads(self, threads):
         for t in threads:
             try:
-                self.log.debug("Attempting to unsticky thread [{}]".format(t.id))
+                self.log.debug(logger.lazy("Attempting to unsticky thread [{}]", t.id))
                 t.mod.sticky(state=False)
             except Exception:
                 self.log.debug(
-                    "Unsticky of thread [{}] failed. Check mod privileges or the thread may not have been sticky.".format(
-                        t.id
+                    logger.lazy(
+                        "Unsticky of thread [{}] failed. Check mod privileges or the thread may not have been sticky.",
+                        t.id,
                     )
                 )
 
@@ -6250,7 +5898,13 @@ class Bot(object):
         s = {}
         while retries != 0:
             try:
-                s = statsapi.get(endpoint, params, force=force)
+                s = apicache.get(
+                    "statsapi",
+                    endpoint,
+                    params,
+                    lambda: self.timed_api_call(endpoint, params, force),
+                )
+
                 break
             except Exception as e:
                 if retries == 0:
@@ -6277,6 +5931,15 @@ class Bot(object):
 
         return s
 
+    def timed_standings_data(self):
+        with metrics.ApiTimer(self.bot.id, "statsapi", "standings_data"):
+            return statsapi.standings_data()
+
+    def timed_api_call(self, endpoint, params, force=False):
+        # Only requests not served from the shared cache are counted and timed
+        with metrics.ApiTimer(self.bot.id, "statsapi", endpoint):
+            return statsapi.get(endpoint, params, force=force)
+
     def build_tables(self):
         queries = []
         queries.append(
@@ -6341,13 +6004,17 @@ class Bot(object):
         )
 
         self.log.debug(
-            "Executing queries to build {} tables: {}".format(len(queries), queries)
+            logger.lazy(
+                "Executing queries to build {} tables: {}", len(queries), queries
+            )
         )
         results = rbdb.db_qry(queries, commit=True, closeAfter=True, logg=self.log)
         if None in results:
-            self.log.debug("One or more queries failed: {}".format(results))
+            self.log.debug(logger.lazy("One or more queries failed: {}", results))
         else:
-            self.log.debug("Building of tables complete. Results: {}".format(results))
+            self.log.debug(
+                logger.lazy("Building of tables complete. Results: {}", results)
+            )
 
         return True
 
@@ -6384,7 +6051,7 @@ class Bot(object):
 
         # Check here if settings have changed for other services added in the future (twitter, etc.)
 
-        self.log.debug("Refreshed settings: {}".format(self.settings))
+        self.log.debug(logger.lazy("Refreshed settings: {}", self.settings))
 
     def init_reddit(self):
         self.log.debug(f"Initiating Reddit API with praw v{praw.__version__}...")
@@ -6429,7 +6096,7 @@ class Bot(object):
                 raise
 
         missing_scopes = []
-        self.log.debug("Reddit authorized scopes: {}".format(praw_scopes))
+        self.log.debug(logger.lazy("Reddit authorized scopes: {}", praw_scopes))
         try:
             self.log.info("Reddit authorized user: {}".format(self.reddit.user.me()))
         except Exception as e:
@@ -6483,10 +6150,36 @@ class Bot(object):
 
     def sleep(self, t):
         # t = total number of seconds to sleep before returning
-        i = 0
-        while redball.SIGNAL is None and not self.bot.STOP and i < t:
-            i += 1
-            time.sleep(1)
+        # Returns early if the bot is stopped or redball is shutting down
+        # return True if the bot is stopping
+        return self.bot.sleep(t)
+
+    def schedule_current(self, pk):
+        # Return True if pk's schedule data was fetched less than SCHEDULE_MAX_AGE
+        # seconds ago, and its feed watcher has seen no new data since then
+        pkData = self.commonData.get(pk, {})
+        watcher = self.feedWatchers.get(pk)
+        if (
+            not watcher
+            or not watcher.is_alive()
+            or not pkData.get("schedule")
+            or not pkData.get("timestamps")
+            or time.time() - pkData.get("scheduleTime", 0) > SCHEDULE_MAX_AGE
+        ):
+            return False
+
+        return watcher.timecode == pkData["timestamps"][-1]
+
+    def get_feed_watcher(self, pk):
+        # Return the running feed watcher for pk, starting one if needed
+        with FEED_WATCHER_LOCK:
+            watcher = self.feedWatchers.get(pk)
+            if not watcher or not watcher.is_alive():
+                watcher = self.feedWatchers[pk] = feed_watcher.FeedWatcher(
+                    self, pk
+                ).start()
+
+        return watcher
 
     def convert_timezone(self, dt, convert_to="America/New_York"):
         # dt = datetime object to convert, convert_to = timezone to convert to (e.g. 'America/New_York', or 'local' for local bot timezone)
@@ -6535,6 +6228,149 @@ class Bot(object):
         "mlb": "/MLB",
     }
 
+    def game_summary(self, k, v):
+        # Summary block for game k in bot_state(): {"text", "html", "markdown"}
+        return {
+            "text": "\n\n{} ({}):\nGame thread{}{}".format(
+                k,
+                v.get("status", {}).get("detailedState", "Unknown Status"),
+                (
+                    " disabled."
+                    if not v["threads"]["game"]["enabled"]
+                    else (
+                        " skipped"
+                        if v["threads"]["game"].get("postTime", "") == ""
+                        and not v["threads"]["game"]["posted"]
+                        else (
+                            " not posted (check log for errors; this is normal if DH Game 2)"
+                            if not v["threads"]["game"]["posted"]
+                            and datetime.strptime(
+                                v["threads"]["game"]["postTime"],
+                                "%m/%d/%Y %I:%M:%S %p",
+                            )
+                            < datetime.today()
+                            else (
+                                " post time: {}.".format(
+                                    v["threads"]["game"]["postTime"]
+                                )
+                                if not v["threads"]["game"]["posted"]
+                                else ": {} ({} - {})".format(
+                                    v["threads"]["game"]["title"],
+                                    v["threads"]["game"]["id"],
+                                    v["threads"]["game"]["url"],
+                                )
+                            )
+                        )
+                    )
+                ),
+                (
+                    "\n\nPost game thread: {} ({} - {}).".format(
+                        v["threads"]["post"]["title"],
+                        v["threads"]["post"]["id"],
+                        v["threads"]["post"]["url"],
+                    )
+                    if v["threads"]["post"]["posted"]
+                    else (
+                        "\n\nPost game thread disabled."
+                        if not v["threads"]["post"]["enabled"]
+                        else ""
+                    )
+                ),
+            ),
+            "html": "<br /><br /><strong>{}</strong> ({}):<br /><strong>Game thread</strong>{}{}".format(
+                k,
+                v.get("status", {}).get("detailedState", "Unknown Status"),
+                (
+                    " disabled."
+                    if not v["threads"]["game"]["enabled"]
+                    else (
+                        " skipped"
+                        if v["threads"]["game"].get("postTime", "") == ""
+                        and not v["threads"]["game"]["posted"]
+                        else (
+                            " not posted (check log for errors; this is normal if DH Game 2)"
+                            if not v["threads"]["game"]["posted"]
+                            and datetime.strptime(
+                                v["threads"]["game"]["postTime"],
+                                "%m/%d/%Y %I:%M:%S %p",
+                            )
+                            < datetime.today()
+                            else (
+                                " post time: {}.".format(
+                                    v["threads"]["game"]["postTime"]
+                                )
+                                if not v["threads"]["game"]["posted"]
+                                else ': {} (<a href="{}" target="_blank">{}</a>)'.format(
+                                    v["threads"]["game"]["title"],
+                                    v["threads"]["game"]["url"],
+                                    v["threads"]["game"]["id"],
+                                )
+                            )
+                        )
+                    )
+                ),
+                (
+                    '<br /><br /><strong>Post game thread</strong>: {} (<a href="{}" target="_blank">{}</a>).'.format(
+                        v["threads"]["post"]["title"],
+                        v["threads"]["post"]["url"],
+                        v["threads"]["post"]["id"],
+                    )
+                    if v["threads"]["post"]["posted"]
+                    else (
+                        "<br /><br /><strong>Post game thread</strong> disabled."
+                        if not v["threads"]["post"]["enabled"]
+                        else ""
+                    )
+                ),
+            ),
+            "markdown": "\n\n**{}** ({}):\n\n**Game thread**{}{}".format(
+                k,
+                v.get("status", {}).get("detailedState", "Unknown Status"),
+                (
+                    " disabled."
+                    if not v["threads"]["game"]["enabled"]
+                    else (
+                        " skipped"
+                        if v["threads"]["game"].get("postTime", "") == ""
+                        and not v["threads"]["game"]["posted"]
+                        else (
+                            " not posted (check log for errors; this is normal if DH Game 2)"
+                            if not v["threads"]["game"]["posted"]
+                            and datetime.strptime(
+                                v["threads"]["game"]["postTime"],
+                                "%m/%d/%Y %I:%M:%S %p",
+                            )
+                            < datetime.today()
+                            else (
+                                " post time: {}.".format(
+                                    v["threads"]["game"]["postTime"]
+                                )
+                                if not v["threads"]["game"]["posted"]
+                                else ": {} ([{}]({}))".format(
+                                    v["threads"]["game"]["title"],
+                                    v["threads"]["game"]["id"],
+                                    v["threads"]["game"]["url"],
+                                )
+                            )
+                        )
+                    )
+                ),
+                (
+                    "\n\n**Post game thread**: {} ([{}]({})).".format(
+                        v["threads"]["post"]["title"],
+                        v["threads"]["post"]["id"],
+                        v["threads"]["post"]["url"],
+                    )
+                    if v["threads"]["post"]["posted"]
+                    else (
+                        "\n\n>**Post game thread** disabled."
+                        if not v["threads"]["post"]["enabled"]
+                        else ""
+                    )
+                ),
+            ),
+        }
+
     def bot_state(self):
         """Return current state...
         Current date being monitored
@@ -7100,179 +6936,51 @@ class Bot(object):
 
             if len(botStatus["games"]) > 0:
                 # Game and Post Game Thread(s)
+                # Each game's block is only rebuilt when the game's state changes
                 for x in botStatus["games"]:
                     for k, v in x.items():
-                        botStatus["summary"]["text"] += "{}".format(
-                            "\n\n{} ({}):\nGame thread{}{}".format(
-                                k,
-                                v.get("status", {}).get(
-                                    "detailedState", "Unknown Status"
-                                ),
-                                (
-                                    " disabled."
-                                    if not v["threads"]["game"]["enabled"]
-                                    else (
-                                        " skipped"
-                                        if v["threads"]["game"].get("postTime", "")
-                                        == ""
-                                        and not v["threads"]["game"]["posted"]
-                                        else (
-                                            " not posted (check log for errors; this is normal if DH Game 2)"
-                                            if not v["threads"]["game"]["posted"]
-                                            and datetime.strptime(
-                                                v["threads"]["game"]["postTime"],
-                                                "%m/%d/%Y %I:%M:%S %p",
-                                            )
-                                            < datetime.today()
-                                            else (
-                                                " post time: {}.".format(
-                                                    v["threads"]["game"]["postTime"]
-                                                )
-                                                if not v["threads"]["game"]["posted"]
-                                                else ": {} ({} - {})".format(
-                                                    v["threads"]["game"]["title"],
-                                                    v["threads"]["game"]["id"],
-                                                    v["threads"]["game"]["url"],
-                                                )
-                                            )
-                                        )
-                                    )
-                                ),
-                                (
-                                    "\n\nPost game thread: {} ({} - {}).".format(
-                                        v["threads"]["post"]["title"],
-                                        v["threads"]["post"]["id"],
-                                        v["threads"]["post"]["url"],
-                                    )
-                                    if v["threads"]["post"]["posted"]
-                                    else (
-                                        "\n\nPost game thread disabled."
-                                        if not v["threads"]["post"]["enabled"]
-                                        else ""
-                                    )
-                                ),
+                        gameThread = v["threads"]["game"]
+                        postTimePassed = bool(
+                            gameThread["enabled"]
+                            and not gameThread["posted"]
+                            and gameThread.get("postTime", "") != ""
+                            and datetime.strptime(
+                                gameThread["postTime"], "%m/%d/%Y %I:%M:%S %p"
                             )
+                            < datetime.today()
                         )
-
-                for x in botStatus["games"]:
-                    for k, v in x.items():
-                        botStatus["summary"]["html"] += "{}".format(
-                            "<br /><br /><strong>{}</strong> ({}):<br /><strong>Game thread</strong>{}{}".format(
-                                k,
-                                v.get("status", {}).get(
-                                    "detailedState", "Unknown Status"
-                                ),
-                                (
-                                    " disabled."
-                                    if not v["threads"]["game"]["enabled"]
-                                    else (
-                                        " skipped"
-                                        if v["threads"]["game"].get("postTime", "")
-                                        == ""
-                                        and not v["threads"]["game"]["posted"]
-                                        else (
-                                            " not posted (check log for errors; this is normal if DH Game 2)"
-                                            if not v["threads"]["game"]["posted"]
-                                            and datetime.strptime(
-                                                v["threads"]["game"]["postTime"],
-                                                "%m/%d/%Y %I:%M:%S %p",
-                                            )
-                                            < datetime.today()
-                                            else (
-                                                " post time: {}.".format(
-                                                    v["threads"]["game"]["postTime"]
-                                                )
-                                                if not v["threads"]["game"]["posted"]
-                                                else ': {} (<a href="{}" target="_blank">{}</a>)'.format(
-                                                    v["threads"]["game"]["title"],
-                                                    v["threads"]["game"]["url"],
-                                                    v["threads"]["game"]["id"],
-                                                )
-                                            )
-                                        )
-                                    )
-                                ),
-                                (
-                                    '<br /><br /><strong>Post game thread</strong>: {} (<a href="{}" target="_blank">{}</a>).'.format(
-                                        v["threads"]["post"]["title"],
-                                        v["threads"]["post"]["url"],
-                                        v["threads"]["post"]["id"],
-                                    )
-                                    if v["threads"]["post"]["posted"]
-                                    else (
-                                        "<br /><br /><strong>Post game thread</strong> disabled."
-                                        if not v["threads"]["post"]["enabled"]
-                                        else ""
-                                    )
-                                ),
-                            )
+                        # Inputs are copied, commonData dicts in v change in place
+                        gameSummary = self.bot.summary_block(
+                            "game-{}".format(k),
+                            (
+                                v["status"].get("detailedState"),
+                                v["status"].get("statusCode"),
+                                json.dumps(v["threads"], sort_keys=True),
+                                postTimePassed,
+                            ),
+                            lambda: self.game_summary(k, v),
                         )
+                        for fmt in ["text", "html", "markdown"]:
+                            botStatus["summary"][fmt] += gameSummary[fmt]
 
-                for x in botStatus["games"]:
-                    for k, v in x.items():
-                        botStatus["summary"]["markdown"] += "{}".format(
-                            "\n\n**{}** ({}):\n\n**Game thread**{}{}".format(
-                                k,
-                                v.get("status", {}).get(
-                                    "detailedState", "Unknown Status"
-                                ),
-                                (
-                                    " disabled."
-                                    if not v["threads"]["game"]["enabled"]
-                                    else (
-                                        " skipped"
-                                        if v["threads"]["game"].get("postTime", "")
-                                        == ""
-                                        and not v["threads"]["game"]["posted"]
-                                        else (
-                                            " not posted (check log for errors; this is normal if DH Game 2)"
-                                            if not v["threads"]["game"]["posted"]
-                                            and datetime.strptime(
-                                                v["threads"]["game"]["postTime"],
-                                                "%m/%d/%Y %I:%M:%S %p",
-                                            )
-                                            < datetime.today()
-                                            else (
-                                                " post time: {}.".format(
-                                                    v["threads"]["game"]["postTime"]
-                                                )
-                                                if not v["threads"]["game"]["posted"]
-                                                else ": {} ([{}]({}))".format(
-                                                    v["threads"]["game"]["title"],
-                                                    v["threads"]["game"]["id"],
-                                                    v["threads"]["game"]["url"],
-                                                )
-                                            )
-                                        )
-                                    )
-                                ),
-                                (
-                                    "\n\n**Post game thread**: {} ([{}]({})).".format(
-                                        v["threads"]["post"]["title"],
-                                        v["threads"]["post"]["id"],
-                                        v["threads"]["post"]["url"],
-                                    )
-                                    if v["threads"]["post"]["posted"]
-                                    else (
-                                        "\n\n>**Post game thread** disabled."
-                                        if not v["threads"]["post"]["enabled"]
-                                        else ""
-                                    )
-                                ),
-                            )
-                        )
+            # Stamp the summary with the time the rest of it last changed, so the
+            # summary (and summaryVersion, ETags and status events) is stable otherwise
+            if botStatus["summary"] != self.lastSummary[0]:
+                summary = dict(botStatus["summary"])
+                summary["text"] += "\n\nLast Changed: {}".format(
+                    botStatus["lastUpdated"]
+                )
+                summary[
+                    "html"
+                ] += "<br /><br /><strong>Last Changed</strong>: {}".format(
+                    botStatus["lastUpdated"]
+                )
+                summary["markdown"] += "\n\n**Last Changed**: {}".format(
+                    botStatus["lastUpdated"]
+                )
+                self.lastSummary = (dict(botStatus["summary"]), summary)
 
-            botStatus["summary"]["text"] += "\n\nLast Updated: {}".format(
-                botStatus["lastUpdated"]
-            )
-            botStatus["summary"][
-                "html"
-            ] += "<br /><br /><strong>Last Updated</strong>: {}".format(
-                botStatus["lastUpdated"]
-            )
-            botStatus["summary"]["markdown"] += "\n\n**Last Updated**: {}".format(
-                botStatus["lastUpdated"]
-            )
+            botStatus["summary"] = dict(self.lastSummary[1])
         except Exception as e:
             botStatus = {
                 "lastUpdated": datetime.today().strftime("%m/%d/%Y %I:%M:%S %p"),
@@ -7284,5 +6992,5 @@ class Bot(object):
             }
             self.error_notification("Error retrieving bot state")
 
-        self.log.debug("Bot Status: {}".format(botStatus))  # debug
+        self.log.debug(logger.lazy("Bot Status: {}", botStatus))  # debug
         self.bot.detailedState = botStatus
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# encoding=utf-8
+"""Live game feed watcher for the MLB Game Thread Bot
+
+One watcher thread per gamePk polls game_timestamps for all of the bot's
+threads that follow the game (game thread, comment monitor), and wakes them
+when there is a new timecode, so they only collect data and render templates
+when something happened. Polling is faster during at-bats and slower during
+breaks, reviews and delays.
+"""
+
+import threading
+import time
+
+import redball
+
+MIN_POLL_INTERVAL = 2  # Seconds
+IDLE_TIMEOUT = 600  # Seconds without anyone waiting before the watcher exits
+STOP_CHECK_INTERVAL = 1  # Seconds between checks for stop signals while waiting
+
+
+class FeedWatcher(object):
+    def __init__(self, gameBot, pk):
+        # gameBot = game_threads Bot instance that owns the watcher
+        self.gameBot = gameBot
+        self.pk = pk
+        self.cond = threading.Condition()
+        self.timestamps = []
+        self.timecode = None  # Latest timecode
+        self.lastPoll = 0
+        self.lastWait = time.time()
+        self.seen = {}  # consumer: last timecode returned to the consumer
+        self.thread = threading.Thread(
+            target=self.run,
+            name="bot-{}-{}-game-{}-feed".format(
+                gameBot.bot.id, gameBot.bot.name.replace(" ", "-"), pk
+            ),
+            daemon=True,
+        )
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def stopping(self):
+        return redball.SIGNAL is not None or self.gameBot.bot.STOP
+
+    def poll_interval(self):
+        # Seconds until the next poll, based on the state of the game
+        settings = self.gameBot.settings.get("Game Thread", {})
+        base = max(1, settings.get("UPDATE_INTERVAL", 10))
+        notLive = max(1, settings.get("UPDATE_INTERVAL_NOT_LIVE", 1)) * 60
+        pkData = self.gameBot.commonData.get(self.pk, {})
+        gumbo = pkData.get("gumbo", {})
+        status = gumbo.get("gameData", {}).get("status") or pkData.get(
+            "schedule", {}
+        ).get("status", {})
+        if status.get("abstractGameCode") != "L":
+            # Not started or final
+            return notLive
+
+        detailedState = status.get("detailedState", "")
+        if detailedState.startswith(("Delayed", "Suspended")) and status.get(
+            "statusCode"
+        ) not in ["I", "IZ", "IH"]:
+            # Rain delay etc.
+            return notLive
+
+        if status.get("statusCode") == "IH" or any(
+            x in detailedState.lower() for x in ["review", "challenge"]
+        ):
+            # Instant replay
+            return base * 2
+
+        inningState = gumbo.get("liveData", {}).get("linescore", {}).get("inningState")
+        if inningState in ["Middle", "End"]:
+            # Break between half innings
+            return base * 3
+
+        # At-bat in progress
+        return max(MIN_POLL_INTERVAL, base / 2)
+
+    def poll(self):
+        timestamps = self.gameBot.api_call(
+            "game_timestamps", {"gamePk": self.pk}, retries=1
+        )
+        if not isinstance(timestamps, list) or not len(timestamps):
+            return
+
+        with self.cond:
+            self.timestamps = timestamps
+            self.lastPoll = time.time()
+            if timestamps[-1] != self.timecode:
+                self.timecode = timestamps[-1]
+                self.cond.notify_all()
+
+    def run(self):
+        self.gameBot.log.debug("Starting feed watcher for game {}.".format(self.pk))
+        while not self.stopping() and time.time() - self.lastWait < IDLE_TIMEOUT:
+            self.poll()
+            self.gameBot.sleep(self.poll_interval())
+
+        with self.cond:
+            self.cond.notify_all()
+
+        self.gameBot.log.debug("Feed watcher for game {} stopped.".format(self.pk))
+
+    def get_timestamps(self, maxAge):
+        # Return the latest timestamps if polled within maxAge seconds, else None
+        with self.cond:
+            if self.timestamps and time.time() - self.lastPoll <= maxAge:
+                return list(self.timestamps)
+
+        return None
+
+    def fresh_timestamps(self):
+        # Return the timestamps from the watcher's current poll cycle,
+        # or None if it isn't running
+        if not self.is_alive():
+            return None
+
+        return self.get_timestamps(self.poll_interval() + MIN_POLL_INTERVAL)
+
+    def wait(self, consumer, minWait=0, maxWait=60):
+        # Sleep at least minWait seconds, then until there is a timecode the
+        # consumer hasn't seen, or maxWait seconds have passed since starting
+        # return True if there is new data
+        start = time.time()
+        self.lastWait = start
+        if minWait and self.gameBot.sleep(minWait):
+            return False
+
+        with self.cond:
+            while (
+                self.timecode is None or self.timecode == self.seen.get(consumer)
+            ) and not self.stopping():
+                remaining = start + maxWait - time.time()
+                if remaining <= 0 or not self.is_alive():
+                    break
+
+                self.lastWait = time.time()
+                self.cond.wait(min(remaining, STOP_CHECK_INTERVAL))
+
+            new = self.timecode is not None and self.timecode != self.seen.get(
+                consumer
+            )
+            self.seen[consumer] = self.timecode
+
+        return new
@@ -14,10 +14,13 @@ import threading
 import time
 
 import redball
-from redball import logger
+from redball import apicache, logger
 
 __version__ = "1.1.0.1"
 
+# Share StatsAPI responses with other bots through the process-wide cache
+statsapi = apicache.CachedClient(statsapi, "statsapi")
+
 tl = threading.local()
 
 
@@ -19,7 +19,7 @@ import time
 import threading
 
 import redball
-from redball import database as rbdb, logger
+from redball import database as rbdb, logger, metrics
 
 import os
 
@@ -69,8 +69,11 @@ class Bot(object):
             propagate=False,
         )
         self.log.debug(
-            "NHL Game Thread Bot v{} received settings: {}. Template path: {}".format(
-                __version__, self.settings, self.BOT_TEMPLATE_PATH
+            logger.lazy(
+                "NHL Game Thread Bot v{} received settings: {}. Template path: {}",
+                __version__,
+                self.settings,
+                self.BOT_TEMPLATE_PATH,
             )
         )
 
@@ -78,6 +81,7 @@ class Bot(object):
         self.dbTablePrefix = self.settings.get("Database").get(
             "dbTablePrefix", "nhl_gdt{}_".format(self.bot.id)
         )
+        self.db = rbdb.BotTables(self.dbTablePrefix, gameKey="gameId", logg=self.log)
         self.build_tables()
 
         # Initialize Reddit API connection
@@ -153,7 +157,7 @@ class Bot(object):
             self.log.debug(
                 f"Initializing NHL API with pynhlapi v{pynhlapi.__version__}"
             )
-            self.nhl = pynhlapi.API()
+            self.nhl = metrics.TimedClient(pynhlapi.API(), self.bot.id, "nhl")
 
             if todayOverrideFlag:
                 self.log.info(
@@ -356,21 +360,16 @@ class Bot(object):
                 )
                 """ Holds data about current week games, including detailed data for my team's game """
                 if redball.DEV:
-                    self.log.debug(f"allData: {self.allData}")
+                    self.log.debug(logger.lazy("allData: {}", self.allData))
 
                 # Check DB for gameId
-                gq = f"select * from {self.dbTablePrefix}games where gameId = '{gamePk}' and gameDate = '{self.today['Y-m-d']}';"
-                dbGames = rbdb.db_qry(gq, closeAfter=True, logg=self.log)
+                dbGames = self.db.games.find(gamePk, self.today["Y-m-d"])
 
                 if dbGames and len(dbGames) > 0:
                     self.log.debug(f"Game [{gamePk}] is already in the database.")
                 else:
                     # Add game to DB
-                    q = (
-                        f"insert into {self.dbTablePrefix}games (gameId, gameDate, dateAdded) "
-                        f"values ('{gamePk}', '{self.today['Y-m-d']}', {time.time()});"
-                    )
-                    rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                    self.db.games.insert(gamePk, self.today["Y-m-d"])
 
                 # Tailgate Thread
                 if not self.settings.get("Tailgate Thread", {}).get("ENABLED", True):
@@ -391,7 +390,9 @@ class Bot(object):
                     )
                     self.THREADS["tailgate"].start()
                     self.log.debug(
-                        "Started tailgate thread {}.".format(self.THREADS["tailgate"])
+                        logger.lazy(
+                            "Started tailgate thread {}.", self.THREADS["tailgate"]
+                        )
                     )
 
                 for g in todayGames:
@@ -413,7 +414,7 @@ class Bot(object):
                         )
                         self.THREADS["game"].start()
                         self.log.debug(
-                            "Started game thread {}.".format(self.THREADS["game"])
+                            logger.lazy("Started game thread {}.", self.THREADS["game"])
                         )
                     else:
                         self.log.info("Game thread is disabled!")
@@ -435,7 +436,9 @@ class Bot(object):
                         )
                         self.THREADS["post"].start()
                         self.log.debug(
-                            "Started post game thread {}.".format(self.THREADS["post"])
+                            logger.lazy(
+                                "Started post game thread {}.", self.THREADS["post"]
+                            )
                         )
                     else:
                         self.log.info("Post game thread is disabled!")
@@ -498,8 +501,8 @@ class Bot(object):
                                 )
                                 self.THREADS["game"].start()
                                 self.log.debug(
-                                    "Started game thread {}.".format(
-                                        self.THREADS["game"]
+                                    logger.lazy(
+                                        "Started game thread {}.", self.THREADS["game"]
                                     )
                                 )
                             else:
@@ -554,8 +557,9 @@ class Bot(object):
                                 )
                                 self.THREADS["post"].start()
                                 self.log.debug(
-                                    "Started post game thread {}.".format(
-                                        self.THREADS["post"]
+                                    logger.lazy(
+                                        "Started post game thread {}.",
+                                        self.THREADS["post"],
                                     )
                                 )
                             else:
@@ -609,8 +613,9 @@ class Bot(object):
                             )
                             self.THREADS["tailgate"].start()
                             self.log.debug(
-                                "Started tailgate thread {}.".format(
-                                    self.THREADS["tailgate"]
+                                logger.lazy(
+                                    "Started tailgate thread {}.",
+                                    self.THREADS["tailgate"],
                                 )
                             )
                         else:
@@ -619,12 +624,14 @@ class Bot(object):
                     if next((k for k, v in self.stopFlags.items() if not v), None):
                         # There are still threads pending/in progress
                         self.log.debug(
-                            "Thread(s) with negative stop flags: {}".format(
-                                [k for k, v in self.stopFlags.items() if not v]
+                            logger.lazy(
+                                "Thread(s) with negative stop flags: {}",
+                                [k for k, v in self.stopFlags.items() if not v],
                             )
                         )
                         self.log.debug(
-                            "Active update process threads: {}".format(
+                            logger.lazy(
+                                "Active update process threads: {}",
                                 [
                                     t
                                     for t in threading.enumerate()
@@ -634,7 +641,7 @@ class Bot(object):
                                             self.bot.name.replace(" ", "-"),
                                         )
                                     )
-                                ]
+                                ],
                             )
                         )
                         self.sleep(30)
@@ -694,8 +701,9 @@ class Bot(object):
             }
         )
         self.log.debug(
-            "Tailgate thread post time: {}".format(
-                self.threadCache["tailgate"]["postTime_local"]
+            logger.lazy(
+                "Tailgate thread post time: {}",
+                self.threadCache["tailgate"]["postTime_local"],
             )
         )
         while (
@@ -745,8 +753,9 @@ class Bot(object):
                 self.staleThreads = []
 
         # Check if tailgate thread already posted (record in threads table with type='tailgate' for today's gamePk)
-        tgq = f"select * from {self.dbTablePrefix}threads where type='tailgate' and gameId = '{self.allData['gamePk']}' and gameDate = '{self.today['Y-m-d']}' and deleted=0;"
-        tgThread = rbdb.db_qry(tgq, closeAfter=True, logg=self.log)
+        tgThread = self.db.threads.find(
+            "tailgate", self.allData["gamePk"], self.today["Y-m-d"]
+        )
 
         tailgateThread = None
         if len(tgThread) > 0:
@@ -754,10 +763,7 @@ class Bot(object):
             tailgateThread = self.reddit.submission(tgThread[0]["id"])
             if not tailgateThread.author:
                 self.log.warning("Tailgate thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, tailgateThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(tailgateThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -845,7 +851,9 @@ class Bot(object):
                         data=self.allData,
                         settings=self.settings,
                     )
-                    self.log.debug("Rendered tailgate thread text: {}".format(text))
+                    self.log.debug(
+                        logger.lazy("Rendered tailgate thread text: {}", text)
+                    )
                     if text != self.threadCache["tailgate"].get("text") and text != "":
                         self.threadCache["tailgate"].update({"text": text})
                         text += (
@@ -865,6 +873,7 @@ class Bot(object):
                             )
                         )
                         self.threadCache["tailgate"]["thread"].edit(text)
+                        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                         self.log.info("Tailgate thread edits submitted.")
                         self.count_check_edit(
                             self.threadCache["tailgate"]["thread"].id, "NA", edit=True
@@ -964,8 +973,9 @@ class Bot(object):
                     break
 
             self.log.debug(
-                "Tailgate thread stop criteria not met ({}).".format(
-                    update_tailgate_thread_until
+                logger.lazy(
+                    "Tailgate thread stop criteria not met ({}).",
+                    update_tailgate_thread_until,
                 )
             )  # debug - need this to tell if logic is working
 
@@ -993,10 +1003,7 @@ class Bot(object):
         )
 
         # Check if game thread is already posted
-        gq = "select * from {}threads where type='game' and gameId = '{}' and gameDate = '{}' and deleted=0;".format(
-            self.dbTablePrefix, gamePk, self.today["Y-m-d"]
-        )
-        gThread = rbdb.db_qry(gq, closeAfter=True, logg=self.log)
+        gThread = self.db.threads.find("game", gamePk, self.today["Y-m-d"])
 
         gameThread = None
         if len(gThread) > 0:
@@ -1004,10 +1011,7 @@ class Bot(object):
             gameThread = self.reddit.submission(gThread[0]["id"])
             if not gameThread.author:
                 self.log.warning("Game thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, gameThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(gameThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1065,7 +1069,8 @@ class Bot(object):
                 }
             )
             self.log.debug(
-                "Game thread post time: {} (min of Game Start: {}, Post By: {}, Min Before: {})".format(
+                logger.lazy(
+                    "Game thread post time: {} (min of Game Start: {}, Post By: {}, Min Before: {})",
                     self.threadCache["game"]["postTime_local"],
                     gameStart,
                     postBy,
@@ -1218,7 +1223,7 @@ class Bot(object):
                     data=self.allData,
                     settings=self.settings,
                 )
-                self.log.debug(f"rendered game thread text: {text}")
+                self.log.debug(logger.lazy("rendered game thread text: {}", text))
                 if text != self.threadCache["game"].get("text") and text != "":
                     self.threadCache["game"].update({"text": text})
                     # Add last updated timestamp
@@ -1233,6 +1238,7 @@ class Bot(object):
                         "%m/%d/%Y ^^^%I:%M:%S ^^^%p ^^^%Z"
                     )
                     self.threadCache["game"]["thread"].edit(text)
+                    metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                     self.log.info("Edits submitted for game thread.")
                     self.count_check_edit(
                         self.threadCache["game"]["thread"].id,
@@ -1316,8 +1322,8 @@ class Bot(object):
                     break
 
             self.log.debug(
-                "Game thread stop criteria not met ({}).".format(
-                    update_game_thread_until
+                logger.lazy(
+                    "Game thread stop criteria not met ({}).", update_game_thread_until
                 )
             )  # debug - need this to tell if logic is working
 
@@ -1392,7 +1398,8 @@ class Bot(object):
                 self.collect_data()
             else:
                 self.log.debug(
-                    "Game is not yet final ({}). Sleeping for 1 minute...".format(
+                    logger.lazy(
+                        "Game is not yet final ({}). Sleeping for 1 minute...",
                         self.allData["game"]["gameState"],
                     )
                 )
@@ -1417,10 +1424,9 @@ class Bot(object):
 
         # TODO: Loop in case thread creation fails due to title template error or API error? At least break from update loop...
         # Game is over - check if postgame thread already posted (record in db with gameId and type='post' and gameDate=today)
-        pgq = "select * from {}threads where type='post' and gameId = '{}' and gameDate = '{}' and deleted=0;".format(
-            self.dbTablePrefix, self.allData["gamePk"], self.today["Y-m-d"]
+        pgThread = self.db.threads.find(
+            "post", self.allData["gamePk"], self.today["Y-m-d"]
         )
-        pgThread = rbdb.db_qry(pgq, closeAfter=True, logg=self.log)
 
         postGameThread = None
         if len(pgThread) > 0:
@@ -1430,10 +1436,7 @@ class Bot(object):
             postGameThread = self.reddit.submission(pgThread[0]["id"])
             if not postGameThread.author:
                 self.log.warning("Post game thread appears to have been deleted.")
-                q = "update {}threads set deleted=1 where id='{}';".format(
-                    self.dbTablePrefix, postGameThread.id
-                )
-                u = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+                u = self.db.threads.mark_deleted(postGameThread.id)
                 if isinstance(u, str):
                     self.log.error(
                         "Error marking thread as deleted in database: {}".format(u)
@@ -1515,7 +1518,9 @@ class Bot(object):
                         data=self.allData,
                         settings=self.settings,
                     )
-                    self.log.debug(f"Rendered post game thread text: {text}")
+                    self.log.debug(
+                        logger.lazy("Rendered post game thread text: {}", text)
+                    )
                     if text != self.threadCache["post"]["text"] and text != "":
                         self.threadCache["post"]["text"] = text
                         text += """
@@ -1529,6 +1534,7 @@ class Bot(object):
                             "%m/%d/%Y ^^^%I:%M:%S ^^^%p ^^^%Z"
                         )
                         self.threadCache["post"]["thread"].edit(text)
+                        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="edit")
                         self.log.info("Post game thread edits submitted.")
                         self.log_last_updated_date_in_db(
                             self.threadCache["post"]["thread"].id
@@ -1658,7 +1664,8 @@ class Bot(object):
                 "lastUpdate", datetime.today() - timedelta(hours=1)
             ) >= datetime.today() - timedelta(seconds=cache_seconds):
                 self.log.debug(
-                    "Using cached data, updated {} seconds ago.".format(
+                    logger.lazy(
+                        "Using cached data, updated {} seconds ago.",
                         (datetime.today() - self.allData["lastUpdate"]).total_seconds(),
                     )
                 )
@@ -1685,7 +1692,9 @@ class Bot(object):
                 if x["awayTeam"]["id"] in self.otherDivisionTeamIds
                 or x["homeTeam"]["id"] in self.otherDivisionTeamIds
             ]
-            self.log.debug(f"Gathering data for gamePk [{self.allData['gamePk']}]...")
+            self.log.debug(
+                logger.lazy("Gathering data for gamePk [{}]...", self.allData["gamePk"])
+            )
             game = self.nhl.game(self.allData["gamePk"])
             game_right_rail = self.nhl.game_right_rail(self.allData["gamePk"])
             homeAway = (
@@ -1693,7 +1702,7 @@ class Bot(object):
                 if game["homeTeam"]["id"] == self.myTeam["id"]
                 else "away" if game["awayTeam"]["id"] == self.myTeam["id"] else None
             )
-            self.log.debug(f"My team is [{homeAway}] (homeAway)")
+            self.log.debug(logger.lazy("My team is [{}] (homeAway)", homeAway))
             oppTeam = next(
                 (
                     x
@@ -1708,8 +1717,8 @@ class Bot(object):
                 None,
             )
             oppTeamId = oppTeam["id"]
-            self.log.debug(f"oppTeamId: {oppTeamId}")
-            self.log.debug(f"oppTeam: {oppTeam}")
+            self.log.debug(logger.lazy("oppTeamId: {}", oppTeamId))
+            self.log.debug(logger.lazy("oppTeam: {}", oppTeam))
             gameTime = (
                 self.convert_timezone(  # Convert Zulu to my team TZ
                     datetime.fromisoformat(game["startTimeUTC"]),
@@ -1763,18 +1772,14 @@ class Bot(object):
 
         if redball.DEV:
             self.log.debug(
-                "Data available for threads: {}".format(self.allData)
+                logger.lazy("Data available for threads: {}", self.allData)
             )  # debug
 
         return True
 
     def log_last_updated_date_in_db(self, threadId, t=None):
         # threadId = Reddit thread id that was edited, t = timestamp of edit
-        q = "update {}threads set dateUpdated=? where id=?;".format(self.dbTablePrefix)
-        if not t:
-            t = time.time()
-        localArgs = (t, threadId)
-        i = rbdb.db_qry((q, localArgs), commit=True, closeAfter=True, logg=self.log)
+        i = self.db.threads.set_updated(threadId, t)
         if isinstance(i, str):
             self.log.error("Error updating thread edit date in database: {}".format(i))
             return False
@@ -1783,23 +1788,7 @@ class Bot(object):
 
     def insert_thread_to_db(self, pk, threadId, type):
         # pk = gameId (or list of gameIds), threadId = thread object returned from Reddit (OFF+date for off day threads), type = ['tailgate', 'game', 'post']
-        q = "insert or ignore into {}threads (gameId, type, gameDate, id, dateCreated, dateUpdated) values".format(
-            self.dbTablePrefix
-        )
-        if isinstance(pk, list):
-            for k in pk:
-                if q[:-1] == ")":
-                    q += ","
-                q += " ('{}', '{}', '{}', '{}', {}, {})".format(
-                    k, type, self.today["Y-m-d"], threadId, time.time(), time.time()
-                )
-        else:
-            q += " ('{}', '{}', '{}', '{}', {}, {})".format(
-                pk, type, self.today["Y-m-d"], threadId, time.time(), time.time()
-            )
-
-        q += ";"
-        i = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+        i = self.db.threads.insert(pk, type, self.today["Y-m-d"], threadId)
         if isinstance(i, str):
             self.log.error("Error inserting thread into database: {}".format(i))
             return False
@@ -1808,40 +1797,7 @@ class Bot(object):
 
     def count_check_edit(self, threadId, status, edit=False):
         # threadId = reddit thread id, status = game status (statusCode, code for detailed state)
-        sq = "select checks,edits from {}thread_edits where threadId='{}' and status='{}';".format(
-            self.dbTablePrefix, threadId, status
-        )
-        s = rbdb.db_qry(sq, closeAfter=True, logg=self.log)
-        if isinstance(s, str):
-            # Error querying for existing row
-            self.log.error(
-                "Error querying for existing row in {}thread_edits table for threadId {} and status {}: {}".format(
-                    self.dbTablePrefix, threadId, status, s
-                )
-            )
-            return False
-        elif s != []:
-            # Row already exists; increment edit count
-            q = "update {}thread_edits set checks=checks+1,{} dateUpdated='{}' where threadId='{}' and status='{}';".format(
-                self.dbTablePrefix,
-                " edits=edits+1," if edit else "",
-                time.time(),
-                threadId,
-                status,
-            )
-        else:
-            # Row does not exist; insert it
-            q = "insert into {}thread_edits (threadId, status, checks, edits, dateCreated, dateUpdated) values ('{}', '{}', {}, {}, '{}', '{}');".format(
-                self.dbTablePrefix,
-                threadId,
-                status,
-                1,
-                1 if edit else 0,
-                time.time(),
-                time.time(),
-            )
-
-        r = rbdb.db_qry(q, commit=True, closeAfter=True, logg=self.log)
+        r = self.db.thread_edits.increment(threadId, status, edit)
         if isinstance(r, str):
             # Error inserting/updating row
             self.log.error(
@@ -1853,6 +1809,10 @@ class Bot(object):
 
         return True
 
+    @metrics.timed(
+        metrics.BOT_PREP_AND_POST_SECONDS,
+        lambda self, thread, *args, **kwargs: {"bot": self.bot.id, "thread": thread},
+    )
     def prep_and_post(self, thread, postFooter=None):
         # thread = ['tailgate', 'game', 'post']
         # postFooter = text to append to post body, but not to include in return text value
@@ -1867,7 +1827,7 @@ class Bot(object):
                 data=self.allData,
                 settings=self.settings,
             )
-            self.log.debug("Rendered {} title: {}".format(thread, title))
+            self.log.debug(logger.lazy("Rendered {} title: {}", thread, title))
         except Exception as e:
             self.log.error("Error rendering {} title: {}".format(thread, e))
             title = None
@@ -1991,7 +1951,7 @@ class Bot(object):
                     data=self.allData,
                     settings=self.settings,
                 )
-                self.log.debug("Rendered {} text: {}".format(thread, text))
+                self.log.debug(logger.lazy("Rendered {} text: {}", thread, text))
             except Exception as e:
                 self.log.error("Error rendering {} text: {}".format(thread, e))
                 text = None
@@ -2027,8 +1987,10 @@ class Bot(object):
 
         if theThread:
             self.log.debug(
-                "Inserting {} thread into DB for game {}...".format(
-                    thread, self.allData["gamePk"]
+                logger.lazy(
+                    "Inserting {} thread into DB for game {}...",
+                    thread,
+                    self.allData["gamePk"],
                 )
             )
             self.insert_thread_to_db(self.allData["gamePk"], theThread, thread)
@@ -2057,8 +2019,8 @@ class Bot(object):
                 )
                 if webhook_url:
                     self.log.debug(
-                        "Webhook{} URL for {} thread: [{}].".format(
-                            s, thread, webhook_url
+                        logger.lazy(
+                            "Webhook{} URL for {} thread: [{}].", s, thread, webhook_url
                         )
                     )
                     webhook_text = self.render_template(
@@ -2069,7 +2031,9 @@ class Bot(object):
                         theThread=theThread,
                     )
                     self.log.debug(
-                        "Rendered {} webhook{} text: {}".format(thread, s, webhook_text)
+                        logger.lazy(
+                            "Rendered {} webhook{} text: {}", thread, s, webhook_text
+                        )
                     )
                     if webhook_text:
                         webhook_result = self.post_webhook(webhook_url, webhook_text)
@@ -2187,6 +2151,9 @@ class Bot(object):
                                 "Submitting comment in previous thread with link to new thread..."
                             )
                             lockReply = previousThread.reply(parsedCommentText)
+                            metrics.BOT_REDDIT_REQUESTS.inc(
+                                bot=self.bot.id, action="comment"
+                            )
                             self.log.debug("Distinguishing comment...")
                             lockReply.mod.distinguish(sticky=True)
                             self.log.debug(
@@ -2337,6 +2304,7 @@ class Bot(object):
             send_replies=inboxReplies,
             discussion_type="CHAT" if live_discussion else None,
         )
+        metrics.BOT_REDDIT_REQUESTS.inc(bot=self.bot.id, action="submit")
         self.log.info("Thread ({}) submitted: {}".format(title, post))
 
         if sticky:
@@ -2390,6 +2358,14 @@ class Bot(object):
 
         return post
 
+    @metrics.timed(
+        metrics.BOT_RENDER_SECONDS,
+        lambda self, thread, templateType, **kwargs: {
+            "bot": self.bot.id,
+            "thread": thread,
+            "template": templateType,
+        },
+    )
     def render_template(self, thread, templateType, **kwargs):
         setting = "{}_TEMPLATE".format(templateType.upper())
         templateFilename = (
@@ -2466,12 +2442,13 @@ class Bot(object):
     def unsticky_threads(self, threads):
         for t in threads:
             try:
-                self.log.debug("Attempting to unsticky thread [{}]".format(t.id))
+                self.log.debug(logger.lazy("Attempting to unsticky thread [{}]", t.id))
                 t.mod.sticky(state=False)
             except Exception:
                 self.log.debug(
-                    "Unsticky of thread [{}] failed. Check mod privileges or the thread may not have been sticky.".format(
-                        t.id
+                    logger.lazy(
+                        "Unsticky of thread [{}] failed. Check mod privileges or the thread may not have been sticky.",
+                        t.id,
                     )
                 )
 
@@ -2518,13 +2495,17 @@ class Bot(object):
         )
 
         self.log.debug(
-            "Executing queries to build {} tables: {}".format(len(queries), queries)
+            logger.lazy(
+                "Executing queries to build {} tables: {}", len(queries), queries
+            )
         )
         results = rbdb.db_qry(queries, commit=True, closeAfter=True, logg=self.log)
         if None in results:
-            self.log.debug("One or more queries failed: {}".format(results))
+            self.log.debug(logger.lazy("One or more queries failed: {}", results))
         else:
-            self.log.debug("Building of tables complete. Results: {}".format(results))
+            self.log.debug(
+                logger.lazy("Building of tables complete. Results: {}", results)
+            )
 
         return True
 
@@ -2561,7 +2542,7 @@ class Bot(object):
 
         # Check here if settings have changed for other services added in the future (twitter, etc.)
 
-        self.log.debug("Refreshed settings: {}".format(self.settings))
+        self.log.debug(logger.lazy("Refreshed settings: {}", self.settings))
 
     def init_reddit(self):
         self.log.debug(f"Initializing Reddit API with praw v{praw.__version__}...")
@@ -2606,7 +2587,7 @@ class Bot(object):
                 raise
 
         missing_scopes = []
-        self.log.debug("Reddit authorized scopes: {}".format(praw_scopes))
+        self.log.debug(logger.lazy("Reddit authorized scopes: {}", praw_scopes))
         try:
             if self.reddit.user.me() is None:
                 raise ValueError(
@@ -2664,10 +2645,8 @@ class Bot(object):
 
     def sleep(self, t):
         # t = total number of seconds to sleep before returning
-        i = 0
-        while redball.SIGNAL is None and not self.bot.STOP and i < t:
-            i += 1
-            time.sleep(1)
+        # Returns early if the bot is stopped or redball is shutting down
+        self.bot.sleep(t)
 
     def convert_timezone(self, dt, convert_to="America/New_York"):
         # dt = datetime object to convert, convert_to = timezone to convert to (e.g. 'America/New_York', or 'local' for local bot timezone)
@@ -3024,5 +3003,5 @@ class Bot(object):
             }
             self.error_notification("Error retrieving bot state")
 
-        self.log.debug("Bot Status: {}".format(botStatus))  # debug
+        self.log.debug(logger.lazy("Bot Status: {}", botStatus))  # debug
         self.bot.detailedState = botStatus
@@ -15,12 +15,11 @@ import re
 import requests
 import sys
 import threading
-import time
 import traceback
 import tzlocal
 
 import redball
-from redball import logger
+from redball import apicache, logger
 
 import statsapi
 from ..nba_game_threads import pynbaapi
@@ -29,6 +28,9 @@ from ..nfl_game_threads import mynflapi
 
 __version__ = "1.3.1"
 
+# Share StatsAPI responses with other bots through the process-wide cache
+statsapi = apicache.CachedClient(statsapi, "statsapi")
+
 
 def run(bot, settings):
     sidebar_updater_bot = SidebarUpdaterBot(bot, settings)
@@ -347,10 +349,8 @@ class SidebarUpdaterBot:
 
     def sleep(self, t):
         # t = total number of seconds to sleep before returning
-        i = 0
-        while redball.SIGNAL is None and not self.bot.STOP and i < t:
-            i += 1
-            time.sleep(1)
+        # Returns early if the bot is stopped or redball is shutting down
+        self.bot.sleep(t)
 
     def update_new_reddit_standings(
         self, my_team, standings, team_subs, all_teams, current_week=None
@@ -90,7 +90,23 @@ logSettings = {
     "CONSOLE_LOG_LEVEL": "DEBUG" if args.verbose else "INFO",
     "LOG_RETENTION": 7,
     "FILE_LOG_LEVEL": "DEBUG",
+    "LOG_QUEUE": True,
+    "LOG_QUEUE_SIZE": 10000,
+    "LOG_QUEUE_OVERFLOW": "drop_debug",
+    "LOG_FORMAT": "text",
+    "LOG_RATE_LIMIT": 0,
+    "LOG_RATE_INTERVAL": 60,
 }
+logger.set_queue_options(
+    logSettings["LOG_QUEUE"],
+    logSettings["LOG_QUEUE_SIZE"],
+    logSettings["LOG_QUEUE_OVERFLOW"],
+)
+logger.set_format_options(
+    logSettings["LOG_FORMAT"],
+    logSettings["LOG_RATE_LIMIT"],
+    logSettings["LOG_RATE_INTERVAL"],
+)
 log = logger.init_logger(
     logger_name="",
     log_to_console=logSettings["LOG_TO_CONSOLE"],
@@ -106,13 +122,16 @@ log = logger.init_logger(
 WEB_THREAD = None
 OVERWATCH_THREAD = None
 SCHEDULER = None
-DB_LOCK = threading.Lock()
 HTTPS_SERVER = None
-LOGGED_IN_USERS = {}
 SIGNAL = None
 DEV = False
 BOTS = {}
 REDDIT_AUTH_LOCKS = {}
+SHUTDOWN = threading.Event()  # Set when redball is shutting down
+SUPERVISOR = threading.Condition()  # Notified when overwatch has something to do
+SUPERVISOR_PENDING = False
+OVERWATCH_MAX_WAIT = 300  # Seconds between overwatch checks with no events
+SHUTDOWN_TIMEOUT = 5  # Seconds to wait for bots to exit during shutdown
 
 
 def startup(suppress_bots=False, dev=False, data_path=None, log_path=None):
@@ -149,6 +168,16 @@ def startup(suppress_bots=False, dev=False, data_path=None, log_path=None):
         log.info(
             "Reinitializing logger with updated settings... {}".format(logSettings)
         )
+        logger.set_queue_options(
+            logSettings["LOG_QUEUE"],
+            logSettings["LOG_QUEUE_SIZE"],
+            logSettings["LOG_QUEUE_OVERFLOW"],
+        )
+        logger.set_format_options(
+            logSettings["LOG_FORMAT"],
+            logSettings["LOG_RATE_LIMIT"],
+            logSettings["LOG_RATE_INTERVAL"],
+        )
         log = logger.init_logger(
             logger_name="",
             log_to_console=logSettings["LOG_TO_CONSOLE"],
@@ -215,6 +244,18 @@ def startup(suppress_bots=False, dev=False, data_path=None, log_path=None):
     # Start bot threads
     if suppress_bots:
         log.info("Suppressing bot auto-run per command line argument.")
+    else:
+        # Import bot modules in parallel; bots wait for their module to finish
+        botTypes = config.get_botTypes()
+        botTypes = {
+            str(x["id"]): x["moduleName"]
+            for x in (botTypes if isinstance(botTypes, list) else [botTypes])
+        }
+        bot.preload_bot_modules(
+            botTypes[str(b.botType)]
+            for b in BOTS.values()
+            if botTypes.get(str(b.botType))
+        )
 
     for b in BOTS.values():
         if b.autoRun == "True":
@@ -229,39 +270,58 @@ def startup(suppress_bots=False, dev=False, data_path=None, log_path=None):
     return True
 
 
+def notify_supervisor():
+    # Wake overwatch, e.g. when a bot exits or its settings change
+    global SUPERVISOR_PENDING
+    with SUPERVISOR:
+        SUPERVISOR_PENDING = True
+        SUPERVISOR.notify_all()
+
+
 def overwatch():
-    global SIGNAL
-    while True:
-        if SIGNAL is None:
-            # Start any autoRun=True bots that are not running
-            # Leave the bot stopped if it was manually stopped or suppressed
-            for b in BOTS.values():
-                if b.autoRun == "True" and not b.isRunning() and not b.STOP:
+    global SUPERVISOR_PENDING
+    while not SHUTDOWN.is_set():
+        # Start any autoRun=True bots that are not running
+        # Leave the bot stopped if it was manually stopped or suppressed
+        # Bots that keep exiting are restarted with increasing delay
+        nextRestart = None
+        for b in list(BOTS.values()):
+            if b.autoRun == "True" and not b.isRunning() and not b.STOP:
+                restartTime = b.restart_time()
+                if restartTime <= time.time():
                     log.info(
                         "Bot {} (id={}) is not running but autoRun is enabled. Starting the bot...".format(
                             b.name, b.id
                         )
                     )
                     b.start()
+                elif not nextRestart or restartTime < nextRestart:
+                    nextRestart = restartTime
 
-            time.sleep(5)
-        else:
-            log.debug("Overwatch exiting...")
-            break
+        wait = OVERWATCH_MAX_WAIT
+        if nextRestart:
+            wait = max(0, min(wait, nextRestart - time.time()))
+
+        with SUPERVISOR:
+            SUPERVISOR.wait_for(lambda: SUPERVISOR_PENDING or SHUTDOWN.is_set(), wait)
+            SUPERVISOR_PENDING = False
+
+    log.debug("Overwatch exiting...")
 
 
 def stay_alive():
     global SIGNAL
-    i = 0
+    # Lock waits can't be interrupted by Ctrl+C on Windows
+    wait = 1 if sys.platform == "win32" else 600
+    lastLog = time.time()
     while True:
         if SIGNAL is None:
             try:
-                i = i + 1
-                if i == 600:
+                if SHUTDOWN.wait(wait):
+                    SIGNAL = SIGNAL if SIGNAL else "shutdown"
+                elif time.time() - lastLog >= 600:
                     log.debug("Still alive...")
-                    i = 0
-
-                time.sleep(1)
+                    lastLog = time.time()
             except (KeyboardInterrupt, SystemExit):
                 SIGNAL = "shutdown"
         else:
@@ -278,9 +338,18 @@ def signal_handler(signal=None, frame=None):
 
 def shutdown(s):
     log.info("Shutting down (signal: {})...".format(s))
-    for b in BOTS.values():
-        if b.isRunning():
-            b.stop()
+    SHUTDOWN.set()
+    notify_supervisor()
+    bots = [b for b in BOTS.values() if b.isRunning()]
+    for b in bots:
+        b.stop()
+
+    # Bots wake immediately when stopped, so give them a moment to exit cleanly
+    deadline = time.time() + SHUTDOWN_TIMEOUT
+    for b in bots:
+        if b.thread is not threading.current_thread():
+            b.thread.join(max(0, deadline - time.time()))
 
     cherrypy.engine.exit()
+    database.close_connections(allThreads=True)
     sys.exit(0)
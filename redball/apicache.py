@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# Process-wide cache of data API responses, shared by all bots, so bots
+# requesting the same schedule, standings or game feed make one request.
+# Concurrent requests for the same data wait for the one already in flight.
+
+import functools
+import json
+import pickle
+import threading
+import time
+
+from redball import logger, metrics
+
+log = logger.get_logger(
+    logger_name="redball.apicache", log_level="DEBUG", propagate=True
+)
+
+CACHE_LOCK = threading.Lock()
+CACHE = {}  # key: {"expires": timestamp, "data": pickled response}
+INFLIGHT = {}  # key: Flight
+MAX_ENTRIES = 1000
+MAX_BYTES = 67108864  # Total size of cached responses, live game feeds are large
+FLIGHT_TIMEOUT = 60  # Seconds to wait for another thread's request before making our own
+DEFAULT_TTL = 10  # Seconds, for endpoints not listed below
+# Seconds to cache each endpoint (or client function), 0 to not cache
+ENDPOINT_TTLS = {
+    # Live game data
+    "game": 5,
+    "game_diff": 5,
+    "game_timestamps": 2,  # Polled by feed watchers
+    "game_contextMetrics": 5,
+    "game_winProbability": 5,
+    "game_playByPlay": 5,
+    "game_linescore": 5,
+    "game_boxscore": 5,
+    "schedule": 30,
+    # Changes a few times a day
+    "standings": 300,
+    "standings_data": 300,
+    "player_stats": 300,
+    "next_game": 300,
+    "last_game": 300,
+    # Reference data
+    "seasons": 3600,
+    "teams": 3600,
+    "team": 3600,
+    "people": 3600,
+    "lookup_team": 3600,
+    "lookup_player": 3600,
+}
+CACHE_STATS = {"bytes": 0}
+
+REQUESTS = metrics.counter(
+    "redball_api_cache_requests_total",
+    "Data API requests by cache result: hit, miss (fetched) or coalesced (shared an in-flight fetch)",
+    ("api", "endpoint", "result"),
+)
+metrics.gauge(
+    "redball_api_cache_entries", "Cached data API responses", fn=lambda: len(CACHE)
+)
+metrics.gauge(
+    "redball_api_cache_bytes",
+    "Size of cached data API responses",
+    fn=lambda: CACHE_STATS["bytes"],
+)
+
+
+class Flight(object):
+    # A request in progress, which other threads wait on instead of repeating it
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None  # Pickled response, if it could be cached
+        self.error = None
+
+
+def get_ttl(endpoint):
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def cache_key(api, endpoint, params):
+    try:
+        return json.dumps([api, endpoint, params], sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+
+
+def get(api, endpoint, params, fetch, ttl=None):
+    # Return the response for endpoint and params from the cache,
+    # or by calling fetch() and caching the result for ttl seconds
+    # (default: from ENDPOINT_TTLS). Each caller, including the one that
+    # fetched it, gets its own copy, unpickled so types (e.g. int keys) are kept.
+    # Exceptions raised by fetch() are raised to all waiting callers,
+    # and nothing is cached.
+    ttl = get_ttl(endpoint) if ttl is None else ttl
+    key = cache_key(api, endpoint, params) if ttl > 0 else None
+    if key is None:
+        return fetch()
+
+    labels = {"api": api, "endpoint": endpoint}
+    with CACHE_LOCK:
+        c = CACHE.get(key)
+        if c and c["expires"] > time.time():
+            data = c["data"]
+            flight = None
+        else:
+            data = None
+            flight = INFLIGHT.get(key)
+            leader = flight is None
+            if leader:
+                flight = INFLIGHT[key] = Flight()
+
+    if data is not None:
+        REQUESTS.inc(result="hit", **labels)
+        return pickle.loads(data)
+
+    if not leader:
+        flight.done.wait(FLIGHT_TIMEOUT)
+        if flight.error or flight.data is not None:
+            REQUESTS.inc(result="coalesced", **labels)
+            if flight.error:
+                raise flight.error
+
+            return pickle.loads(flight.data)
+
+        # The response couldn't be shared, or is taking too long
+        REQUESTS.inc(result="miss", **labels)
+        return fetch()
+
+    REQUESTS.inc(result="miss", **labels)
+    try:
+        value = fetch()
+        try:
+            flight.data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            log.debug("Not caching {} {} response.".format(api, endpoint))
+            return value
+
+        return pickle.loads(flight.data)
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with CACHE_LOCK:
+            INFLIGHT.pop(key, None)
+            if flight.data is not None:
+                store(key, flight.data, ttl)
+
+        flight.done.set()
+
+
+def store(key, data, ttl):
+    # Add a response to the cache, evicting expired then oldest entries
+    # to stay within MAX_ENTRIES and MAX_BYTES. Call with CACHE_LOCK held.
+    now = time.time()
+    old = CACHE.pop(key, None)
+    if old:
+        CACHE_STATS["bytes"] -= len(old["data"])
+
+    for k in [k for k, v in CACHE.items() if v["expires"] <= now]:
+        CACHE_STATS["bytes"] -= len(CACHE.pop(k)["data"])
+
+    while len(CACHE) and (
+        len(CACHE) >= MAX_ENTRIES or CACHE_STATS["bytes"] + len(data) > MAX_BYTES
+    ):
+        CACHE_STATS["bytes"] -= len(CACHE.pop(next(iter(CACHE)))["data"])
+
+    if len(data) <= MAX_BYTES:
+        CACHE[key] = {"expires": now + ttl, "data": data}
+        CACHE_STATS["bytes"] += len(data)
+
+
+def clear_cache():
+    with CACHE_LOCK:
+        CACHE.clear()
+        CACHE_STATS["bytes"] = 0
+
+
+def cache_stats():
+    with CACHE_LOCK:
+        stats = {
+            "entries": len(CACHE),
+            "bytes": CACHE_STATS["bytes"],
+            "in_flight": len(INFLIGHT),
+        }
+
+    return stats
+
+
+class CachedClient(object):
+    # Wraps a data API client module so calls are served from the shared cache:
+    # get(endpoint, params) is cached by endpoint, other functions by name
+
+    def __init__(self, client, api):
+        self._client = client
+        self._api = api
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        if name == "get":
+
+            @functools.wraps(attr)
+            def call(endpoint, params={}, *args, **kwargs):
+                return get(
+                    self._api,
+                    endpoint,
+                    params,
+                    lambda: attr(endpoint, params, *args, **kwargs),
+                )
+
+        else:
+
+            @functools.wraps(attr)
+            def call(*args, **kwargs):
+                return get(
+                    self._api,
+                    name,
+                    {"args": args, "kwargs": kwargs},
+                    lambda: attr(*args, **kwargs),
+                )
+
+        return call
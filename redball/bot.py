@@ -4,17 +4,57 @@ import importlib
 import json
 import os
 import threading
+import time
 
 import redball
-from redball import config, database, logger, user
+from redball import config, database, logger, metrics, user
 
 log = logger.get_logger(logger_name="redball.bots", log_level="DEBUG", propagate=True)
 
+RESTART_DELAY = 5  # Seconds to wait before restarting a bot that exited
+RESTART_DELAY_MAX = 300  # Delay doubles each time the bot exits quickly, up to this
+RESTART_RESET = 600  # Seconds a bot must run before the delay is reset
+
+BOT_MODULES_LOCK = threading.Lock()
+BOT_MODULES = {}  # moduleName: {"module", "lock", "source", "importTime", "error"}
+
+BOT_EVENTS = threading.Condition()  # Notified when a bot's status or state changes
+BOT_EVENTS_VERSION = 0
+STATE_EPOCH = "{:x}".format(int(time.time()))  # Keeps ETags unique across restarts
+STATE_CACHE_SIZE = 8  # Serialized forms kept per bot for the current state
+
+BOT_STARTS = metrics.counter("redball_bot_starts_total", "Bot starts", ("bot",))
+BOT_EXITS = metrics.counter(
+    "redball_bot_exits_total",
+    "Bot exits; quick exits are within RESTART_RESET seconds of starting",
+    ("bot", "quick"),
+)
+BOT_RUNNING = metrics.gauge(
+    "redball_bot_running",
+    "1 if the bot is running, otherwise 0",
+    ("bot",),
+    fn=lambda: [
+        ({"bot": k}, 1 if b.isRunning() else 0) for k, b in list(redball.BOTS.items())
+    ],
+)
+
 
 class Bot(object):
     def __init__(self, botId=None, botInfo=None, create=False):
+        self.stopEvent = threading.Event()
         self.STOP = False
-        self.detailedState = {"summary": {"text": "", "html": "", "markdown": ""}}
+        self.startTime = None
+        self.exitTime = None
+        self.exited = False  # Set when run() is done, before the thread ends
+        self.quickExits = 0  # Consecutive runs shorter than RESTART_RESET
+        self.stateLock = threading.Lock()
+        self.stateVersion = 0  # Incremented when detailedState is replaced
+        self.summaryVersion = 0  # Incremented when detailedState["summary"] changes
+        self.infoVersion = 0  # Incremented when the bot's info is refreshed
+        self.stateCache = {}  # Serialized forms of the current detailedState
+        self.summaryBlocks = {}  # key: (inputs, block) for summary_block()
+        self.summaryBlocksUsed = set()
+        self._detailedState = {"summary": {"text": "", "html": "", "markdown": ""}}
         if botInfo:
             if create:
                 self.id = self.create_bot(
@@ -46,6 +86,8 @@ class Bot(object):
     def __del__(self):
         if redball.BOTS and redball.BOTS.get(str(self.id)):
             redball.BOTS.pop(str(self.id))
+            user.clear_privilege_index()
+            notify_bot_event()
         self.thread = None
 
     def start(self):
@@ -53,27 +95,9 @@ class Bot(object):
             log.info("Bot {} (id={}) already running.".format(self.name, self.id))
         else:
             botType = config.get_botTypes(self.botType)
-            try:
-                log.debug(
-                    "Attempting to import bot module: {}...".format(
-                        botType["moduleName"]
-                    )
-                )
-                self.botMod = importlib.import_module(
-                    "bots.{}".format(botType["moduleName"]), "redball"
-                )
-            except ImportError as e:
-                log.debug(
-                    "Failed to import from bots directory, trying global import... (Error: {})".format(
-                        e
-                    )
-                )
-                try:
-                    self.botMod = importlib.import_module(botType["moduleName"])
-                    log.debug("Successfully imported bot module.")
-                except Exception as e:
-                    log.error("Error importing global bot module: {}".format(e))
-                    return False
+            self.botMod = get_bot_module(botType["moduleName"])
+            if not self.botMod:
+                return False
 
             log.info("Starting bot {} (id={}).".format(self.name, self.id))
             botArgs = self.get_config()
@@ -81,20 +105,143 @@ class Bot(object):
                 self.redditAuth
             )
             self.thread = threading.Thread(
-                target=self.botMod.run,
-                args=(self, botArgs),
+                target=self.run,
+                args=(botArgs,),
                 name="bot-{}-{}".format(self.id, self.name.replace(" ", "-")),
                 daemon=True,
             )
             self.STOP = False
+            self.exited = False
+            self.startTime = time.time()
             self.thread.start()
+            BOT_STARTS.inc(bot=self.id)
+            notify_bot_event()
 
         return True
 
+    def run(self, botArgs):
+        try:
+            self.botMod.run(self, botArgs)
+        finally:
+            # Release database connections held by the bot and its worker threads
+            database.close_connections(logg=log)
+            database.prune_connections(logg=log)
+            self.exitTime = time.time()
+            quick = self.exitTime - self.startTime < RESTART_RESET
+            if quick:
+                self.quickExits += 1
+            else:
+                self.quickExits = 1
+
+            BOT_EXITS.inc(bot=self.id, quick=str(quick).lower())
+
+            # The thread is still alive until the notifications are sent,
+            # so mark the bot stopped for overwatch first
+            self.exited = True
+
+            # Let overwatch and status listeners know the bot exited
+            redball.notify_supervisor()
+            notify_bot_event()
+
+    @property
+    def detailedState(self):
+        return self._detailedState
+
+    @detailedState.setter
+    def detailedState(self, value):
+        # Bots replace detailedState from bot_state(); wake status listeners
+        with self.stateLock:
+            oldSummary = (self._detailedState or {}).get("summary")
+            self._detailedState = value
+            self.stateVersion += 1
+            if (value or {}).get("summary") != oldSummary:
+                self.summaryVersion += 1
+
+            self.stateCache = {}
+            # Drop summary blocks that weren't used to build this state
+            self.summaryBlocks = {
+                k: v
+                for k, v in self.summaryBlocks.items()
+                if k in self.summaryBlocksUsed
+            }
+            self.summaryBlocksUsed = set()
+
+        notify_bot_event()
+
+    def state_json(self, key, build):
+        # Return build() serialized to JSON, cached until detailedState changes
+        # key must identify everything else build() depends on
+        with self.stateLock:
+            version = self.stateVersion
+            cached = self.stateCache.get(key)
+
+        if cached is not None:
+            return cached
+
+        cached = json.dumps(build())
+        with self.stateLock:
+            if self.stateVersion == version:
+                if len(self.stateCache) >= STATE_CACHE_SIZE:
+                    self.stateCache = {}
+
+                self.stateCache[key] = cached
+
+        return cached
+
+    def state_etag(self, *args):
+        # ETag for the current detailedState, plus anything else in args
+        return '"{}"'.format(
+            "-".join(str(x) for x in (STATE_EPOCH, self.id, self.stateVersion) + args)
+        )
+
+    def summary_block(self, key, inputs, build):
+        # Used by bot_state() to rebuild a summary block only when its inputs
+        # change; inputs must be comparable with ==
+        # return the cached block for key, or the result of build()
+        cached = self.summaryBlocks.get(key)
+        self.summaryBlocksUsed.add(key)
+        if cached and cached[0] == inputs:
+            return cached[1]
+
+        block = build()
+        self.summaryBlocks[key] = (inputs, block)
+        return block
+
+    @property
+    def STOP(self):
+        return self.stopEvent.is_set()
+
+    @STOP.setter
+    def STOP(self, value):
+        # Setting STOP = True wakes the bot if it is in sleep()
+        if value:
+            self.stopEvent.set()
+        else:
+            self.stopEvent.clear()
+
+    def sleep(self, t):
+        # t = number of seconds to sleep, returning early if the bot is stopped
+        # or redball is shutting down
+        # return True if the bot should stop
+        if redball.SIGNAL is not None:
+            return True
+
+        return self.stopEvent.wait(t)
+
+    def restart_time(self):
+        # Timestamp when overwatch may restart the bot after it exited
+        if not self.exitTime or not self.quickExits:
+            return 0
+
+        return self.exitTime + min(
+            RESTART_DELAY * 2 ** (self.quickExits - 1), RESTART_DELAY_MAX
+        )
+
     def stop(self):
         if self.isRunning():
             log.info("Stopping bot {} (id={}).".format(self.name, self.id))
             self.STOP = True
+            notify_bot_event()
             return True
         else:
             log.info(
@@ -110,7 +257,11 @@ class Bot(object):
         except AttributeError:
             self.thread = None
 
-        if isinstance(self.thread, threading.Thread) and self.thread.is_alive():
+        if (
+            isinstance(self.thread, threading.Thread)
+            and self.thread.is_alive()
+            and not self.exited
+        ):
             return True
         else:
             return False
@@ -127,6 +278,10 @@ class Bot(object):
         self.botType = botInfo["botType"]
         self.autoRun = botInfo["autoRun"]
         self.redditAuth = botInfo["redditAuth"]
+        self.infoVersion += 1
+
+        # autoRun may have changed
+        redball.notify_supervisor()
 
         return True
 
@@ -164,9 +319,6 @@ class Bot(object):
         return result
 
     def delete_bot(self):
-        con = database.get_con()
-        cur = database.get_cur(con)
-
         queries = [
             ("DELETE FROM rb_bots WHERE id=?;", (self.id,)),
             ("DELETE FROM rb_botConfig WHERE botId=?;", (self.id,)),
@@ -180,16 +332,13 @@ class Bot(object):
             "select name from sqlite_master where type='table' and name like 'rb_bot_{}_%';".format(
                 self.id
             ),
-            con=con,
-            cur=cur,
-            commit=False,
-            closeAfter=False,
         )
         if isinstance(botConfigTables, dict):
             for v in botConfigTables.values():
                 queries.append(("DROP TABLE {};", (v,)))
 
         result = database.db_qry(queries, commit=True, closeAfter=True)
+        config.clear_config_cache(botId=self.id)
         if isinstance(result, list):
             user.remove_privilege("rb_bot_{}_ro".format(self.id))
             user.remove_privilege("rb_bot_{}_startstop".format(self.id))
@@ -280,6 +429,7 @@ class Bot(object):
 
             con.commit()
             con.close()
+            config.clear_config_cache(botId=insert_id)
 
             return insert_id
 
@@ -305,6 +455,125 @@ class Bot(object):
         return cfg
 
 
+def notify_bot_event():
+    # Wake anything waiting in wait_bot_event(), e.g. web status streams
+    global BOT_EVENTS_VERSION
+    with BOT_EVENTS:
+        BOT_EVENTS_VERSION += 1
+        BOT_EVENTS.notify_all()
+
+
+def wait_bot_event(version, timeout):
+    # Block until a bot event newer than version, shutdown, or timeout
+    # return the current event version
+    with BOT_EVENTS:
+        BOT_EVENTS.wait_for(
+            lambda: BOT_EVENTS_VERSION != version or redball.SHUTDOWN.is_set(),
+            timeout,
+        )
+        return BOT_EVENTS_VERSION
+
+
+def get_bot_module(moduleName):
+    # Return the imported bot module, importing it the first time it is needed
+    # Returns None if the module could not be imported
+    with BOT_MODULES_LOCK:
+        if not BOT_MODULES.get(moduleName):
+            BOT_MODULES.update(
+                {
+                    moduleName: {
+                        "module": None,
+                        "lock": threading.Lock(),
+                        "source": None,
+                        "importTime": None,
+                        "error": None,
+                    }
+                }
+            )
+
+        m = BOT_MODULES[moduleName]
+
+    with m["lock"]:
+        # Another thread may have imported the module while we waited
+        if not m["module"]:
+            import_bot_module(moduleName, m)
+
+    return m["module"]
+
+
+def import_bot_module(moduleName, m):
+    start = time.time()
+    try:
+        log.debug("Attempting to import bot module: {}...".format(moduleName))
+        m.update(
+            {
+                "module": importlib.import_module(
+                    "bots.{}".format(moduleName), "redball"
+                ),
+                "source": "bots",
+            }
+        )
+    except ImportError as e:
+        log.debug(
+            "Failed to import from bots directory, trying global import... (Error: {})".format(
+                e
+            )
+        )
+        try:
+            m.update({"module": importlib.import_module(moduleName), "source": "global"})
+            log.debug("Successfully imported bot module.")
+        except Exception as e:
+            log.error("Error importing global bot module: {}".format(e))
+            m.update({"error": str(e)})
+    except Exception as e:
+        log.error("Error importing bot module: {}".format(e))
+        m.update({"error": str(e)})
+
+    m.update({"importTime": time.time() - start})
+    if m["module"]:
+        m.update({"error": None})
+        log.info(
+            "Imported bot module {} in {:.2f} seconds.".format(
+                moduleName, m["importTime"]
+            )
+        )
+
+
+def preload_bot_modules(moduleNames):
+    # Import bot modules in parallel, so the first start of each bot is fast
+    threads = [
+        threading.Thread(
+            target=get_bot_module,
+            args=(x,),
+            name="rb-preload-{}".format(x),
+            daemon=True,
+        )
+        for x in set(moduleNames)
+    ]
+    for t in threads:
+        t.start()
+
+    return threads
+
+
+def get_bot_module_info(moduleName=None):
+    # Return import details for the module (or dict of all modules):
+    # {"loaded", "source", "importTime", "error"}, or None if not imported yet
+    with BOT_MODULES_LOCK:
+        info = {
+            k: {
+                "loaded": v["module"] is not None,
+                "source": v["source"],
+                "importTime": v["importTime"],
+                "error": v["error"],
+            }
+            for k, v in BOT_MODULES.items()
+            if not moduleName or k == moduleName
+        }
+
+    return info.get(moduleName) if moduleName else info
+
+
 def get_bots(botId=None):
     query = "SELECT * FROM rb_bots WHERE 1=1"
     local_args = tuple()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import copy
 import json
 import praw
 from praw.util.token_manager import BaseTokenManager
@@ -12,50 +13,138 @@ from redball import database, logger
 log = logger.get_logger(logger_name="redball.config", log_level="DEBUG", propagate=True)
 
 
-def get_sys_config(category=None, key=None, includeChildren=False):
-    query = "SELECT * FROM rb_config WHERE 1=1"
-    local_args = tuple()
-    if category and key:
-        query += " AND (category=? AND key=?)"
-        local_args += (category, key)
-    elif category:
-        query += " AND category=?"
-        local_args += (category,)
-    elif key:
-        query += " AND key=?"
-        local_args += (key,)
+CACHE_LOCK = Lock()
+SYS_CONFIG_CACHE = {"gen": 0, "rows": None, "index": {}}
+BOT_CONFIG_CACHE = {}  # str(botId): {"gen": int, "rows": list, "index": dict}
+CACHE_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
 
-    if includeChildren and key:
-        query += " OR parent_key=?"
-        local_args += (key,)
 
-    query += " ORDER BY category ASC;"
+def get_cache(botId=None):
+    # Call with CACHE_LOCK held
+    if botId is None:
+        return SYS_CONFIG_CACHE
 
-    if len(local_args):
-        config = database.db_qry((query, local_args))
+    return BOT_CONFIG_CACHE.setdefault(
+        str(botId), {"gen": 0, "rows": None, "index": {}}
+    )
+
+
+def get_cached_rows(botId=None, category=None, key=None):
+    # Return all deserialized rb_config rows, or rb_botConfig rows for botId,
+    # from the cache if available, otherwise from the database.
+    # If category and key are provided, return only the matching row (in a list).
+    # Returned rows must be copied before being handed to callers.
+    with CACHE_LOCK:
+        cache = get_cache(botId)
+        if cache["rows"] is not None:
+            CACHE_STATS["hits"] += 1
+            if category and key:
+                row = cache["index"].get((category, key))
+                return [row] if row else []
+
+            return cache["rows"]
+
+        CACHE_STATS["misses"] += 1
+        gen = cache["gen"]
+
+    if botId is None:
+        rows = database.db_qry("SELECT * FROM rb_config ORDER BY category ASC;")
     else:
-        config = database.db_qry(query)
+        rows = database.db_qry(
+            (
+                "SELECT * FROM rb_botConfig WHERE botId=? ORDER BY category ASC;",
+                (botId,),
+            )
+        )
+
+    if not isinstance(rows, list):
+        # Query error, don't cache it
+        return rows
 
     # Deserialize val, options, and subkeys
-    if isinstance(config, list):
-        for c in config:
-            c.update(
+    for c in rows:
+        c.update(
+            {
+                "val": deserialize_key(c["val"], c["type"]),
+                "options": deserialize_key(c["options"]),
+                "subkeys": deserialize_key(c["subkeys"]),
+            }
+        )
+
+    with CACHE_LOCK:
+        # Don't cache if the config was updated while the query was running
+        if cache["gen"] == gen:
+            cache.update(
                 {
-                    "val": deserialize_key(c["val"], c["type"]),
-                    "options": deserialize_key(c["options"]),
-                    "subkeys": deserialize_key(c["subkeys"]),
+                    "rows": rows,
+                    "index": {(c["category"], c["key"]): c for c in rows},
                 }
             )
-    elif isinstance(config, dict):
-        config.update(
+
+    if category and key:
+        return [c for c in rows if c["category"] == category and c["key"] == key]
+
+    return rows
+
+
+def clear_config_cache(botId=None, sysConfig=False):
+    # botId = clear cached config for the given bot
+    # sysConfig = True to clear cached system config
+    # clear everything if neither is provided
+    with CACHE_LOCK:
+        CACHE_STATS["invalidations"] += 1
+        caches = []
+        if sysConfig or botId is None:
+            caches.append(SYS_CONFIG_CACHE)
+
+        if botId is not None:
+            caches.append(get_cache(botId))
+        elif not sysConfig:
+            caches.extend(BOT_CONFIG_CACHE.values())
+
+        for c in caches:
+            c.update({"gen": c["gen"] + 1, "rows": None, "index": {}})
+
+
+def get_cache_gen(botId=None):
+    # Generation of the cached config, incremented each time it is cleared
+    with CACHE_LOCK:
+        return get_cache(botId)["gen"]
+
+
+def cache_stats():
+    with CACHE_LOCK:
+        stats = dict(CACHE_STATS)
+        stats.update(
             {
-                "val": deserialize_key(config["val"], config["type"]),
-                "options": deserialize_key(config["options"]),
-                "subkeys": deserialize_key(config["subkeys"]),
+                "sys_config_cached": SYS_CONFIG_CACHE["rows"] is not None,
+                "bot_configs_cached": sum(
+                    1 for x in BOT_CONFIG_CACHE.values() if x["rows"] is not None
+                ),
             }
         )
 
-    return config
+    return stats
+
+
+def get_sys_config(category=None, key=None, includeChildren=False):
+    if includeChildren:
+        config = get_cached_rows()
+    else:
+        config = get_cached_rows(category=category, key=key)
+
+    if not isinstance(config, list):
+        return config
+
+    return [
+        copy.deepcopy(c)
+        for c in config
+        if (
+            (not category or c["category"] == category)
+            and (not key or c["key"] == key)
+        )
+        or (includeChildren and key and c["parent_key"] == key)
+    ]
 
 
 def serialize_key(key):
@@ -79,8 +168,7 @@ def deserialize_key(key, dataType=None):
 
 def update_config(data):
     if isinstance(data, list):
-        con = database.get_con()
-        cur = database.get_cur(con)
+        local_args = []
         for item in data:
             if item.get("type") == "bool":
                 item["val"] = (
@@ -91,15 +179,14 @@ def update_config(data):
             elif item.get("type") == "int":
                 item["val"] = int(item["val"])
 
-            query = (
-                "UPDATE rb_config SET val = ? WHERE category = ? and key = ?;",
-                (serialize_key(item["val"]), item["category"], item["key"]),
+            local_args.append(
+                (serialize_key(item["val"]), item["category"], item["key"])
             )
-            log.debug(
-                "Result: {}".format(database.db_qry(query=query, con=con, cur=cur))
-            )
-        con.commit()
-        con.close()
+
+        database.db_qry_many(
+            "UPDATE rb_config SET val = ? WHERE category = ? and key = ?;",
+            local_args,
+        )
     else:
         if data.get("type") == "bool":
             data["val"] = (
@@ -118,6 +205,7 @@ def update_config(data):
         )
         database.db_qry(query, commit=True, closeAfter=True)
 
+    clear_config_cache(sysConfig=True)
     return True
 
 
@@ -130,32 +218,20 @@ def get_bot_config(
     excludeSysFields=False,
     sortByCategory=False,
 ):
-    query = "SELECT * FROM rb_botConfig WHERE botId=?"
-    local_args = (botId,)
-    if confId:
-        query += " AND id=?"
-        local_args += (confId,)
-
-    if category and key:
-        query += " AND (category=? AND key=?)"
-        local_args += (category, key)
-    elif category:
-        query += " AND category=?"
-        local_args += (category,)
-    elif key:
-        query += " AND key=?"
-        local_args += (key,)
-
-    if includeChildren and key:
-        query += " OR parent_key=?"
-        local_args += (key,)
-
-    query += " ORDER BY category ASC;"
-
-    if len(local_args):
-        config = database.db_qry((query, local_args))
-    else:
-        config = database.db_qry(query)
+    config = get_cached_rows(botId)
+    if not isinstance(config, list):
+        return config
+
+    config = [
+        copy.deepcopy(c)
+        for c in config
+        if (
+            (not confId or str(c["id"]) == str(confId))
+            and (not category or c["category"] == category)
+            and (not key or c["key"] == key)
+        )
+        or (includeChildren and key and c["parent_key"] == key)
+    ]
 
     if excludeSysFields:
         # Remove system fields
@@ -163,15 +239,6 @@ def get_bot_config(
             x.pop("read_only")
             x.pop("system")
 
-    for x in config:
-        x.update(
-            {
-                "val": deserialize_key(x["val"], x["type"]),
-                "subkeys": deserialize_key(x["subkeys"]),
-                "options": deserialize_key(x["options"]),
-            }
-        )
-
     sortedConfig = {}
     if sortByCategory:
         for cat in set(c["category"] for c in config):
@@ -194,8 +261,8 @@ def update_bot_config(botId, data):
         data = [data]
 
     if isinstance(data, list):
-        con = database.get_con()
-        cur = database.get_cur(con)
+        # Group items by query so each distinct query runs once for all of its items
+        queries = {}
         for item in data:
             if item.get("id"):
                 q = "UPDATE rb_botConfig SET"
@@ -207,7 +274,6 @@ def update_bot_config(botId, data):
                     local_args += (v,)
                 q += " WHERE botId=? and id=?;"
                 local_args += (botId, item["id"])
-                query = (q, local_args)
             else:
                 if item.get("type") == "bool":
                     item["val"] = (
@@ -218,13 +284,20 @@ def update_bot_config(botId, data):
                 elif item.get("type") == "int":
                     item["val"] = int(item["val"])
 
-                query = (
-                    "UPDATE rb_botConfig SET val = ? WHERE category = ? and key = ? and botId=?;",
-                    (serialize_key(item["val"]), item["category"], item["key"], botId),
+                q = "UPDATE rb_botConfig SET val = ? WHERE category = ? and key = ? and botId=?;"
+                local_args = (
+                    serialize_key(item["val"]),
+                    item["category"],
+                    item["key"],
+                    botId,
                 )
-            log.debug(
-                "Result: {}".format(database.db_qry(query=query, con=con, cur=cur))
-            )
+
+            queries.setdefault(q, []).append(local_args)
+
+        con = database.get_con()
+        cur = database.get_cur(con)
+        for q, local_args in queries.items():
+            database.db_qry_many(q, local_args, con=con, cur=cur, commit=False)
 
         con.commit()
         con.close()
@@ -234,7 +307,9 @@ def update_bot_config(botId, data):
             (serialize_key(data["val"]), data["category"], data["key"]),
         )
         database.db_qry(query, commit=True, closeAfter=True)
+        clear_config_cache(sysConfig=True)
 
+    clear_config_cache(botId=botId)
     return True
 
 
@@ -269,13 +344,11 @@ def add_bot_config(
 
     if isinstance(multi, dict):
         log.debug(f"Multiple [{len(multi)}] config categories provided.")
-        query = []
+        local_args = []
         for k, v in multi.items():
             log.debug(
-                f"Generating query for category [{k}] containing [{len(multi[k])}] items..."
+                f"Generating query args for category [{k}] containing [{len(multi[k])}] items..."
             )
-            local_args = tuple()
-            q2 = q
             for z in v:
                 if z.get("type") == "bool":
                     z["val"] = (
@@ -288,39 +361,43 @@ def add_bot_config(
                 elif z.get("type") == "int":
                     z["val"] = int(z["val"])
 
-                if len(local_args):
-                    q2 += ", "
-
-                q2 += "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-                local_args += (
-                    int(botId),
-                    k,
-                    z["key"],
-                    serialize_key(z["val"]),
-                    z.get("description", ""),
-                    z.get("type", "str"),
-                    serialize_key(z.get("options"))
-                    if z.get("options") not in ["", None]
-                    else "[]",
-                    serialize_key(z.get("subkeys"))
-                    if z.get("subkeys") not in ["", None]
-                    else "[]",
-                    z.get("parent_key", ""),
-                    "True"
-                    if k == "Logging"
-                    and z["key"]
-                    in [
-                        "LOG_TO_FILE",
-                        "FILE_LOG_LEVEL",
-                        "LOG_TO_CONSOLE",
-                        "CONSOLE_LOG_LEVEL",
-                        "PROPAGATE",
-                    ]
-                    else "False",
+                local_args.append(
+                    (
+                        int(botId),
+                        k,
+                        z["key"],
+                        serialize_key(z["val"]),
+                        z.get("description", ""),
+                        z.get("type", "str"),
+                        serialize_key(z.get("options"))
+                        if z.get("options") not in ["", None]
+                        else "[]",
+                        serialize_key(z.get("subkeys"))
+                        if z.get("subkeys") not in ["", None]
+                        else "[]",
+                        z.get("parent_key", ""),
+                        "True"
+                        if k == "Logging"
+                        and z["key"]
+                        in [
+                            "LOG_TO_FILE",
+                            "FILE_LOG_LEVEL",
+                            "LOG_TO_CONSOLE",
+                            "CONSOLE_LOG_LEVEL",
+                            "PROPAGATE",
+                        ]
+                        else "False",
+                    )
                 )
 
-            q2 += ";"
-            query.append((q2, local_args))
+        result = database.db_qry_many(
+            q + "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?);",
+            local_args,
+            con=con,
+            cur=cur,
+            commit=commit,
+            closeAfter=closeAfter,
+        )
     else:
         if dataType == "bool":
             val = val if isinstance(val, bool) else (val.lower() == "true")
@@ -354,12 +431,16 @@ def add_bot_config(
                 else "False",
             ),
         )
+        result = database.db_qry(
+            query, con=con, cur=cur, commit=commit, closeAfter=closeAfter
+        )
 
-    return database.db_qry(
-        query, con=con, cur=cur, commit=commit, closeAfter=closeAfter
-    )
+    if commit:
+        # Otherwise the caller clears the cache after committing, so another
+        # thread can't cache the old rows before the new ones are visible
+        clear_config_cache(botId=botId)
 
-    return None
+    return result
 
 
 def add_default_bot_config(botId, con=None, cur=None):
@@ -387,6 +468,7 @@ def add_default_bot_config(botId, con=None, cur=None):
             boolOptions,
         ),
     )
+    # Not committed here, so the caller clears the cache after committing
     sres = database.db_qry(sq, con=con, cur=cur)
     if isinstance(sres, str):
         return "Error inserting default config: {}".format(sres)
@@ -408,7 +490,9 @@ def delete_bot_config(botId, category=None, key=None, confId=None, all=False):
             (botId, category, key),
         )
 
-    return database.db_qry(query, commit=True, closeAfter=True)
+    result = database.db_qry(query, commit=True, closeAfter=True)
+    clear_config_cache(botId=botId)
+    return result
 
 
 def get_botTypes(id=None):
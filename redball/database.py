@@ -3,19 +3,91 @@
 from datetime import datetime
 import os
 import json
+import logging
 import sqlite3
+import threading
 import time
 import uuid
 
 import redball
-from redball import config, logger, upgrade
+from redball import config, logger, metrics, upgrade
 
 log = logger.get_logger(
     logger_name="redball.database", log_level="DEBUG", propagate=True
 )
 
+# Write-ahead logging lets readers run concurrently with a writer
+# and protects the database if the process dies in the middle of a write
+JOURNAL_MODE = "WAL"
+SYNCHRONOUS = "NORMAL"  # Durable enough with WAL, and avoids an fsync on every commit
+BUSY_TIMEOUT = 30  # Seconds to wait for another connection's write to complete
+STATEMENT_CACHE_SIZE = 512  # Compiled statements kept per connection, for all bots
 
-def get_con(logg=log, dbFile=None):
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection which is checked back into the pool instead of
+    being closed when close() is called
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dbFile = None
+        self.owner = threading.current_thread()
+        self.checkouts = 0
+        self.writeLock = None
+
+    def close(self):
+        release_con(self)
+
+    def commit(self):
+        try:
+            super().commit()
+        finally:
+            release_write_lock(self)
+
+    def rollback(self):
+        try:
+            super().rollback()
+        finally:
+            release_write_lock(self)
+
+    def close_connection(self):
+        # Actually close the underlying connection
+        super().close()
+
+
+POOL_LOCK = threading.Lock()
+POOL = {}  # id(con): PooledConnection, across all threads
+POOL_LOCAL = threading.local()  # dbFile: PooledConnection, for the current thread
+POOL_STATS = {"created": 0, "reused": 0, "closed": 0}
+WRITE_LOCKS_LOCK = threading.Lock()
+WRITE_LOCKS = {}  # dbFile: Lock, to serialize writers per database file
+
+QUERIES = metrics.counter(
+    "redball_db_queries_total",
+    "Database statements executed",
+    ("type", "result"),
+)
+QUERY_SECONDS = metrics.histogram(
+    "redball_db_query_seconds",
+    "Time spent executing database statements, including waiting for the write lock",
+    ("type",),
+)
+WRITE_LOCK_SECONDS = metrics.histogram(
+    "redball_db_write_lock_wait_seconds",
+    "Time spent waiting for a database file's write lock",
+)
+WRITE_LOCK_TIMEOUTS = metrics.counter(
+    "redball_db_write_lock_timeouts_total",
+    "Writes that proceeded without the write lock after waiting BUSY_TIMEOUT seconds",
+)
+
+
+def get_con(logg=log, dbFile=None, pooled=True):
+    # pooled = False to open a dedicated connection, which will be closed by close()
+    # Callers that check out the pooled connection while another caller on the
+    # same thread has a transaction open on it get a dedicated connection, so
+    # their commit/rollback can't apply to the other caller's work
     if not os.path.isdir(redball.DB_PATH):
         try:
             logg.info("The data directory does not exist. Attempting to create it...")
@@ -24,18 +96,190 @@ def get_con(logg=log, dbFile=None):
             logg.error("Error creating data directory: {}.".format(e))
             raise
 
+    dbFile = dbFile if dbFile else redball.DB_FILE
+    if pooled:
+        cons = getattr(POOL_LOCAL, "cons", None)
+        if cons is None:
+            cons = POOL_LOCAL.cons = {}
+
+        con = cons.get(dbFile)
+        if con and con.in_transaction:
+            logg.debug(
+                "Pooled connection has an open transaction. Opening a dedicated connection..."
+            )
+            pooled = False
+        elif con:
+            con.checkouts += 1
+            with POOL_LOCK:
+                POOL_STATS["reused"] += 1
+
+            return con
+
     try:
-        logg.debug(
-            "Connecting to database {}".format(dbFile if dbFile else redball.DB_FILE)
-        )
-        con = sqlite3.connect(dbFile if dbFile else redball.DB_FILE, timeout=30)
-        con.execute("PRAGMA journal_mode = off;")
+        logg.debug(logger.lazy("Connecting to database {}", dbFile))
+        if pooled:
+            # Pooled connections are only used by the thread that opened them,
+            # but they may be closed by another thread after the owner exits
+            con = sqlite3.connect(
+                dbFile,
+                timeout=BUSY_TIMEOUT,
+                factory=PooledConnection,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+        else:
+            con = sqlite3.connect(dbFile, timeout=BUSY_TIMEOUT)
+
+        con.execute("PRAGMA journal_mode = {};".format(JOURNAL_MODE))
+        con.execute("PRAGMA synchronous = {};".format(SYNCHRONOUS))
+        con.execute("PRAGMA busy_timeout = {};".format(BUSY_TIMEOUT * 1000))
         con.row_factory = dict_factory
-        return con
     except sqlite3.Error as e:
         logg.error("Error connecting to database: {}".format(e))
         raise
 
+    if pooled:
+        con.dbFile = dbFile
+        con.checkouts = 1
+        cons.update({dbFile: con})
+        with POOL_LOCK:
+            POOL.update({id(con): con})
+            POOL_STATS["created"] += 1
+
+        # Clean up after threads that exited without closing their connections
+        prune_connections(logg=logg)
+
+    return con
+
+
+def release_con(con, logg=log):
+    # Check a pooled connection back in. The connection stays open for reuse by
+    # the same thread, but uncommitted changes are rolled back, same as they
+    # would be when closing the connection. The connection is only shared while
+    # no transaction is open, so any open transaction belongs to this checkout.
+    if con.checkouts > 0:
+        con.checkouts -= 1
+
+    if con.in_transaction:
+        logg.debug("Rolling back uncommitted changes on released connection.")
+        con.rollback()
+    elif con.checkouts == 0:
+        release_write_lock(con)
+
+
+def get_write_lock(dbFile):
+    with WRITE_LOCKS_LOCK:
+        if not WRITE_LOCKS.get(dbFile):
+            WRITE_LOCKS.update({dbFile: threading.Lock()})
+
+        return WRITE_LOCKS[dbFile]
+
+
+def acquire_write_lock(con, logg=log):
+    # Writers to the same database file take turns, while readers never wait.
+    # The lock is held until the transaction is committed or rolled back.
+    # Dedicated (non-pooled) connections rely on sqlite's busy timeout instead.
+    if not isinstance(con, PooledConnection) or con.writeLock:
+        return
+
+    lock = get_write_lock(con.dbFile)
+    start = time.perf_counter()
+    acquired = lock.acquire(timeout=BUSY_TIMEOUT)
+    WRITE_LOCK_SECONDS.observe(time.perf_counter() - start)
+    if not acquired:
+        WRITE_LOCK_TIMEOUTS.inc()
+        # Leave it to sqlite to wait for (or time out on) the other writer
+        logg.warning(
+            "Timed out waiting for database write lock. Proceeding without it..."
+        )
+        return
+
+    con.writeLock = lock
+
+
+def release_write_lock(con):
+    if getattr(con, "writeLock", None):
+        lock = con.writeLock
+        con.writeLock = None
+        lock.release()
+
+
+def is_write(query):
+    # Everything other than a plain SELECT is treated as a write
+    return query.lstrip()[:6].upper() != "SELECT"
+
+
+def close_connections(logg=log, allThreads=False):
+    # Close pooled connections opened by the current thread,
+    # or by all threads if allThreads = True
+    thread = threading.current_thread()
+    with POOL_LOCK:
+        cons = [c for c in POOL.values() if allThreads or c.owner is thread]
+        for c in cons:
+            POOL.pop(id(c))
+
+    for c in cons:
+        _close_pooled_con(c, logg=logg)
+
+    POOL_LOCAL.cons = {}
+    if len(cons):
+        logg.debug(logger.lazy("Closed {} pooled database connection(s).", len(cons)))
+
+    return len(cons)
+
+
+def prune_connections(logg=log):
+    # Close pooled connections opened by threads that are no longer running
+    with POOL_LOCK:
+        cons = [c for c in POOL.values() if not c.owner.is_alive()]
+        for c in cons:
+            POOL.pop(id(c))
+
+    for c in cons:
+        _close_pooled_con(c, logg=logg)
+
+    if len(cons):
+        logg.debug(
+            logger.lazy(
+                "Closed {} pooled database connection(s) left by exited threads.",
+                len(cons),
+            )
+        )
+
+    return len(cons)
+
+
+def _close_pooled_con(con, logg=log):
+    # Don't leave other writers waiting on a thread that is gone
+    release_write_lock(con)
+    try:
+        con.close_connection()
+    except sqlite3.Error as e:
+        logg.error("Error closing database connection: {}".format(e))
+
+    with POOL_LOCK:
+        POOL_STATS["closed"] += 1
+
+
+def pool_stats():
+    # Return counts of open and checked out pooled connections
+    with POOL_LOCK:
+        stats = {
+            "open": len(POOL),
+            "checked_out": sum(1 for c in POOL.values() if c.checkouts > 0),
+            "threads": len(set(c.owner.ident for c in POOL.values())),
+        }
+        stats.update(POOL_STATS)
+
+    return stats
+
+
+metrics.gauge(
+    "redball_db_connections",
+    "Open pooled database connections",
+    fn=lambda: len(POOL),
+)
+
 
 def get_cur(con=None, logg=log):
     if not con:
@@ -54,7 +298,9 @@ def db_qry(
     query, con=None, cur=None, fetchone=False, commit=False, closeAfter=False, logg=log
 ):
     if not con:
+        # Nothing else can use this connection, so check it back in when done
         con = get_con(logg=logg)
+        closeAfter = True
 
     if not cur:
         cur = get_cur(con, logg=logg)
@@ -62,6 +308,13 @@ def db_qry(
     if isinstance(query, str) or isinstance(query, tuple):
         query = [query]
 
+    debug = logg.isEnabledFor(logging.DEBUG)
+    # Fetch plain tuples and build the dicts in one pass per query,
+    # instead of calling dict_factory (and walking the columns) for every row
+    rowFactory = cur.row_factory
+    if rowFactory is dict_factory:
+        cur.row_factory = None
+
     results = []
     for q in query:
         args = []
@@ -71,21 +324,48 @@ def db_qry(
             if isinstance(args, str):
                 args = (args,)
 
+        qType = "write" if is_write(q) else "read"
+        start = time.perf_counter()
+        result = "ok"
         try:
-            logg.debug("q: {}, args: {}".format(q, args))
-            with redball.DB_LOCK:
-                if len(args):
-                    r = cur.execute(q, args)
-                else:
-                    r = cur.execute(q)
-
-                if fetchone:
-                    results.append(r.fetchone())
-                else:
-                    results.append(r.fetchall())
+            if debug:
+                logg.debug(logger.lazy("q: {}, args: {}", q, args))
+
+            if qType == "write":
+                acquire_write_lock(con, logg=logg)
+
+            if len(args):
+                r = cur.execute(q, args)
+            else:
+                r = cur.execute(q)
+
+            if fetchone:
+                row = r.fetchone()
+                if rowFactory is dict_factory and row is not None:
+                    row = dict(zip(column_names(r.description), row))
+
+                results.append(row)
+            else:
+                rows = r.fetchall()
+                if rowFactory is dict_factory and len(rows):
+                    cols = column_names(r.description)
+                    rows = [dict(zip(cols, row)) for row in rows]
+
+                results.append(rows)
         except sqlite3.Error as e:
             logg.error("Error executing database query ({}): {}".format(q, e))
             results.append("ERROR: {}".format(e))
+            result = "error"
+        finally:
+            if not con.in_transaction:
+                # Statement did not open a transaction (e.g. DDL), so there
+                # is nothing to hold the write lock for
+                release_write_lock(con)
+
+            QUERY_SECONDS.observe(time.perf_counter() - start, type=qType)
+            QUERIES.inc(type=qType, result=result)
+
+    cur.row_factory = rowFactory
 
     if commit:
         con.commit()
@@ -98,19 +378,302 @@ def db_qry(
     else:
         res = results
 
-    logg.debug("Query result: {}.".format(res))
+    if debug:
+        logg.debug(logger.lazy("Query result: {}.", res))
+
     return res
 
 
+def db_qry_many(
+    query, args, con=None, cur=None, commit=True, closeAfter=False, logg=log
+):
+    # Execute query once for each set of args, as a single transaction
+    # Returns the number of rows affected, or an error string
+    if not con:
+        # Nothing else can use this connection, so check it back in when done
+        con = get_con(logg=logg)
+        closeAfter = True
+
+    if not cur:
+        cur = get_cur(con, logg=logg)
+
+    args = list(args)
+    error = None
+    start = time.perf_counter()
+    try:
+        logg.debug(logger.lazy("q: {}, with {} set(s) of args", query, len(args)))
+        acquire_write_lock(con, logg=logg)
+        result = cur.executemany(query, args).rowcount
+    except sqlite3.Error as e:
+        logg.error("Error executing database query ({}): {}".format(query, e))
+        error = result = "ERROR: {}".format(e)
+    finally:
+        if not con.in_transaction:
+            release_write_lock(con)
+
+        QUERY_SECONDS.observe(time.perf_counter() - start, type="write")
+        QUERIES.inc(type="write", result="error" if error else "ok")
+
+    if commit:
+        if error:
+            # Don't leave part of the batch applied
+            con.rollback()
+        else:
+            con.commit()
+
+    if closeAfter:
+        con.close()
+
+    logg.debug(logger.lazy("Query result: {}.", result))
+    return result
+
+
+class BotTable(object):
+    """Base class for a bot's table. Statements are built once per table prefix
+    and always use the same text, so sqlite can reuse its compiled statements.
+    """
+
+    def __init__(self, dbTablePrefix, logg=log):
+        self.table = "{}{}".format(dbTablePrefix, self.name)
+        self.logg = logg
+
+    def qry(self, query, args, **kwargs):
+        return db_qry((query, args), logg=self.logg, **kwargs)
+
+
+class ThreadsTable(BotTable):
+    name = "threads"
+
+    def __init__(self, dbTablePrefix, gameKey="gamePk", logg=log):
+        # gameKey = gamePk (MLB) or gameId (NBA, NFL, NHL)
+        super().__init__(dbTablePrefix, logg)
+        self.findQueries = {}  # (number of game keys, gameDate provided): query
+        self.gameKey = gameKey
+        self.insertQuery = "INSERT OR IGNORE INTO {} ({}, type, gameDate, id, dateCreated, dateUpdated) VALUES (?, ?, ?, ?, ?, ?);".format(
+            self.table, gameKey
+        )
+        self.deleteQuery = "UPDATE {} SET deleted=1 WHERE id=?;".format(self.table)
+        self.updatedQuery = "UPDATE {} SET dateUpdated=? WHERE id=?;".format(
+            self.table
+        )
+
+    def find(self, threadType, gameKeys, gameDate=None):
+        # Return list of non-deleted threads of threadType for any of gameKeys,
+        # optionally limited to gameDate
+        if not isinstance(gameKeys, (list, tuple, set)):
+            gameKeys = [gameKeys]
+
+        gameKeys = list(gameKeys)
+        q = self.findQueries.get((len(gameKeys), bool(gameDate)))
+        if not q:
+            q = "SELECT * FROM {} WHERE type=? AND {} IN ({}){} AND deleted=0;".format(
+                self.table,
+                self.gameKey,
+                ",".join("?" * len(gameKeys)),
+                " AND gameDate=?" if gameDate else "",
+            )
+            self.findQueries.update({(len(gameKeys), bool(gameDate)): q})
+
+        args = tuple([threadType] + gameKeys + ([gameDate] if gameDate else []))
+        return self.qry(q, args, closeAfter=True)
+
+    def insert(self, gameKeys, threadType, gameDate, threadId):
+        if not isinstance(gameKeys, (list, tuple, set)):
+            gameKeys = [gameKeys]
+
+        ts = time.time()
+        return db_qry_many(
+            self.insertQuery,
+            ((k, threadType, gameDate, threadId, ts, ts) for k in gameKeys),
+            logg=self.logg,
+        )
+
+    def mark_deleted(self, threadId):
+        return self.qry(self.deleteQuery, (threadId,), commit=True, closeAfter=True)
+
+    def set_updated(self, threadId, t=None):
+        return self.qry(
+            self.updatedQuery,
+            (t if t else time.time(), threadId),
+            commit=True,
+            closeAfter=True,
+        )
+
+
+class ThreadEditsTable(BotTable):
+    name = "thread_edits"
+
+    def __init__(self, dbTablePrefix, logg=log):
+        super().__init__(dbTablePrefix, logg)
+        # thread_edits has a unique constraint on (threadId, status)
+        self.incrementQuery = """INSERT INTO {} (threadId, status, checks, edits, dateCreated, dateUpdated)
+            VALUES (?, ?, 1, ?, ?, ?)
+            ON CONFLICT (threadId, status) DO UPDATE SET
+                checks=checks+1, edits=edits+excluded.edits, dateUpdated=excluded.dateUpdated
+            ;""".format(
+            self.table
+        )
+
+    def increment(self, threadId, status, edit=False):
+        # Count a check (and an edit if edit=True) for the thread and status
+        ts = time.time()
+        return self.qry(
+            self.incrementQuery,
+            (threadId, status, 1 if edit else 0, ts, ts),
+            commit=True,
+            closeAfter=True,
+        )
+
+
+class ProcessedAtBatsTable(BotTable):
+    name = "processedAtBats"
+
+    def __init__(self, dbTablePrefix, logg=log):
+        super().__init__(dbTablePrefix, logg)
+        self.findQuery = "SELECT * FROM {} WHERE gamePk=? AND gameThreadId=?;".format(
+            self.table
+        )
+        self.insertQuery = "INSERT INTO {} (gamePk, gameThreadId, processedAtBats, dateCreated, dateUpdated) VALUES (?, ?, ?, ?, ?);".format(
+            self.table
+        )
+        self.updateQuery = "UPDATE {} SET processedAtBats=?, dateUpdated=? WHERE gamePk=? AND gameThreadId=?;".format(
+            self.table
+        )
+
+    def find(self, gamePk, gameThreadId):
+        # Return the record (processedAtBats still serialized), or None
+        return self.qry(
+            self.findQuery, (gamePk, gameThreadId), fetchone=True, closeAfter=True
+        )
+
+    def insert(self, gamePk, gameThreadId, processedAtBats, t=None):
+        ts = t if t else time.time()
+        return self.qry(
+            self.insertQuery,
+            (gamePk, gameThreadId, json.dumps(processedAtBats), ts, ts),
+            commit=True,
+            closeAfter=True,
+        )
+
+    def upsert(self, gamePk, gameThreadId, processedAtBats):
+        # Update the record, or insert it if it does not exist
+        # Returns the number of rows affected, or an error string
+        con = get_con(logg=self.logg)
+        ts = time.time()
+        data = json.dumps(processedAtBats)
+        r = db_qry_many(
+            self.updateQuery,
+            [(data, ts, gamePk, gameThreadId)],
+            con=con,
+            commit=False,
+            logg=self.logg,
+        )
+        if r == 0:
+            r = db_qry_many(
+                self.insertQuery,
+                [(gamePk, gameThreadId, data, ts, ts)],
+                con=con,
+                commit=False,
+                logg=self.logg,
+            )
+
+        if isinstance(r, str):
+            con.rollback()
+        else:
+            con.commit()
+
+        con.close()
+        return r
+
+
+class CommentsTable(BotTable):
+    name = "comments"
+
+    def __init__(self, dbTablePrefix, logg=log):
+        super().__init__(dbTablePrefix, logg)
+        self.insertQuery = """INSERT INTO {} (
+                gamePk,
+                gameThreadId,
+                atBatIndex,
+                actionIndex,
+                isScoringPlay,
+                eventType,
+                myTeamBatting,
+                commentId,
+                dateCreated,
+                dateUpdated,
+                deleted
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""".format(
+            self.table
+        )
+
+    def insert(self, *args):
+        # args = gamePk, gameThreadId, atBatIndex, actionIndex, isScoringPlay,
+        # eventType, myTeamBatting, commentId, dateCreated, dateUpdated, deleted
+        return self.qry(self.insertQuery, args, commit=True, closeAfter=True)
+
+
+class GamesTable(BotTable):
+    name = "games"
+
+    def __init__(self, dbTablePrefix, logg=log):
+        super().__init__(dbTablePrefix, logg)
+        self.findQuery = "SELECT * FROM {} WHERE gameId=? AND gameDate=?;".format(
+            self.table
+        )
+        self.insertQuery = (
+            "INSERT INTO {} (gameId, gameDate, dateAdded) VALUES (?, ?, ?);".format(
+                self.table
+            )
+        )
+
+    def find(self, gameId, gameDate):
+        return self.qry(self.findQuery, (gameId, gameDate), closeAfter=True)
+
+    def insert(self, gameId, gameDate):
+        return self.qry(
+            self.insertQuery,
+            (gameId, gameDate, time.time()),
+            commit=True,
+            closeAfter=True,
+        )
+
+
+class BotTables(object):
+    """Data access for the tables used by the game thread bots,
+    e.g. bot.db.threads.find("game", gamePk, gameDate)
+    """
+
+    def __init__(self, dbTablePrefix, gameKey="gamePk", logg=log):
+        # gameKey = column identifying the game in the threads table
+        self.threads = ThreadsTable(dbTablePrefix, gameKey, logg)
+        self.thread_edits = ThreadEditsTable(dbTablePrefix, logg)
+        self.processedAtBats = ProcessedAtBatsTable(dbTablePrefix, logg)
+        self.comments = CommentsTable(dbTablePrefix, logg)
+        self.games = GamesTable(dbTablePrefix, logg)
+
+
 def dict_factory(cursor, row):
     """From sqlite3 documentation:
     https://docs.python.org/2/library/sqlite3.html#sqlite3.Connection.row_factory
     """
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
+    return dict(zip(column_names(cursor.description), row))
+
 
-    return d
+COLUMN_NAMES = {}  # cursor.description: tuple of column names
+
+
+def column_names(description):
+    # description is the same object for every row of a query,
+    # and the same for repeated queries returning the same columns
+    cols = COLUMN_NAMES.get(description)
+    if cols is None:
+        if len(COLUMN_NAMES) > 1000:
+            COLUMN_NAMES.clear()
+
+        cols = COLUMN_NAMES[description] = tuple(c[0] for c in description)
+
+    return cols
 
 
 def validate_db(logg=log):
@@ -422,12 +985,14 @@ def build_tables(tables, logg=log):
             )
         )
 
-    logg.debug("Executing queries to build {} table(s): {}".format(tables, queries))
+    logg.debug(
+        logger.lazy("Executing queries to build {} table(s): {}", tables, queries)
+    )
     results = db_qry(queries, commit=True, closeAfter=True, logg=logg)
     if None in results:
-        logg.debug("One or more queries failed: {}".format(results))
+        logg.debug(logger.lazy("One or more queries failed: {}", results))
     else:
-        logg.debug("Building of tables complete. Results: {}".format(results))
+        logg.debug(logger.lazy("Building of tables complete. Results: {}", results))
 
     return True
 
@@ -447,7 +1012,7 @@ def backup_database(logg=log, manual=False):
     bakFileName = "redball{}-{}.db".format(
         "-manual" if manual else "-auto", datetime.today().strftime("%Y%m%d%H%M%S")
     )
-    bak = get_con(dbFile=os.path.join(redball.DB_PATH, bakFileName))
+    bak = get_con(dbFile=os.path.join(redball.DB_PATH, bakFileName), pooled=False)
     try:
         con.backup(bak)
         logg.info("Successfully created database backup [{}].".format(bakFileName))
@@ -482,6 +1047,6 @@ def cleanup_db_backups(logg=log, backupPath=None, days=7):
         ):
             try:
                 os.remove(os.path.join(backupPath, f))
-                logg.debug("Deleted old backup [{}]".format(f))
+                logg.debug(logger.lazy("Deleted old backup [{}]", f))
             except Exception as e:
                 logg.error("Error deleting old backup [{}]: {}.".format(f, e))
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# JSON Patch (RFC 6902) for documents decoded from JSON, e.g. applying the
+# StatsAPI game_diff to cached gumbo data instead of downloading it again.
+# Patches are applied in place and rolled back if any operation fails.
+
+import copy
+import functools
+
+POINTER_CACHE_SIZE = 8192  # Parsed paths kept, live game diffs repeat the same paths
+
+
+class PatchError(ValueError):
+    pass
+
+
+@functools.lru_cache(maxsize=POINTER_CACHE_SIZE)
+def compile_pointer(path):
+    # Split a JSON pointer (RFC 6901) into a tuple of unescaped tokens
+    if not isinstance(path, str):
+        raise PatchError("Invalid path: {!r}".format(path))
+
+    if path == "":
+        return ()
+
+    if path[0] != "/":
+        raise PatchError("Path must start with /: {}".format(path))
+
+    return tuple(
+        t.replace("~1", "/").replace("~0", "~") if "~" in t else t
+        for t in path[1:].split("/")
+    )
+
+
+def list_index(token, target, allowEnd=False):
+    # Return the list index for token, allowEnd = True to allow len(target) or -
+    if token == "-" and allowEnd:
+        return len(target)
+
+    if (
+        not token.isdigit()
+        or not token.isascii()
+        or (len(token) > 1 and token[0] == "0")
+    ):
+        raise PatchError("Invalid list index: {}".format(token))
+
+    i = int(token)
+    if i > len(target) or (i == len(target) and not allowEnd):
+        raise PatchError(
+            "List index {} out of range (len: {})".format(token, len(target))
+        )
+
+    return i
+
+
+def json_equal(a, b):
+    # Equality per RFC 6902 test: like ==, but booleans are not numbers
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+
+    if isinstance(a, dict):
+        return (
+            isinstance(b, dict)
+            and a.keys() == b.keys()
+            and all(json_equal(v, b[k]) for k, v in a.items())
+        )
+
+    if isinstance(a, list):
+        return (
+            isinstance(b, list)
+            and len(a) == len(b)
+            and all(json_equal(x, y) for x, y in zip(a, b))
+        )
+
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+
+    return type(a) is type(b) and a == b
+
+
+class Patcher(object):
+    # Applies operations to doc, keeping what is needed to undo them
+    # lenient = True to handle edge cases seen in StatsAPI diffs rather than fail:
+    # missing parents are created, replace adds a missing value,
+    # and remove of a missing value is ignored
+
+    def __init__(self, doc, lenient=False):
+        self.doc = doc
+        self.lenient = lenient
+        self.undo = []
+
+    def parent(self, tokens, create=False):
+        # Return the container holding the value at tokens
+        target = self.doc
+        for i in range(len(tokens) - 1):
+            t = tokens[i]
+            if isinstance(target, dict):
+                if t not in target:
+                    if not create:
+                        raise PatchError("Path not found: {}".format(t))
+
+                    target[t] = [] if tokens[i + 1] in ["0", "-"] else {}
+                    self.undo.append((target, t, None, False))
+
+                target = target[t]
+            elif isinstance(target, list):
+                idx = list_index(t, target, create)
+                if idx == len(target):
+                    target.append([] if tokens[i + 1] in ["0", "-"] else {})
+                    self.undo.append((target, idx, None, False))
+
+                target = target[idx]
+            else:
+                raise PatchError("Can't traverse into {}: {}".format(type(target), t))
+
+        return target
+
+    def get(self, tokens):
+        if not tokens:
+            return self.doc
+
+        target = self.parent(tokens)
+        t = tokens[-1]
+        if isinstance(target, dict):
+            if t not in target:
+                raise PatchError("Path not found: {}".format(t))
+
+            return target[t]
+        elif isinstance(target, list):
+            return target[list_index(t, target)]
+
+        raise PatchError("Can't traverse into {}: {}".format(type(target), t))
+
+    # Undo entries are (container, key, old value, had a value)
+    # for lists, had a value = False means the value was inserted,
+    # and None means a value was removed and must be inserted again
+
+    def add(self, tokens, value):
+        if not tokens:
+            self.undo.append((None, None, self.doc, True))
+            self.doc = value
+            return
+
+        target = self.parent(tokens, create=self.lenient)
+        t = tokens[-1]
+        if isinstance(target, dict):
+            if t in target:
+                self.undo.append((target, t, target[t], True))
+            else:
+                self.undo.append((target, t, None, False))
+
+            target[t] = value
+        elif isinstance(target, list):
+            idx = list_index(t, target, True)
+            target.insert(idx, value)
+            self.undo.append((target, idx, None, False))
+        else:
+            raise PatchError("Can't add to {}: {}".format(type(target), t))
+
+    def remove(self, tokens):
+        if not tokens:
+            raise PatchError("Can't remove the whole document")
+
+        try:
+            target = self.parent(tokens)
+            t = tokens[-1]
+            if isinstance(target, dict):
+                if t not in target:
+                    raise PatchError("Path not found: {}".format(t))
+
+                value = target.pop(t)
+                self.undo.append((target, t, value, True))
+            elif isinstance(target, list):
+                idx = list_index(t, target)
+                value = target.pop(idx)
+                self.undo.append((target, idx, value, None))
+            else:
+                raise PatchError("Can't remove from {}: {}".format(type(target), t))
+        except PatchError:
+            if self.lenient:
+                return None
+
+            raise
+
+        return value
+
+    def replace(self, tokens, value):
+        if not tokens:
+            return self.add(tokens, value)
+
+        target = self.parent(tokens, create=self.lenient)
+        t = tokens[-1]
+        if isinstance(target, dict):
+            if t not in target:
+                if not self.lenient:
+                    raise PatchError("Path not found: {}".format(t))
+
+                return self.add(tokens, value)
+
+            self.undo.append((target, t, target[t], True))
+            target[t] = value
+        elif isinstance(target, list):
+            idx = list_index(t, target, self.lenient)
+            if idx == len(target):
+                return self.add(tokens, value)
+
+            self.undo.append((target, idx, target[idx], True))
+            target[idx] = value
+        else:
+            raise PatchError("Can't replace in {}: {}".format(type(target), t))
+
+    def rollback(self):
+        while self.undo:
+            target, key, old, had = self.undo.pop()
+            if target is None:
+                self.doc = old
+            elif had is None:
+                target.insert(key, old)
+            elif had:
+                target[key] = old
+            elif isinstance(target, list):
+                target.pop(key)
+            else:
+                target.pop(key, None)
+
+    def apply(self, op):
+        name = op.get("op")
+        tokens = compile_pointer(op.get("path"))
+        if name == "add" or name == "replace":
+            if "value" not in op:
+                raise PatchError("Missing value")
+
+            getattr(self, name)(tokens, op["value"])
+        elif name == "remove":
+            self.remove(tokens)
+        elif name == "move" or name == "copy":
+            src = compile_pointer(op.get("from"))
+            if name == "move":
+                if src == tokens:
+                    return
+
+                if tokens[: len(src)] == src:
+                    raise PatchError("Can't move a value into itself")
+
+                value = self.get(src)
+                self.remove(src)
+            else:
+                value = copy.deepcopy(self.get(src))
+
+            self.add(tokens, value)
+        elif name == "test":
+            if "value" not in op:
+                raise PatchError("Missing value")
+
+            if not json_equal(self.get(tokens), op["value"]):
+                raise PatchError("Test failed")
+        else:
+            raise PatchError("Unknown op: {}".format(name))
+
+
+def apply_patch(doc, patch, lenient=False):
+    # Apply the list of operations in patch to doc, in place
+    # return the patched document (a different object only if the root was replaced)
+    # raise PatchError and leave doc unchanged if any operation fails
+    patcher = Patcher(doc, lenient)
+    for i, op in enumerate(patch):
+        try:
+            patcher.apply(op)
+        except PatchError as e:
+            patcher.rollback()
+            raise PatchError("Operation {} ({}) failed: {}".format(i, op, e))
+        except (AttributeError, KeyError, IndexError, TypeError) as e:
+            patcher.rollback()
+            raise PatchError("Operation {} ({}) is invalid: {}".format(i, op, e))
+
+    return patcher.doc
@@ -1,15 +1,302 @@
 #!/usr/bin/env python
 
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import re
 import sys
+import threading
 import time
 
 cwd = os.path.dirname(os.path.realpath(__file__))
 pardir = os.path.abspath(os.path.join(cwd, os.pardir))
 LOG_PATH = os.path.join(pardir, "logs")
 
+# Queue mode: loggers put records on a bounded queue per destination (each log file,
+# and one shared queue for the console), and a writer thread per destination does
+# the formatting and I/O. Options apply to handlers added after they are set.
+QUEUE_OPTIONS = {"enabled": False, "size": 10000, "overflow": "drop_debug"}
+QUEUE_OVERFLOW_POLICIES = ["drop_debug", "block"]
+QUEUE_DROP_DEBUG_AT = 0.8  # Drop DEBUG records once the queue is this full
+QUEUE_BLOCK_TIMEOUT = 5  # Seconds drop_debug waits for room for other records
+QUEUES_LOCK = threading.Lock()
+QUEUES = {}  # destination: {"queue", "listener", "handler", "overflow", "users", "stats"}
+
+REPR_LIMIT = 10000  # Characters of a large payload kept in lazy() log messages
+
+# Output options, applied to handlers added after they are set:
+# format = text (one line per record, plus traceback lines) or json (one JSON
+# object per line, see RbJsonFormatter)
+# rateLimit = most DEBUG/INFO records per message per rateInterval seconds from each
+# logger, 0 for no limit (see RbRateLimitFilter)
+FORMAT_OPTIONS = {"format": "text", "rateLimit": 0, "rateInterval": 60}
+LOG_FORMATS = ["text", "json"]
+TEXT_FORMAT = "%(asctime)s :: %(levelname)8s :: %(threadName)s(%(thread)d) :: %(module)s(%(lineno)d) :: %(funcName)s :: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %I:%M:%S %p"
+RATE_LIMIT_MAX_KEYS = 1000  # Most messages tracked by each rate limit filter
+BOT_THREAD_RE = re.compile(r"^bot-(\d+)-")  # bot-<botId>-<bot name>[-<task>]
+GAME_THREAD_RE = re.compile(r"-(?:game|postgame)-(\d+)(?:-comments|-feed)?$")
+
+
+def short_repr(obj, limit=REPR_LIMIT):
+    # str() of obj for a log message, cut off at about limit characters
+    # Containers are walked only until the limit is reached, so logging a
+    # multi-MB payload costs about the same as logging a small one
+    if isinstance(obj, str):
+        return obj if len(obj) <= limit else "{}...".format(obj[:limit])
+
+    parts = []
+    budget = [limit]
+    repr_parts(obj, parts, budget)
+    if budget[0] < 0:
+        parts.append("...")
+
+    return "".join(parts)
+
+
+def repr_parts(obj, parts, budget):
+    # Append pieces of repr(obj) to parts, subtracting their length from budget[0]
+    if budget[0] < 0:
+        return
+
+    if not obj and isinstance(obj, (dict, list, tuple, set, frozenset)):
+        # Empty containers, e.g. set()
+        brackets = None
+    elif isinstance(obj, dict):
+        brackets = "{}"
+    elif isinstance(obj, list):
+        brackets = "[]"
+    elif isinstance(obj, tuple):
+        brackets = "()"
+    elif isinstance(obj, (set, frozenset)):
+        brackets = "{}"
+    else:
+        brackets = None
+
+    if not brackets:
+        if isinstance(obj, str) and len(obj) > budget[0]:
+            obj = obj[: budget[0] + 1]
+
+        s = repr(obj)
+        if len(s) > budget[0]:
+            s = s[: budget[0]]
+            budget[0] = -1
+        else:
+            budget[0] -= len(s)
+
+        parts.append(s)
+        return
+
+    parts.append(brackets[0])
+    budget[0] -= 2
+    for i, x in enumerate(obj):
+        if budget[0] < 0:
+            break
+
+        if i:
+            parts.append(", ")
+            budget[0] -= 2
+
+        repr_parts(x, parts, budget)
+        if isinstance(obj, dict):
+            parts.append(": ")
+            budget[0] -= 2
+            repr_parts(obj[x], parts, budget)
+
+    if budget[0] >= 0:
+        if len(obj) == 1 and isinstance(obj, tuple):
+            parts.append(",")
+
+        parts.append(brackets[1])
+
+
+class LazyMessage(object):
+    # Log message built with str.format() only if a handler writes the record,
+    # with large arguments cut down by short_repr()
+    __slots__ = ("fmt", "args", "kwargs")
+
+    def __init__(self, fmt, args, kwargs):
+        self.fmt = fmt
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return self.fmt.format(
+            *(short_arg(x) for x in self.args),
+            **{k: short_arg(v) for k, v in self.kwargs.items()},
+        )
+
+
+def short_arg(x):
+    # Containers and long strings are cut down, anything else is left alone
+    # so format specs like {:.2f} still work
+    if isinstance(x, (dict, list, tuple, set, frozenset)) or (
+        isinstance(x, str) and len(x) > REPR_LIMIT
+    ):
+        return short_repr(x)
+
+    return x
+
+
+def lazy(fmt, *args, **kwargs):
+    # Use in place of fmt.format(*args, **kwargs) for log messages, e.g.
+    # log.debug(logger.lazy("Data: {}", data)) costs nothing if DEBUG is disabled
+    return LazyMessage(fmt, args, kwargs)
+
+
+def get_event(record):
+    # Name for the kind of message a record holds: the event passed in extra,
+    # otherwise the message template before arguments are filled in
+    event = record.__dict__.get("event")
+    if event is None:
+        if isinstance(record.msg, LazyMessage):
+            event = record.msg.fmt
+        elif record.args and isinstance(record.msg, str):
+            event = record.msg
+
+    return event
+
+
+def get_ids(record):
+    # Return (botId, gamePk) from the record's extra fields or its thread name
+    botId = record.__dict__.get("botId")
+    gamePk = record.__dict__.get("gamePk")
+    threadName = record.threadName or ""
+    if botId is None:
+        m = BOT_THREAD_RE.match(threadName)
+        if m:
+            botId = int(m.group(1))
+
+    if gamePk is None and botId is not None:
+        m = GAME_THREAD_RE.search(threadName)
+        if m:
+            gamePk = int(m.group(1))
+
+    return botId, gamePk
+
+
+class RbFormatter(logging.Formatter):
+    # Text format, noting how many similar records were dropped by rate limiting
+
+    def format(self, record):
+        s = logging.Formatter.format(self, record)
+        suppressed = record.__dict__.get("suppressed")
+        if suppressed:
+            s += " [{} similar message(s) suppressed]".format(suppressed)
+
+        return s
+
+
+class RbJsonFormatter(logging.Formatter):
+    # One JSON object per line, with fields always in this order so the log
+    # viewer can filter on level and thread without parsing:
+    # time (UTC), level, thread, botId, gamePk, event, logger, module, line,
+    # func, msg, suppressed (if any), exc (traceback, if any)
+    # botId, gamePk and event can be passed with extra={...}, otherwise they come
+    # from the thread name and message template (null if not available)
+
+    def format(self, record):
+        botId, gamePk = get_ids(record)
+        data = {
+            "time": "{}.{:03d}Z".format(
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)),
+                int(record.msecs),
+            ),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "botId": botId,
+            "gamePk": gamePk,
+            "event": get_event(record),
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "func": record.funcName,
+            "msg": record.getMessage(),
+        }
+        if record.__dict__.get("suppressed"):
+            data["suppressed"] = record.suppressed
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            data["exc"] = record.exc_text
+
+        if record.stack_info:
+            data["exc"] = (
+                data.get("exc", "") + "\n" + self.formatStack(record.stack_info)
+            ).lstrip("\n")
+
+        return json.dumps(data, default=str)
+
+
+class RbRateLimitFilter(logging.Filter):
+    # Lets through at most limit DEBUG/INFO records with the same message (see
+    # get_event) from each logger per interval seconds; WARNING and above always
+    # pass. The first record let through after some were dropped carries the number
+    # dropped in record.suppressed.
+
+    def __init__(self, limit, interval):
+        logging.Filter.__init__(self)
+        self.limit = limit
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.counts = {}  # (logger, message): [window start, count, dropped]
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        event = get_event(record)
+        key = (record.name, event if event is not None else record.msg)
+        now = record.created
+        with self.lock:
+            c = self.counts.get(key)
+            if c and now - c[0] < self.interval:
+                if c[1] < self.limit:
+                    c[1] += 1
+                    return True
+
+                c[2] += 1
+                return False
+
+            if not c and len(self.counts) >= RATE_LIMIT_MAX_KEYS:
+                # Forget messages whose window has passed
+                self.counts = {
+                    k: v for k, v in self.counts.items() if now - v[0] < self.interval
+                }
+                if len(self.counts) >= RATE_LIMIT_MAX_KEYS:
+                    self.counts.clear()
+
+            self.counts[key] = [now, 1, 0]
+
+        if c and c[2]:
+            record.suppressed = c[2]
+
+        return True
+
+
+def get_formatter():
+    if FORMAT_OPTIONS["format"] == "json":
+        return RbJsonFormatter()
+
+    return RbFormatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+
+def add_rate_limit(handler):
+    if FORMAT_OPTIONS["rateLimit"] > 0:
+        handler.addFilter(
+            RbRateLimitFilter(
+                FORMAT_OPTIONS["rateLimit"], FORMAT_OPTIONS["rateInterval"]
+            )
+        )
+
+    return handler
+
 
 def get_logger(logger_name, log_level="INFO", propagate=False):
     logger = logging.getLogger(logger_name)
@@ -25,6 +312,219 @@ def clear_handlers(logger=None):
 
     for h in list(logger.handlers):
         logger.removeHandler(h)
+        if isinstance(h, RbQueueHandler):
+            release_queue(h.destination)
+
+
+def set_queue_options(enabled=None, size=None, overflow=None):
+    # enabled = True to send records through queues (see QUEUE_OPTIONS)
+    # size = most records waiting in each queue
+    # overflow = what to do when a queue is full:
+    #   drop_debug: drop DEBUG records when the queue is QUEUE_DROP_DEBUG_AT full,
+    #       and other records if there is still no room after QUEUE_BLOCK_TIMEOUT
+    #   block: wait for room, never drop records
+    if enabled is not None:
+        QUEUE_OPTIONS["enabled"] = (
+            (enabled.lower() == "true") if isinstance(enabled, str) else bool(enabled)
+        )
+
+    if size:
+        QUEUE_OPTIONS["size"] = max(100, int(size))
+
+    if overflow in QUEUE_OVERFLOW_POLICIES:
+        QUEUE_OPTIONS["overflow"] = overflow
+
+
+def set_format_options(logFormat=None, rateLimit=None, rateInterval=None):
+    # logFormat = text or json
+    # rateLimit = most DEBUG/INFO records per message per rateInterval seconds
+    #   from each logger, 0 for no limit
+    # (see FORMAT_OPTIONS)
+    if logFormat in LOG_FORMATS:
+        FORMAT_OPTIONS["format"] = logFormat
+
+    if rateLimit is not None and str(rateLimit) != "":
+        FORMAT_OPTIONS["rateLimit"] = max(0, int(rateLimit))
+
+    if rateInterval:
+        FORMAT_OPTIONS["rateInterval"] = max(1, int(rateInterval))
+
+
+class RbQueueHandler(logging.handlers.QueueHandler):
+    # Puts records on a destination's queue for its writer thread
+
+    def __init__(self, destination):
+        logging.handlers.QueueHandler.__init__(self, QUEUES[destination]["queue"])
+        self.destination = destination
+        self.dest = QUEUES[destination]
+
+    def prepare(self, record):
+        # Merge args into the message and capture the traceback now, since they may
+        # change before the writer thread gets to the record; the writer does the
+        # rest of the formatting
+        if not record.args and not record.exc_info and isinstance(record.msg, str):
+            # Nothing to capture, and the record is not modified
+            return record
+
+        record = copy.copy(record)
+        if "event" not in record.__dict__:
+            # Keep the message template for the JSON formatter
+            record.event = get_event(record)
+
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.dest["handler"].formatter.formatException(
+                    record.exc_info
+                )
+
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record):
+        dest = self.dest
+        q = dest["queue"]
+        stats = dest["stats"]
+        if dest["listener"] is None:
+            # Writer has been stopped, e.g. at exit
+            dest["handler"].handle(record)
+            return
+
+        if (
+            dest["overflow"] == "drop_debug"
+            and record.levelno <= logging.DEBUG
+            and q.qsize() >= q.maxsize * QUEUE_DROP_DEBUG_AT
+        ):
+            with dest["lock"]:
+                stats["dropped"] += 1
+                stats["droppedDebug"] += 1
+
+            return
+
+        try:
+            q.put_nowait(record)
+        except queue.Full:
+            with dest["lock"]:
+                stats["blocked"] += 1
+
+            try:
+                q.put(
+                    record,
+                    timeout=QUEUE_BLOCK_TIMEOUT
+                    if dest["overflow"] == "drop_debug"
+                    else None,
+                )
+            except queue.Full:
+                with dest["lock"]:
+                    stats["dropped"] += 1
+
+                return
+
+        with dest["lock"]:
+            stats["queued"] += 1
+            stats["maxDepth"] = max(stats["maxDepth"], q.qsize())
+
+
+def get_queue_handler(destination, handler, level):
+    # Return a handler that sends records to the writer thread for destination,
+    # starting one that writes to handler if there isn't one already
+    with QUEUES_LOCK:
+        dest = QUEUES.get(destination)
+        if dest:
+            # Already have a writer for this destination, use the current format
+            dest["handler"].setFormatter(handler.formatter)
+            handler.close()
+        else:
+            handler.setLevel(logging.NOTSET)  # Level is checked by the queue handler
+            dest = {
+                "queue": queue.Queue(QUEUE_OPTIONS["size"]),
+                "handler": handler,
+                "overflow": QUEUE_OPTIONS["overflow"],
+                "users": 0,
+                "lock": threading.Lock(),
+                "stats": {
+                    "queued": 0,
+                    "dropped": 0,
+                    "droppedDebug": 0,
+                    "blocked": 0,
+                    "maxDepth": 0,
+                },
+            }
+            dest["listener"] = logging.handlers.QueueListener(dest["queue"], handler)
+            dest["listener"].start()
+            dest["listener"]._thread.name = "rb-log-{}".format(
+                os.path.basename(destination)
+            )
+            QUEUES[destination] = dest
+
+        dest["users"] += 1
+        queue_handler = RbQueueHandler(destination)
+        queue_handler.setLevel(level)
+
+    return queue_handler
+
+
+def release_queue(destination):
+    # Stop the writer for destination once no loggers are using it
+    with QUEUES_LOCK:
+        dest = QUEUES.get(destination)
+        if not dest:
+            return
+
+        dest["users"] -= 1
+        if dest["users"] > 0:
+            return
+
+        QUEUES.pop(destination)
+
+    stop_queue(dest)
+
+
+def stop_queue(dest):
+    # Write what's left in the queue, then stop the writer and close the handler
+    listener = dest["listener"]
+    dest["listener"] = None
+    if listener:
+        listener.stop()
+
+    dest["handler"].close()
+
+
+def stop_queues():
+    # Flush and stop all writer threads, e.g. at exit
+    with QUEUES_LOCK:
+        dests = list(QUEUES.values())
+        QUEUES.clear()
+
+    for dest in dests:
+        stop_queue(dest)
+
+
+atexit.register(stop_queues)
+
+
+def queue_stats():
+    # Counters for each queue: {destination: {"queued", "dropped", "droppedDebug",
+    # "blocked", "maxDepth", "depth", "size", "overflow"}}
+    with QUEUES_LOCK:
+        dests = dict(QUEUES)
+
+    stats = {}
+    for k, dest in dests.items():
+        with dest["lock"]:
+            stats[os.path.basename(k)] = dict(dest["stats"])
+
+        stats[os.path.basename(k)].update(
+            {
+                "depth": dest["queue"].qsize(),
+                "size": dest["queue"].maxsize,
+                "overflow": dest["overflow"],
+            }
+        )
+
+    return stats
 
 
 def add_handlers(
@@ -41,10 +541,7 @@ def add_handlers(
     if clear_first:
         clear_handlers(logger)
 
-    formatter = logging.Formatter(
-        "%(asctime)s :: %(levelname)8s :: %(threadName)s(%(thread)d) :: %(module)s(%(lineno)d) :: %(funcName)s :: %(message)s",
-        datefmt="%Y-%m-%d %I:%M:%S %p",
-    )
+    formatter = get_formatter()
 
     # Set up file logging
     if log_to_file and log_file:
@@ -65,7 +562,18 @@ def add_handlers(
                     else logging.INFO
                 )
                 file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+                if QUEUE_OPTIONS["enabled"]:
+                    logger.addHandler(
+                        add_rate_limit(
+                            get_queue_handler(
+                                os.path.join(log_path, log_file),
+                                file_handler,
+                                file_handler.level,
+                            )
+                        )
+                    )
+                else:
+                    logger.addHandler(add_rate_limit(file_handler))
                 break
             except IOError as e:
                 if i >= 1:
@@ -94,7 +602,15 @@ def add_handlers(
             else logging.INFO
         )
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        if QUEUE_OPTIONS["enabled"]:
+            # One writer for all console output
+            logger.addHandler(
+                add_rate_limit(
+                    get_queue_handler("console", console_handler, console_handler.level)
+                )
+            )
+        else:
+            logger.addHandler(add_rate_limit(console_handler))
 
     return True
 
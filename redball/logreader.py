@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+
+import io
+import os
+import re
+
+import redball
+from redball import logger
+
+log = logger.get_logger(
+    logger_name="redball.logreader", log_level="DEBUG", propagate=True
+)
+
+BLOCK_SIZE = 65536  # Bytes read at a time
+MAX_READ_BYTES = 1048576  # Most bytes returned by one range read
+MAX_TAIL_LINES = 5000  # Most lines returned by one tail read
+MAX_SCAN_BYTES = 33554432  # Most bytes scanned by one search, continue from "end"
+MAX_RESULTS = 1000  # Most records returned by one search
+FOLLOW_INTERVAL = 1  # Seconds between checks for new lines in follow mode
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# Matches the start of a record written with logger.TEXT_FORMAT:
+# asctime :: levelname :: threadName(thread) :: module(lineno) :: funcName :: message
+# Lines that don't match are continuations of the previous record (e.g. tracebacks)
+RECORD_RE = re.compile(
+    rb"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} [AP]M :: +(\w+) :: (.*?)\(\d+\) :: "
+)
+# Matches a record written by logger.RbJsonFormatter (one line per record)
+JSON_RECORD_RE = re.compile(
+    rb'^\{"time": "[^"]*", "level": "(\w+)", "thread": "((?:[^"\\]|\\.)*)", '
+)
+
+
+def match_record(line):
+    # Return a match with groups (level, thread name) if line starts a record
+    return RECORD_RE.match(line) or JSON_RECORD_RE.match(line)
+
+
+def get_log_path(logId):
+    # Return the full path for logId, or None if it is not a file in LOG_PATH
+    if (
+        not logId
+        or any(x for x in ["\\", "/", ":", ".."] if x in logId)
+        or logId not in os.listdir(redball.LOG_PATH)
+    ):
+        return None
+
+    logFile = os.path.join(redball.LOG_PATH, logId)
+    return logFile if os.path.isfile(logFile) else None
+
+
+def list_logs():
+    # Current and rotated log files in LOG_PATH: [{"logId", "size", "modified"}]
+    logs = []
+    for f in sorted(os.listdir(redball.LOG_PATH)):
+        try:
+            st = os.stat(os.path.join(redball.LOG_PATH, f))
+        except OSError:
+            continue
+
+        logs.append({"logId": f, "size": st.st_size, "modified": st.st_mtime})
+
+    return logs
+
+
+def get_filter(level=None, thread=None, pattern=None):
+    # Return a function to check a record (bytes) against the given filters,
+    # or None if there are no filters
+    # level = minimum level name, e.g. WARNING
+    # thread = text to find in the thread name, e.g. bot-1-
+    # pattern = regular expression to search for in the record
+    # raise ValueError for an unknown level or invalid pattern
+    if level:
+        if level.upper() not in LEVELS:
+            raise ValueError("Unknown log level: {}".format(level))
+
+        minLevel = LEVELS[level.upper()]
+    else:
+        minLevel = None
+
+    threadBytes = thread.encode("utf-8") if thread else None
+    try:
+        regex = re.compile(pattern.encode("utf-8")) if pattern else None
+    except re.error as e:
+        raise ValueError("Invalid pattern: {}".format(e))
+
+    if minLevel is None and not threadBytes and not regex:
+        return None
+
+    def check(record):
+        if minLevel is not None or threadBytes:
+            m = match_record(record)
+            if not m:
+                return False
+
+            if (
+                minLevel is not None
+                and LEVELS.get(m.group(1).decode("utf-8", "replace"), 0) < minLevel
+            ):
+                return False
+
+            if threadBytes and threadBytes not in m.group(2):
+                return False
+
+        if regex and not regex.search(record):
+            return False
+
+        return True
+
+    return check
+
+
+def decode(data):
+    return data.decode("utf-8", "replace")
+
+
+def get_offset(size, start):
+    # Negative start counts back from the end of the file
+    start = int(start or 0)
+    if start < 0:
+        start = max(0, size + start)
+
+    return min(start, size)
+
+
+def read_range(logId, start=0, length=MAX_READ_BYTES):
+    # Read up to length bytes starting at byte offset start (negative = from the end),
+    # trimmed to whole lines
+    # return {"logId", "size", "start", "end", "lines"}, continue reading from end
+    logFile = get_log_path(logId)
+    if not logFile:
+        return "ERROR: Invalid log specified."
+
+    length = max(0, min(int(length or MAX_READ_BYTES), MAX_READ_BYTES))
+    with open(logFile, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        start = get_offset(size, start)
+        f.seek(max(0, start - 1))
+        if start > 0 and f.read(1) != b"\n":
+            # Start at the beginning of the next line
+            f.readline()
+            start = f.tell()
+
+        data = f.read(length)
+        if start + len(data) < size and b"\n" in data:
+            # Don't return a partial line unless it is the end of the file
+            data = data[: data.rindex(b"\n") + 1]
+
+    return {
+        "logId": logId,
+        "size": size,
+        "start": start,
+        "end": start + len(data),
+        "lines": decode(data).splitlines(),
+    }
+
+
+def tail(logId, lines=100):
+    # Read the last lines of the log by reading backwards from the end
+    # return {"logId", "size", "start", "end", "lines"}
+    logFile = get_log_path(logId)
+    if not logFile:
+        return "ERROR: Invalid log specified."
+
+    lines = max(1, min(int(lines or 100), MAX_TAIL_LINES))
+    with open(logFile, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        pos = size
+        data = b""
+        # Count one extra newline for the one ending the last line
+        while pos > 0 and data.count(b"\n") <= lines:
+            readSize = min(BLOCK_SIZE, pos)
+            pos -= readSize
+            f.seek(pos)
+            data = f.read(readSize) + data
+
+    result = data.splitlines(True)[-lines:]
+    data = b"".join(result)
+    return {
+        "logId": logId,
+        "size": size,
+        "start": size - len(data),
+        "end": size,
+        "lines": decode(data).splitlines(),
+    }
+
+
+def iter_records(f, end=None):
+    # Yield (offset, record bytes) for each record from the current position of f,
+    # grouping continuation lines with the record they belong to
+    # stop at byte offset end if provided
+    pos = f.tell()
+    recordStart = pos
+    record = []
+    for line in iter(f.readline, b""):
+        if end is not None and pos >= end:
+            break
+
+        if record and match_record(line):
+            yield recordStart, b"".join(record)
+            record = []
+            recordStart = pos
+
+        record.append(line)
+        pos += len(line)
+
+    if record:
+        yield recordStart, b"".join(record)
+
+
+def search(logId, level=None, thread=None, pattern=None, start=0, limit=MAX_RESULTS):
+    # Scan the log from byte offset start (negative = from the end) for records
+    # matching the filters, scanning at most MAX_SCAN_BYTES
+    # return {"logId", "size", "start", "end", "records": [{"offset", "lines"}]},
+    # continue searching from end if end < size
+    logFile = get_log_path(logId)
+    if not logFile:
+        return "ERROR: Invalid log specified."
+
+    try:
+        check = get_filter(level, thread, pattern)
+    except ValueError as e:
+        return "ERROR: {}".format(e)
+
+    limit = max(1, min(int(limit or MAX_RESULTS), MAX_RESULTS))
+    records = []
+    with open(logFile, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        start = get_offset(size, start)
+        f.seek(max(0, start - 1))
+        if start > 0 and f.read(1) != b"\n":
+            # Start at the beginning of the next line
+            f.readline()
+
+        end = f.tell()
+        for offset, record in iter_records(f, min(size, start + MAX_SCAN_BYTES)):
+            end = offset + len(record)
+            if check and not check(record):
+                continue
+
+            records.append({"offset": offset, "lines": decode(record).splitlines()})
+            if len(records) >= limit:
+                break
+
+    return {
+        "logId": logId,
+        "size": size,
+        "start": start,
+        "end": min(end, size),
+        "records": records,
+    }
+
+
+def follow(logId, start=None, level=None, thread=None, pattern=None, stop=None):
+    # Generator yielding {"end", "records"} as matching records are written to the log,
+    # starting at byte offset start (default: the current end of the file)
+    # yields None when there is nothing new, so the caller can send keepalives
+    # reopens the file from the beginning when it is rotated, after reading
+    # the rest of the old file MAX_READ_BYTES at a time
+    # stop = function returning True when following should stop
+    logFile = get_log_path(logId)
+    if not logFile:
+        raise ValueError("Invalid log specified.")
+
+    check = get_filter(level, thread, pattern)
+    f = open(logFile, "rb")
+    try:
+        size = os.fstat(f.fileno()).st_size
+        pos = size if start in [None, ""] else get_offset(size, start)
+        pending = b""  # Partial line not yet terminated by a newline
+        while not redball.SHUTDOWN.is_set() and not (stop and stop()):
+            try:
+                st = os.stat(logFile)
+            except OSError:
+                st = None
+
+            rotated = st and (
+                st.st_size < pos
+                or (st.st_ino and st.st_ino != os.fstat(f.fileno()).st_ino)
+            )
+            f.seek(pos)
+            chunk = f.read(MAX_READ_BYTES)
+            data = pending + chunk
+            pos = f.tell()
+            if rotated and len(chunk) < MAX_READ_BYTES:
+                # Log was rotated and the rest of the old file is read, so switch
+                f.close()
+                f = open(logFile, "rb")
+                pos = 0
+                pending = b""
+                log.debug("Log file [{}] rotated, following new file.".format(logId))
+            else:
+                # Hold back a partial last line until it is complete
+                cut = data.rfind(b"\n") + 1
+                data, pending = data[:cut], data[cut:]
+
+            records = []
+            if data:
+                for offset, record in iter_records(io.BytesIO(data)):
+                    if not check or check(record):
+                        records.append(decode(record).splitlines())
+
+            if records:
+                yield {"end": pos - len(pending), "records": records}
+            elif not data:
+                yield None
+                redball.SHUTDOWN.wait(FOLLOW_INTERVAL)
+    finally:
+        f.close()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# Registry of counters, gauges and histograms, served in the Prometheus text
+# format at /metrics
+
+import bisect
+import functools
+import math
+import threading
+import time
+
+from redball import logger
+
+log = logger.get_logger(
+    logger_name="redball.metrics", log_level="DEBUG", propagate=True
+)
+
+REGISTRY_LOCK = threading.Lock()
+REGISTRY = {}  # name: metric, in the order registered
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric(object):
+    # Base class; values are kept per combination of label values
+    type = "untyped"
+
+    def __init__(self, name, description, labels=(), fn=None):
+        # fn = function returning the current value when metrics are collected,
+        # for values kept elsewhere: a number, or [({label: value}, number)]
+        self.name = name
+        self.description = description
+        self.labelNames = tuple(labels)
+        self.fn = fn
+        self.lock = threading.Lock()
+        self.values = {}  # (label values): value
+
+    def key(self, labels):
+        return tuple(str(labels.get(x, "")) for x in self.labelNames)
+
+    def samples(self):
+        # Return [(name suffix, {label: value}, value)]
+        if self.fn:
+            try:
+                value = self.fn()
+            except Exception as e:
+                log.debug("Error collecting metric {}: {}".format(self.name, e))
+                return []
+
+            if isinstance(value, list):
+                return [("", x, y) for x, y in value]
+
+            return [("", {}, value)]
+
+        with self.lock:
+            values = list(self.values.items())
+
+        return [("", dict(zip(self.labelNames, k)), v) for k, v in values]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        k = self.key(labels)
+        with self.lock:
+            self.values[k] = self.values.get(k, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        k = self.key(labels)
+        with self.lock:
+            self.values[k] = value
+
+    def inc(self, amount=1, **labels):
+        k = self.key(labels)
+        with self.lock:
+            self.values[k] = self.values.get(k, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, description, labels=(), buckets=None):
+        Metric.__init__(self, name, description, labels)
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+
+    def observe(self, value, **labels):
+        k = self.key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            v = self.values.get(k)
+            if not v:
+                # [count per bucket (the last is +Inf), sum, count]
+                v = self.values[k] = [[0] * (len(self.buckets) + 1), 0, 0]
+
+            v[0][i] += 1
+            v[1] += value
+            v[2] += 1
+
+    def time(self, **labels):
+        # with histogram.time(label=value): ...
+        return Timer(self, labels)
+
+    def samples(self):
+        with self.lock:
+            values = [(k, (list(v[0]), v[1], v[2])) for k, v in self.values.items()]
+
+        samples = []
+        for k, (counts, total, count) in values:
+            labels = dict(zip(self.labelNames, k))
+            cumulative = 0
+            for le, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                samples.append(("_bucket", dict(labels, le=le), cumulative))
+
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+
+        return samples
+
+
+class Timer(object):
+    # Observes the seconds spent in a with block
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def register(metric):
+    # Add metric to the registry, or return the one already registered by that name
+    with REGISTRY_LOCK:
+        existing = REGISTRY.get(metric.name)
+        if existing:
+            if existing.type != metric.type:
+                raise ValueError(
+                    "Metric {} is already registered as a {}.".format(
+                        metric.name, existing.type
+                    )
+                )
+
+            return existing
+
+        REGISTRY[metric.name] = metric
+        return metric
+
+
+def counter(name, description, labels=(), fn=None):
+    return register(Counter(name, description, labels, fn))
+
+
+def gauge(name, description, labels=(), fn=None):
+    return register(Gauge(name, description, labels, fn))
+
+
+def histogram(name, description, labels=(), buckets=None):
+    return register(Histogram(name, description, labels, buckets))
+
+
+def timed(metric, labels=None):
+    # Decorator observing the duration of each call in histogram metric
+    # labels = function taking the same arguments as the decorated function,
+    # and returning a dict of label values
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metric.time(**(labels(*args, **kwargs) if labels else {})):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+
+    if isinstance(value, int):
+        return str(value)
+
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    if math.isnan(value):
+        return "NaN"
+
+    return repr(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+
+    return "{{{}}}".format(
+        ",".join(
+            '{}="{}"'.format(
+                k,
+                (format_value(v) if k == "le" else str(v))
+                .replace("\\", "\\\\")
+                .replace("\n", "\\n")
+                .replace('"', '\\"'),
+            )
+            for k, v in labels.items()
+        )
+    )
+
+
+def render():
+    # Return all registered metrics in the Prometheus text exposition format
+    with REGISTRY_LOCK:
+        metrics = list(REGISTRY.values())
+
+    lines = []
+    for m in metrics:
+        lines.append(
+            "# HELP {} {}".format(
+                m.name, m.description.replace("\\", "\\\\").replace("\n", "\\n")
+            )
+        )
+        lines.append("# TYPE {} {}".format(m.name, m.type))
+        for suffix, labels, value in m.samples():
+            lines.append(
+                "{}{}{} {}".format(
+                    m.name, suffix, format_labels(labels), format_value(value)
+                )
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+# Metrics recorded by bots
+BOT_API_REQUESTS = counter(
+    "redball_bot_api_requests_total",
+    "Data API calls made by bots",
+    ("bot", "api", "endpoint", "result"),
+)
+BOT_API_SECONDS = histogram(
+    "redball_bot_api_seconds",
+    "Time spent in data API calls made by bots",
+    ("bot", "api", "endpoint"),
+)
+BOT_RENDER_SECONDS = histogram(
+    "redball_bot_render_seconds",
+    "Time spent rendering bot templates",
+    ("bot", "thread", "template"),
+)
+BOT_PREP_AND_POST_SECONDS = histogram(
+    "redball_bot_prep_and_post_seconds",
+    "Time spent collecting data, rendering and posting or updating a thread",
+    ("bot", "thread"),
+)
+BOT_RENDERS_SKIPPED = counter(
+    "redball_bot_renders_skipped_total",
+    "Template renders skipped because the data they depend on did not change",
+    ("bot", "thread"),
+)
+BOT_REDDIT_REQUESTS = counter(
+    "redball_bot_reddit_requests_total",
+    "Reddit submissions and edits made by bots",
+    ("bot", "action"),
+)
+
+
+class ApiTimer(object):
+    # Counts and times one data API call made by a bot:
+    # with metrics.ApiTimer(self.bot.id, "statsapi", endpoint): ...
+
+    def __init__(self, botId, api, endpoint):
+        self.labels = {"bot": botId, "api": api, "endpoint": endpoint}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, *args):
+        BOT_API_SECONDS.observe(time.perf_counter() - self.start, **self.labels)
+        BOT_API_REQUESTS.inc(result="error" if excType else "ok", **self.labels)
+        return False
+
+
+class TimedClient(object):
+    # Wraps a bot's data API client so each method call is counted and timed
+    # with ApiTimer, using the method name as the endpoint
+
+    def __init__(self, client, botId, api):
+        self._client = client
+        self._botId = botId
+        self._api = api
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            with ApiTimer(self._botId, self._api, name):
+                return attr(*args, **kwargs)
+
+        return call
+
+    def __setattr__(self, name, value):
+        # Attributes such as an updated token belong to the client
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._client, name, value)
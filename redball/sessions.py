@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# Web session storage kept in its own SQLite database, so users stay logged in
+# when redball restarts. Enabled with the Web/Security SESSION_STORE setting.
+
+import datetime
+import json
+import os
+import threading
+
+from cherrypy.lib import sessions as cpSessions
+
+import redball
+from redball import database, logger
+
+log = logger.get_logger(
+    logger_name="redball.sessions", log_level="DEBUG", propagate=True
+)
+
+SESSION_DB_FILE = "sessions.db"  # In DB_PATH, apart from redball.db so session writes don't wait on bots
+TOUCH_FRACTION = 0.1  # Extend a stored expiration when this much of the timeout has passed
+SESSION_TABLES = set()  # Session DB files with the table created
+SESSION_STATS_LOCK = threading.Lock()
+SESSION_STATS = {"loads": 0, "writes": 0, "skipped_writes": 0, "deletes": 0}
+
+
+def get_db_file():
+    return os.path.join(redball.DB_PATH, SESSION_DB_FILE)
+
+
+def session_qry(query, fetchone=False, commit=False):
+    dbFile = get_db_file()
+    con = database.get_con(logg=log, dbFile=dbFile)
+    if dbFile not in SESSION_TABLES:
+        database.db_qry(
+            "CREATE TABLE IF NOT EXISTS rb_sessions (id text PRIMARY KEY, data text NOT NULL, expires real NOT NULL);",
+            con=con,
+            commit=True,
+            logg=log,
+        )
+        SESSION_TABLES.add(dbFile)
+
+    return database.db_qry(
+        query, con=con, fetchone=fetchone, commit=commit, closeAfter=True, logg=log
+    )
+
+
+def count_stat(key):
+    with SESSION_STATS_LOCK:
+        SESSION_STATS[key] += 1
+
+
+def session_stats():
+    with SESSION_STATS_LOCK:
+        stats = {"cached": len(SqliteSession.cache)}
+        stats.update(SESSION_STATS)
+
+    return stats
+
+
+class SqliteSession(cpSessions.Session):
+    # Sessions are read from the DB once and cached in memory, and locked per
+    # session in memory (as with RamSession) rather than with lock files.
+    # The DB is only written when session data changes, or to extend the stored
+    # expiration once TOUCH_FRACTION of the timeout has passed.
+
+    # Class-level objects. Don't rebind these!
+    cache = {}  # id: (data as json, expiration_time, stored expiration_time)
+    locks = {}
+    locksLock = threading.Lock()
+
+    def clean_up(self):
+        """Clean up expired sessions."""
+        now = self.now()
+        for _id, (data, expiration_time, stored) in self.cache.copy().items():
+            if expiration_time <= now:
+                self.cache.pop(_id, None)
+
+        with self.locksLock:
+            for _id in list(self.locks):
+                if _id not in self.cache and self.locks[_id].acquire(blocking=False):
+                    self.locks.pop(_id).release()
+
+        session_qry(
+            ("DELETE FROM rb_sessions WHERE expires <= ?;", (now.timestamp(),)),
+            commit=True,
+        )
+
+    def _get(self):
+        c = self.cache.get(self.id)
+        if c is None:
+            row = session_qry(
+                ("SELECT data, expires FROM rb_sessions WHERE id = ?;", (self.id,)),
+                fetchone=True,
+            )
+            if not isinstance(row, dict):
+                return None
+
+            expiration_time = datetime.datetime.fromtimestamp(row["expires"])
+            c = self.cache[self.id] = (row["data"], expiration_time, expiration_time)
+            count_stat("loads")
+
+        return c
+
+    def _exists(self):
+        c = self._get()
+        return c is not None and c[1] > self.now()
+
+    def _load(self):
+        c = self._get()
+        if c is None:
+            return None
+
+        return (json.loads(c[0]), c[1])
+
+    def _save(self, expiration_time):
+        data = json.dumps(self._data, sort_keys=True)
+        c = self.cache.get(self.id)
+        touchAfter = datetime.timedelta(seconds=self.timeout * 60 * TOUCH_FRACTION)
+        if c and c[0] == data and c[2] + touchAfter > expiration_time:
+            # Nothing worth writing, keep the new expiration in memory
+            self.cache[self.id] = (data, expiration_time, c[2])
+            count_stat("skipped_writes")
+            return
+
+        self.cache[self.id] = (data, expiration_time, expiration_time)
+        session_qry(
+            (
+                "INSERT OR REPLACE INTO rb_sessions (id, data, expires) VALUES (?, ?, ?);",
+                (self.id, data, expiration_time.timestamp()),
+            ),
+            commit=True,
+        )
+        count_stat("writes")
+
+    def _delete(self):
+        self.cache.pop(self.id, None)
+        session_qry(("DELETE FROM rb_sessions WHERE id = ?;", (self.id,)), commit=True)
+        count_stat("deletes")
+
+    def acquire_lock(self):
+        """Acquire an exclusive lock on the currently-loaded session data."""
+        self.locked = True
+        with self.locksLock:
+            lock = self.locks.setdefault(self.id, threading.RLock())
+
+        lock.acquire()
+
+    def release_lock(self):
+        """Release the lock on the currently-loaded session data."""
+        self.locks[self.id].release()
+        self.locked = False
+
+    def __len__(self):
+        """Return the number of active sessions."""
+        return len(self.cache)
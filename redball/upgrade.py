@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from redball import database, logger
+from redball import config, database, logger
 import time
 
 log = logger.get_logger(
@@ -42,14 +42,33 @@ def upgrade_database(toVer=None):
                 )
             )
             if len(upgradeScripts.get(fromVer + 1, [])) > 0:
-                results = database.db_qry(
-                    query=upgradeScripts[fromVer + 1],
-                    con=con,
-                    cur=cur,
-                    commit=False,
-                    closeAfter=False,
-                    logg=log,
-                )
+                results = []
+                for script in upgradeScripts[fromVer + 1]:
+                    if isinstance(script, tuple) and isinstance(script[1], list):
+                        # (query, [args, args, ...]) runs the query for each set of args
+                        results.append(
+                            database.db_qry_many(
+                                script[0],
+                                script[1],
+                                con=con,
+                                cur=cur,
+                                commit=False,
+                                closeAfter=False,
+                                logg=log,
+                            )
+                        )
+                    else:
+                        results.append(
+                            database.db_qry(
+                                query=script,
+                                con=con,
+                                cur=cur,
+                                commit=False,
+                                closeAfter=False,
+                                logg=log,
+                            )
+                        )
+
                 if None in results:
                     log.error(
                         "One or more database upgrade queries failed: {}".format(
@@ -57,6 +76,7 @@ def upgrade_database(toVer=None):
                         )
                     )
                     # Upgrade scripts failed. Do not commit and do not continue.
+                    con.close()
                     return False
                 else:
                     con.commit()
@@ -83,10 +103,14 @@ def upgrade_database(toVer=None):
             )
 
         con.close()
+        # Upgrade scripts may have added or changed config
+        config.clear_config_cache()
         log.debug("Database upgrade process is complete.")
         return True
 
 
+# Each version's scripts run in a single transaction. A script can be a query,
+# a (query, args) tuple, or a (query, [args, args, ...]) tuple for bulk inserts/updates
 upgradeScripts = {
     1: [
         "UPDATE rb_meta SET val='1', lastUpdate='{}' WHERE key='dbVersion';".format(
@@ -461,4 +485,70 @@ upgradeScripts = {
             time.time()
         ),
     ],
+    16: [
+        # Add system config settings: category: Web/Security, keys: PASSWORD_ITERATIONS, AUTH_CACHE_SECONDS
+        """INSERT OR IGNORE INTO rb_config (category, key, description, type, val, options, subkeys, parent_key, read_only)
+            VALUES
+                ('Web/Security', 'PASSWORD_ITERATIONS', 'PBKDF2 iterations for password hashes (existing passwords are updated at next login)', 'int', 100000, '[]', '[]', '', 'False'),
+                ('Web/Security', 'AUTH_CACHE_SECONDS', 'Cache verified basic auth credentials and API keys for N seconds (0 to disable)', 'int', 60, '[]', '[]', '', 'False')
+        ;""",
+        # Update DB version to 16
+        "UPDATE rb_meta SET val='16', lastUpdate='{}' WHERE key='dbVersion';".format(
+            time.time()
+        ),
+    ],
+    17: [
+        # Add system config settings: category: Logging, keys: LOG_QUEUE, LOG_QUEUE_SIZE, LOG_QUEUE_OVERFLOW
+        """INSERT OR IGNORE INTO rb_config (category, key, description, type, val, options, subkeys, parent_key, read_only)
+            VALUES
+                ('Logging', 'LOG_QUEUE', 'Write logs from a background thread instead of the thread doing the logging', 'bool', 'true', '[true, false]', '["LOG_QUEUE_SIZE","LOG_QUEUE_OVERFLOW"]', '', 'False'),
+                ('Logging', 'LOG_QUEUE_SIZE', 'Most log records waiting to be written for each log file', 'int', 10000, '[]', '[]', 'LOG_QUEUE', 'False'),
+                ('Logging', 'LOG_QUEUE_OVERFLOW', 'When the queue is full: drop DEBUG records first (drop_debug) or wait for room (block)', 'str', '"drop_debug"', '["drop_debug","block"]', '[]', 'LOG_QUEUE', 'False')
+        ;""",
+        # Update DB version to 17
+        "UPDATE rb_meta SET val='17', lastUpdate='{}' WHERE key='dbVersion';".format(
+            time.time()
+        ),
+    ],
+    18: [
+        # Add system config settings: category: Logging, keys: LOG_FORMAT, LOG_RATE_LIMIT, LOG_RATE_INTERVAL
+        """INSERT OR IGNORE INTO rb_config (category, key, description, type, val, options, subkeys, parent_key, read_only)
+            VALUES
+                ('Logging', 'LOG_FORMAT', 'Log file and console format: text, or json (one JSON object per line with time, level, thread, botId, gamePk, event, and msg fields)', 'str', '"text"', '["text","json"]', '[]', '', 'False'),
+                ('Logging', 'LOG_RATE_LIMIT', 'Most DEBUG/INFO records with the same message written per LOG_RATE_INTERVAL seconds from each logger (0 for no limit)', 'int', 0, '[]', '["LOG_RATE_INTERVAL"]', '', 'False'),
+                ('Logging', 'LOG_RATE_INTERVAL', 'Seconds covered by LOG_RATE_LIMIT', 'int', 60, '[]', '[]', 'LOG_RATE_LIMIT', 'False')
+        ;""",
+        # Update DB version to 18
+        "UPDATE rb_meta SET val='18', lastUpdate='{}' WHERE key='dbVersion';".format(
+            time.time()
+        ),
+    ],
+    19: [
+        # Add system config settings: category: Web/Security, keys: WEB_THREAD_POOL, WEB_THREAD_POOL_MAX, WEB_SOCKET_QUEUE_SIZE, WEB_SOCKET_TIMEOUT, WEB_KEEPALIVE_CONNECTIONS, WEB_GZIP, WEB_STATIC_CACHE_SECONDS
+        """INSERT OR IGNORE INTO rb_config (category, key, description, type, val, options, subkeys, parent_key, read_only)
+            VALUES
+                ('Web/Security', 'WEB_THREAD_POOL', 'Web server worker threads', 'int', 10, '[]', '["WEB_THREAD_POOL_MAX"]', '', 'False'),
+                ('Web/Security', 'WEB_THREAD_POOL_MAX', 'Most web server worker threads when all are busy, shrinking back to WEB_THREAD_POOL when idle (-1 for no limit)', 'int', 30, '[]', '[]', 'WEB_THREAD_POOL', 'False'),
+                ('Web/Security', 'WEB_SOCKET_QUEUE_SIZE', 'Connections waiting to be accepted by the web server', 'int', 20, '[]', '[]', '', 'False'),
+                ('Web/Security', 'WEB_SOCKET_TIMEOUT', 'Seconds to wait for a web client to send a request, including between requests on a kept-alive connection', 'int', 10, '[]', '[]', '', 'False'),
+                ('Web/Security', 'WEB_KEEPALIVE_CONNECTIONS', 'Most idle keep-alive web connections kept open (0 to close connections after each response)', 'int', 10, '[]', '[]', '', 'False'),
+                ('Web/Security', 'WEB_GZIP', 'Compress HTML, JSON, CSS and text responses for clients that accept gzip', 'bool', 'true', '[true, false]', '[]', '', 'False'),
+                ('Web/Security', 'WEB_STATIC_CACHE_SECONDS', 'Seconds browsers may cache stylesheets and images (0 to disable)', 'int', 86400, '[]', '[]', '', 'False')
+        ;""",
+        # Update DB version to 19
+        "UPDATE rb_meta SET val='19', lastUpdate='{}' WHERE key='dbVersion';".format(
+            time.time()
+        ),
+    ],
+    20: [
+        # Add system config setting: category: Web/Security, key: SESSION_STORE
+        """INSERT OR IGNORE INTO rb_config (category, key, description, type, val, options, subkeys, parent_key, read_only)
+            VALUES
+                ('Web/Security', 'SESSION_STORE', 'Where web sessions are stored (SQLite keeps users logged in when redball restarts)', 'str', '"RAM"', '["RAM", "SQLite"]', '[]', '', 'False')
+        ;""",
+        # Update DB version to 20
+        "UPDATE rb_meta SET val='20', lastUpdate='{}' WHERE key='dbVersion';".format(
+            time.time()
+        ),
+    ],
 }
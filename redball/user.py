@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 
 import binascii
-from datetime import datetime, timedelta
 import hashlib
+import hmac
 import json
 import os
+import threading
 import time
 
 import redball
@@ -13,28 +14,177 @@ from redball import config, database, logger
 log = logger.get_logger(logger_name="redball.user", log_level="DEBUG", propagate=True)
 
 
-def hash_password(pw, salt=None):
+PBKDF2_ITERATIONS = 100000  # Default, and cost of hashes stored without a prefix
+HASH_PREFIX = "pbkdf2_sha512"
+AUTH_CACHE_LOCK = threading.Lock()
+AUTH_CACHE = {}  # keyed hash of credentials: {"expires": timestamp, "user": user info}
+AUTH_CACHE_MAX = 256
+AUTH_CACHE_KEY = os.urandom(32)  # Cache keys are not reusable outside this process
+AUTH_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def get_security_setting(key, default):
+    c = config.get_sys_config(category="Web/Security", key=key)
+    if isinstance(c, list) and len(c) and c[0]["val"] not in [None, ""]:
+        return c[0]["val"]
+
+    return default
+
+
+def password_iterations():
+    # Configured iteration count, or the default if the setting is not usable
+    try:
+        iterations = int(get_security_setting("PASSWORD_ITERATIONS", PBKDF2_ITERATIONS))
+    except (TypeError, ValueError):
+        iterations = 0
+
+    if iterations < 1:
+        log.warning(
+            "Invalid PASSWORD_ITERATIONS setting. Using the default ({}).".format(
+                PBKDF2_ITERATIONS
+            )
+        )
+        return PBKDF2_ITERATIONS
+
+    return iterations
+
+
+def hash_password(pw, salt=None, iterations=None):
     # Much of this came from https://www.vitoshacademy.com/hashing-passwords-in-python/
-    salt = (
-        hashlib.sha256(os.urandom(60)).hexdigest().encode("ascii")
-        if not salt
-        else salt.encode("ascii")
-    )
-    pwHash = binascii.hexlify(
-        hashlib.pbkdf2_hmac("sha512", pw.encode("utf-8"), salt, 100000)
+    # Returns pbkdf2_sha512$<iterations>$<salt><hash>
+    iterations = int(iterations if iterations else password_iterations())
+    salt = salt if salt else hashlib.sha256(os.urandom(60)).hexdigest()
+    return "{}${}${}{}".format(
+        HASH_PREFIX, iterations, salt, pbkdf2_hex(pw, salt, iterations)
     )
-    return (salt + pwHash).decode("ascii")
+
+
+def pbkdf2_hex(pw, salt, iterations):
+    return binascii.hexlify(
+        hashlib.pbkdf2_hmac(
+            "sha512", pw.encode("utf-8"), salt.encode("ascii"), iterations
+        )
+    ).decode("ascii")
+
+
+def parse_password_hash(hash):
+    # Return (iterations, salt, hash) from a stored password hash
+    if hash.startswith(HASH_PREFIX + "$"):
+        (_, iterations, hash) = hash.split("$", 2)
+        return (int(iterations), hash[:64], hash[64:])
+
+    # Hash created before the iteration count was stored
+    return (PBKDF2_ITERATIONS, hash[:64], hash[64:])
 
 
 def check_password(pw, hash):
-    return hash_password(pw, hash[:64]) == hash
+    if not hash:
+        return False
+
+    try:
+        (iterations, salt, pwHash) = parse_password_hash(hash)
+    except ValueError:
+        log.error("Invalid password hash format.")
+        return False
+
+    return hmac.compare_digest(pbkdf2_hex(pw, salt, iterations), pwHash)
+
+
+def password_needs_rehash(hash):
+    # True if the hash was created with a different iteration count than configured
+    return parse_password_hash(hash)[0] != password_iterations()
+
+
+def rehash_password(uid, pw, hash):
+    # Store the password with the configured iteration count
+    # pw must already be verified against hash
+    # Errors are logged, not raised, so they can't fail the login
+    try:
+        if not password_needs_rehash(hash):
+            return
+
+        log.debug("Updating password hash for user id {}.".format(uid))
+        database.db_qry(
+            ("UPDATE rb_users SET password=? WHERE id=?;", (hash_password(pw), uid)),
+            commit=True,
+            closeAfter=True,
+            logg=log,
+        )
+    except Exception as e:
+        log.error("Error updating password hash for user id {}: {}".format(uid, e))
+
+
+def auth_cache_key(*args):
+    return hmac.new(
+        AUTH_CACHE_KEY, "\0".join(str(x) for x in args).encode("utf-8"), "sha256"
+    ).digest()
+
+
+def check_auth_cache(cacheKey, userid=None):
+    # Return copy of cached user info for the credentials, or None if not cached
+    # userid = required userid (for Basic auth)
+    ttl = int(get_security_setting("AUTH_CACHE_SECONDS", 60))
+    if ttl <= 0:
+        return None
+
+    with AUTH_CACHE_LOCK:
+        c = AUTH_CACHE.get(cacheKey)
+        if (
+            c
+            and c["expires"] > time.time()
+            and (not userid or c["user"]["userid"] == userid)
+        ):
+            AUTH_CACHE_STATS["hits"] += 1
+            return dict(c["user"])
+
+        AUTH_CACHE_STATS["misses"] += 1
+        return None
+
+
+def add_auth_cache(cacheKey, u):
+    # u = user info
+    ttl = int(get_security_setting("AUTH_CACHE_SECONDS", 60))
+    if ttl <= 0:
+        return
+
+    now = time.time()
+    with AUTH_CACHE_LOCK:
+        if len(AUTH_CACHE) >= AUTH_CACHE_MAX:
+            for k in [k for k, v in AUTH_CACHE.items() if v["expires"] <= now]:
+                AUTH_CACHE.pop(k)
+
+        while len(AUTH_CACHE) >= AUTH_CACHE_MAX:
+            # Evict oldest
+            AUTH_CACHE.pop(next(iter(AUTH_CACHE)))
+            AUTH_CACHE_STATS["evictions"] += 1
+
+        AUTH_CACHE.update({cacheKey: {"expires": now + ttl, "user": dict(u)}})
+
+
+def clear_auth_cache():
+    # Call when passwords, API keys, or users change
+    with AUTH_CACHE_LOCK:
+        AUTH_CACHE.clear()
+
+
+def auth_cache_stats():
+    with AUTH_CACHE_LOCK:
+        stats = {"size": len(AUTH_CACHE)}
+        stats.update(AUTH_CACHE_STATS)
+
+    return stats
 
 
 def validate_password(realm, username, password):
     """This method is used for basic authentication
     """
-    hash = get_user_info(userid=username, field="password")
-    if check_password(password, hash):
+    cacheKey = auth_cache_key("basic", username, password)
+    if check_auth_cache(cacheKey, userid=username):
+        # Credentials were verified recently
+        return True
+
+    u = get_user_info(userid=username)
+    if check_password(password, u.get("password")):
         log.debug(
             "User {} successfully authenticated for access to the web UI.".format(
                 username
@@ -48,9 +198,28 @@ def validate_password(realm, username, password):
             )
             return False
         else:
+            rehash_password(u["id"], password, u["password"])
+            add_auth_cache(cacheKey, u)
             return True
 
 
+def get_apikey_user(apikey):
+    # Return dict of user info for the API key, or empty dict if not found
+    if apikey in ["", None]:
+        return {}
+
+    cacheKey = auth_cache_key("apikey", apikey)
+    u = check_auth_cache(cacheKey)
+    if u and hmac.compare_digest(u.get("apikey") or "", apikey):
+        return u
+
+    u = get_user_info(apikey=apikey)
+    if u.get("userid"):
+        add_auth_cache(cacheKey, u)
+
+    return u
+
+
 def get_user_info(userid=None, apikey=None, uid=None, field=None, sensitive=True):
     # userid = rb_users.userid
     # apikey = rb_users.apikey
@@ -100,9 +269,6 @@ def get_user_info(userid=None, apikey=None, uid=None, field=None, sensitive=True
 
 
 def create_user(**kwargs):
-    con = database.get_con()
-    cur = database.get_cur(con)
-
     if kwargs.get("userid") in [None, ""]:
         return "User ID cannot be blank."
     elif kwargs.get("password") and kwargs["password"] != kwargs.get(
@@ -134,6 +300,8 @@ def create_user(**kwargs):
             time.time(),
         ),
     )
+    con = database.get_con()
+    cur = database.get_cur(con)
     result = database.db_qry(query, con=con, cur=cur)
     if isinstance(result, str) and result.find("ERROR") != -1:
         con.commit()
@@ -205,6 +373,8 @@ def update_user(id, **kwargs):
 
     query = (q, local_args)
     result = database.db_qry(query, commit=True, closeAfter=True)
+    clear_auth_cache()
+    clear_identity()
     if isinstance(result, str):
         return result
     else:
@@ -214,25 +384,165 @@ def update_user(id, **kwargs):
 def delete_user(id):
     query = ("DELETE FROM rb_users WHERE id=?;", (id,))
     result = database.db_qry(query, commit=True, closeAfter=True)
+    clear_auth_cache()
+    clear_identity()
     return result
 
 
-def refresh_user_privileges(userid):
-    # userid = rb_users.userid
-    if userid in ["", "None"] or userid not in redball.LOGGED_IN_USERS.keys():
-        log.warning(
-            "Can't refresh privileges because user appears to not be logged in: [{}]".format(
-                userid
-            )
-        )
-        return
+IDENTITY_LOCK = threading.Lock()
+IDENTITIES = {}  # userid: {"user", "PRIVS", "index", "privDate", "lastSeen"}
+IDENTITY_STATS = {"hits": 0, "loads": 0, "evictions": 0}
+
+
+def identity_ttl():
+    # Identities not used for SESSION_TIMEOUT hours are evicted, like their sessions
+    return int(get_security_setting("SESSION_TIMEOUT", 4)) * 3600
+
+
+def load_identity(userid, u=None):
+    # Read user info and privileges into the identity cache
+    # u = user info already read from the DB (e.g. by get_apikey_user)
+    # return the cached identity, or None if the user does not exist
+    if u is None:
+        u = get_user_info(userid=userid)
 
-    redball.LOGGED_IN_USERS[userid].update(
-        {
-            "PRIVS": json.loads(get_user_info(userid=userid).get("privileges", "[]")),
-            "privDate": time.time(),
+    if not u or not u.get("userid"):
+        with IDENTITY_LOCK:
+            IDENTITIES.pop(userid, None)
+
+        return None
+
+    privs = u.get("privileges") or "[]"
+    privs = json.loads(privs) if isinstance(privs, str) else list(privs)
+    now = time.time()
+    with IDENTITY_LOCK:
+        old = IDENTITIES.get(userid, {})
+        if privs == old.get("PRIVS"):
+            # Keep the same list so the privilege index is not rebuilt
+            privs = old["PRIVS"]
+
+        identity = {
+            "user": {k: v for k, v in u.items() if k not in ["password", "apikey"]},
+            "PRIVS": privs,
+            "index": old.get("index") if privs is old.get("PRIVS") else None,
+            "privDate": now,
+            "lastSeen": now,
         }
-    )
+        IDENTITIES.update({userid: identity})
+        IDENTITY_STATS["loads"] += 1
+
+    return identity
+
+
+def get_identity(userid, refresh=False):
+    # Return cached user info and privileges for userid, loading them from the DB
+    # if not cached (e.g. for a session restored after a restart), or refresh = True,
+    # or they were loaded more than AUTH_CACHE_SECONDS ago
+    # return None if the user does not exist
+    if userid in ["", "None", None]:
+        return None
+
+    now = time.time()
+    ttl = identity_ttl()
+    maxAge = int(get_security_setting("AUTH_CACHE_SECONDS", 60))
+    with IDENTITY_LOCK:
+        for k in [k for k, v in IDENTITIES.items() if v["lastSeen"] + ttl <= now]:
+            IDENTITIES.pop(k)
+            IDENTITY_STATS["evictions"] += 1
+
+        identity = IDENTITIES.get(userid)
+        if identity and not refresh and identity["privDate"] + maxAge > now:
+            identity["lastSeen"] = now
+            IDENTITY_STATS["hits"] += 1
+            return identity
+
+    log.debug("Loading user info and privileges for [{}]...".format(userid))
+    return load_identity(userid)
+
+
+def get_identity_privileges(userid):
+    # Return the cached privilege list for userid, without reading the DB
+    with IDENTITY_LOCK:
+        return list(IDENTITIES.get(userid, {}).get("PRIVS", []))
+
+
+def clear_identity(userid=None):
+    # Drop cached user info and privileges for userid, or all users,
+    # so they are read from the DB when next used.
+    # Call when users are changed or privileges are granted/revoked
+    with IDENTITY_LOCK:
+        if userid:
+            IDENTITIES.pop(userid, None)
+        else:
+            IDENTITIES.clear()
+
+
+def identity_cache_stats():
+    with IDENTITY_LOCK:
+        stats = {"size": len(IDENTITIES)}
+        stats.update(IDENTITY_STATS)
+
+    return stats
+
+
+def clear_privilege_index(userid=None):
+    # Call when bots are added/removed, since rb_bot_all_* depends on the bot list
+    with IDENTITY_LOCK:
+        for k, v in IDENTITIES.items():
+            if not userid or k == userid:
+                v["index"] = None
+
+
+def build_privilege_index(privs):
+    # Expand privileges into the full set they grant, so checks are set lookups
+    # own = privileges held directly, including rw => startstop => ro
+    # all = own plus rb_bot_all_* held by having the privilege for each bot
+    if isinstance(privs, str):
+        privs = json.loads(privs) if privs else []
+
+    own = set(privs)
+    for p in privs:
+        if p[-2:] == "rw":
+            own.update([p[:-2] + "startstop", p[:-2] + "ro"])
+        elif p[-9:] == "startstop":
+            own.add(p[:-9] + "ro")
+
+    allPrivs = set(own)
+    botIds = [str(b.id) for b in list(redball.BOTS.values())]
+    if len(botIds):
+        prefix = "rb_bot_{}".format(botIds[0])
+        for suffix in [p[len(prefix) :] for p in own if p.startswith(prefix + "_")]:
+            if all("rb_bot_{}{}".format(x, suffix) in own for x in botIds):
+                allPrivs.add("rb_bot_all" + suffix)
+
+    return {"own": own, "all": allPrivs}
+
+
+def get_privilege_index(identity):
+    index = identity.get("index")
+    if not index:
+        index = identity["index"] = build_privilege_index(identity["PRIVS"])
+
+    return index
+
+
+def grant_privilege(userid, privilege):
+    # Add privilege to the user's privileges in rb_users
+    privs = json.loads(get_user_info(userid=userid, field="privileges"))
+    if privilege not in privs:
+        privs.append(privilege)
+        database.db_qry(
+            (
+                "UPDATE rb_users SET privileges = ? WHERE userid=?;",
+                (json.dumps(privs), userid),
+            ),
+            commit=True,
+            closeAfter=True,
+            logg=log,
+        )
+
+    clear_auth_cache()
+    clear_identity(userid)
 
 
 def check_privilege(userid, privilege, refresh=False, checkAll=True):
@@ -252,66 +562,38 @@ def check_privilege(userid, privilege, refresh=False, checkAll=True):
     if userid is None or privilege in ["", None]:
         return False
 
-    if (
-        refresh
-        or not redball.LOGGED_IN_USERS.get(userid, {}).get("PRIVS")
-        or datetime.fromtimestamp(
-            redball.LOGGED_IN_USERS.get(userid, {}).get("privDate")
-        )
-        <= datetime.today() - timedelta(seconds=3)
-    ):
-        log.debug("Refreshing privileges...")
-        refresh_user_privileges(userid)
+    identity = get_identity(userid, refresh=refresh)
+    if not identity:
+        return False
 
     log.debug("checking user {} privilege: {}".format(userid, privilege))  # debug
-    if privilege in redball.LOGGED_IN_USERS[userid]["PRIVS"]:
-        # User has the exact privilege required
-        return True
-    elif (
-        (
-            privilege[-2:] == "ro"
-            and privilege[:-2] + "rw" in redball.LOGGED_IN_USERS[userid]["PRIVS"]
-        )
-        or (
-            privilege[-2:] == "ro"
-            and privilege[:-2] + "startstop" in redball.LOGGED_IN_USERS[userid]["PRIVS"]
-        )
-        or (
-            privilege[-9:] == "startstop"
-            and privilege[:-9] + "rw" in redball.LOGGED_IN_USERS[userid]["PRIVS"]
-        )
-    ):
-        # User has the read-write privilege for the object
-        # where read-only or startstop privilege is required
-        # or user has startstop privilege where read-only is required
+    index = get_privilege_index(identity)
+    if privilege in index["own"]:
+        # User has the exact privilege required, or one that includes it
+        # e.g. rb_bot_1_rw where rb_bot_1_ro is required
         return True
     elif (
         checkAll
         and privilege.startswith("rb_bot_")
         and "all" not in privilege
         and "create" not in privilege
-        and check_privilege(
-            userid, "rb_bot_all" + privilege[7 + privilege[7:].find("_") :]
-        )
+        and "rb_bot_all" + privilege[7 + privilege[7:].find("_") :] in index["all"]
     ):
         # User has required privilege for all bots, including the required bot
         return True
-    elif privilege.startswith("rb_bot_all") and sum(
-        1
-        for x in redball.BOTS.keys()
-        if check_privilege(
-            userid,
-            "rb_bot_{}{}".format(redball.BOTS[x].id, privilege[10:]),
-            checkAll=False,
-        )
-    ) == len(redball.BOTS.keys()):
+    elif privilege.startswith("rb_bot_all") and privilege in index["all"]:
         # User has required privilege for all bots individually
         # which satisfies the requirement for bot_all
         return True
     elif (
-        privilege not in ["rb_api", "rb_web"]
-        and "rb_admin" in redball.LOGGED_IN_USERS[userid]["PRIVS"]
+        not len(redball.BOTS)
+        and privilege.startswith("rb_bot_")
+        and "create" not in privilege
+        and (checkAll or privilege.startswith("rb_bot_all"))
     ):
+        # No bots, so the user has the privilege for all of them
+        return True
+    elif privilege not in ["rb_api", "rb_web"] and "rb_admin" in index["own"]:
         # User has admin privilege which gives full access to all
         # except api and web UI which must be allowed separately
         return True
@@ -323,11 +605,6 @@ def remove_privilege(privilege):
     # privilege = rb_privilege.privilege
     # Removes the privilege from all users
 
-    # Remove from redball.LOGGED_IN_USERS[x]['PRIVS']
-    for x in redball.LOGGED_IN_USERS:
-        if privilege in x:
-            x.pop(x.index(privilege))
-
     # Remove from rb_users.privileges
     con = database.get_con()
     cur = database.get_cur(con)
@@ -354,6 +631,9 @@ def remove_privilege(privilege):
     else:
         con.close()
 
+    clear_auth_cache()
+    clear_identity()
+
 
 def get_privileges():
     # Return list of privileges from rb_privileges
@@ -4,6 +4,7 @@ import cherrypy
 import json
 import os
 import sys
+import threading
 import time
 import traceback
 import urllib.parse
@@ -13,17 +14,332 @@ from mako.lookup import TemplateLookup
 from mako import exceptions
 
 import redball
-from redball import bot, config as rbConfig, database, logger, user
+from redball import (
+    apicache,
+    bot,
+    config as rbConfig,
+    database,
+    logger,
+    logreader,
+    metrics,
+    sessions,
+    user,
+)
 
 log = logger.get_logger(
     logger_name="redball.webserver", log_level="DEBUG", propagate=True
 )
 
 
+TEMPLATE_LOOKUP = None
+TEMPLATE_LOOKUP_LOCK = threading.Lock()
+RENDER_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]  # Seconds
+RENDER_STATS_LOCK = threading.Lock()
+RENDER_STATS = {}  # templateName: {"count", "sum", "max", "buckets": {le: count}}
+EVENT_STREAM_MAX = 26  # Open status streams allowed at once (-1 for no limit)
+EVENT_STREAM_SPARE = 4  # Server threads left for other requests when streams are open
+EVENT_STREAM_HEARTBEAT = 15  # Seconds between keepalive comments on an idle stream
+EVENT_STREAM_TIMEOUT = 300  # Seconds before a stream is closed for the browser to reconnect
+EVENT_STREAM_RETRY = 3  # Seconds the browser should wait before reconnecting
+EVENT_STREAMS_LOCK = threading.Lock()
+EVENT_STREAMS = {"open": 0, "total": 0, "rejected": 0, "events": 0}
+WEB_POOL_CHECK_INTERVAL = 2  # Seconds between checks to grow or shrink the thread pools
+WEB_POOL_SPARE = 2  # Idle worker threads kept above WEB_THREAD_POOL before shrinking
+WEB_POOL_MONITOR = None
+GZIP_MIME_TYPES = [
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/javascript",
+    "text/json",
+    "application/json",
+    "application/javascript",
+]
+
+REQUESTS = metrics.counter(
+    "redball_web_requests_total",
+    "Web UI and API requests",
+    ("handler", "method", "status"),
+)
+REQUEST_SECONDS = metrics.histogram(
+    "redball_web_request_seconds",
+    "Time spent handling web UI and API requests (not including streams)",
+    ("handler",),
+)
+RENDER_SECONDS = metrics.histogram(
+    "redball_web_render_seconds",
+    "Time spent rendering web templates",
+    ("template",),
+    buckets=RENDER_BUCKETS,
+)
+metrics.gauge(
+    "redball_web_event_streams",
+    "Open status and log streams",
+    fn=lambda: event_stream_stats()["open"],
+)
+metrics.gauge(
+    "redball_log_queue_depth",
+    "Records waiting to be written, per log file",
+    ("destination",),
+    fn=lambda: [
+        ({"destination": k}, v["depth"]) for k, v in logger.queue_stats().items()
+    ],
+)
+metrics.counter(
+    "redball_log_records_dropped_total",
+    "Log records dropped because the queue was full, per log file",
+    ("destination",),
+    fn=lambda: [
+        ({"destination": k}, v["dropped"]) for k, v in logger.queue_stats().items()
+    ],
+)
+
+
+def get_template_lookup():
+    # Templates are compiled once per process (and cached on disk across restarts),
+    # and recompiled when the template file changes
+    global TEMPLATE_LOOKUP
+    with TEMPLATE_LOOKUP_LOCK:
+        if not TEMPLATE_LOOKUP:
+            moduleDir = os.path.join(redball.DB_PATH, "cache", "templates")
+            try:
+                os.makedirs(moduleDir, exist_ok=True)
+            except OSError as e:
+                log.warning(
+                    "Unable to create template cache directory [{}], templates will be compiled in memory: {}".format(
+                        moduleDir, e
+                    )
+                )
+                moduleDir = None
+
+            TEMPLATE_LOOKUP = TemplateLookup(
+                directories=[redball.TEMPLATE_PATH],
+                module_directory=moduleDir,
+                filesystem_checks=True,
+            )
+
+    return TEMPLATE_LOOKUP
+
+
+def log_render_time(templateName, t):
+    RENDER_SECONDS.observe(t, template=templateName)
+    with RENDER_STATS_LOCK:
+        stats = RENDER_STATS.get(templateName)
+        if not stats:
+            stats = {
+                "count": 0,
+                "sum": 0,
+                "max": 0,
+                "buckets": {str(x): 0 for x in RENDER_BUCKETS + ["+Inf"]},
+            }
+            RENDER_STATS.update({templateName: stats})
+
+        stats["count"] += 1
+        stats["sum"] += t
+        stats["max"] = max(stats["max"], t)
+        # Buckets are cumulative: count of renders that took <= le seconds
+        for le in RENDER_BUCKETS:
+            if t <= le:
+                stats["buckets"][str(le)] += 1
+
+        stats["buckets"]["+Inf"] += 1
+
+
+def acquire_event_stream():
+    with EVENT_STREAMS_LOCK:
+        if EVENT_STREAM_MAX >= 0 and EVENT_STREAMS["open"] >= EVENT_STREAM_MAX:
+            EVENT_STREAMS["rejected"] += 1
+            return False
+
+        EVENT_STREAMS["open"] += 1
+        EVENT_STREAMS["total"] += 1
+        return True
+
+
+def release_event_stream():
+    with EVENT_STREAMS_LOCK:
+        EVENT_STREAMS["open"] -= 1
+
+
+def open_event_stream():
+    # Reserve a stream for the current request, released when the request ends,
+    # even if the response generator never runs (HEAD, client gone, errors)
+    if not acquire_event_stream():
+        return False
+
+    cherrypy.request.hooks.attach("on_end_request", release_event_stream)
+    return True
+
+
+def event_stream_stats():
+    with EVENT_STREAMS_LOCK:
+        stats = dict(EVENT_STREAMS)
+
+    stats.update({"max": EVENT_STREAM_MAX})
+    return stats
+
+
+def start_request_timer():
+    # Count and time each request once the response is sent
+    cherrypy.request.rbStart = time.perf_counter()
+    cherrypy.request.hooks.attach("on_end_request", record_request)
+
+
+def record_request():
+    request = cherrypy.request
+    response = cherrypy.response
+    status = str(response.status or 200)[:3]
+    if status == "404":
+        # Don't create a series for every path that doesn't exist
+        handler = "other"
+    else:
+        # Mount point and first path segment, e.g. /api/v1/bots or /logdata
+        handler = (
+            "{}/{}".format(
+                request.script_name, request.path_info.lstrip("/").split("/", 1)[0]
+            ).rstrip("/")
+            or "/"
+        )
+
+    REQUESTS.inc(handler=handler, method=request.method, status=status)
+    if not response.stream:
+        # Streams stay open until the client leaves
+        REQUEST_SECONDS.observe(time.perf_counter() - request.rbStart, handler=handler)
+
+
+cherrypy.tools.metrics = cherrypy.Tool("on_start_resource", start_request_timer)
+
+
+def check_etag(etag):
+    # Send etag with the response, and respond 304 Not Modified instead
+    # if the client already has it (If-None-Match)
+    cherrypy.response.headers["ETag"] = etag
+    cherrypy.response.headers["Cache-Control"] = "no-cache"
+    cherrypy.lib.cptools.validate_etags()
+
+
+def get_bot_events(u, botId=None, detail=False):
+    # Current status (and detailedState summary) of the bots user u can see
+    # return ({botId: "Running"/"Stopped"}, {botId: summary})
+    status = {}
+    summary = {}
+    for b in list(redball.BOTS.values()):
+        if botId and str(b.id) != str(botId):
+            continue
+
+        if not user.check_privilege(u, "rb_bot_{}_ro".format(b.id)):
+            continue
+
+        status.update({b.id: "Running" if b.isRunning() else "Stopped"})
+        if detail:
+            summary.update({b.id: b.detailedState["summary"] if b.detailedState else ""})
+
+    return status, summary
+
+
+def bot_event_stream(u, botId=None, detail=False):
+    # Server-sent events with the bots whose status or summary changed
+    # The stream sleeps until a bot event, so idle bots cost a keepalive now and then
+    yield "retry: {}\n\n".format(EVENT_STREAM_RETRY * 1000)
+    sentStatus = {}
+    sentSummary = {}
+    version = None
+    deadline = time.time() + EVENT_STREAM_TIMEOUT
+    while not redball.SHUTDOWN.is_set() and time.time() < deadline:
+        newVersion = bot.wait_bot_event(
+            version, min(EVENT_STREAM_HEARTBEAT, max(0, deadline - time.time()))
+        )
+        if newVersion == version:
+            yield ": keepalive\n\n"
+            continue
+
+        version = newVersion
+        status, summary = get_bot_events(u, botId, detail)
+        events = []
+        changed = {k: v for k, v in status.items() if sentStatus.get(k) != v}
+        if changed:
+            events.append("event: status\ndata: {}\n\n".format(json.dumps(changed)))
+
+        changed = {k: v for k, v in summary.items() if sentSummary.get(k) != v}
+        if changed:
+            events.append(
+                "event: summary\ndata: {}\n\n".format(json.dumps(changed))
+            )
+
+        sentStatus = status
+        sentSummary = summary
+        if events:
+            with EVENT_STREAMS_LOCK:
+                EVENT_STREAMS["events"] += len(events)
+
+            yield "".join(events)
+
+
+def read_log(logId, mode="tail", **kwargs):
+    # Read part of a log for /logdata and /api/v1/logs/<logId>
+    # mode = tail (lines), range (start, length), or search (level, thread, q,
+    # start, limit)
+    # return dict from logreader, or "ERROR: ..." string
+    try:
+        if mode == "tail":
+            return logreader.tail(logId, kwargs.get("lines"))
+        elif mode == "range":
+            return logreader.read_range(
+                logId, kwargs.get("start"), kwargs.get("length")
+            )
+        elif mode == "search":
+            return logreader.search(
+                logId,
+                level=kwargs.get("level"),
+                thread=kwargs.get("thread"),
+                pattern=kwargs.get("q"),
+                start=kwargs.get("start"),
+                limit=kwargs.get("limit"),
+            )
+        else:
+            return "ERROR: Unknown mode: {}".format(mode)
+    except ValueError:
+        return "ERROR: lines, start, length and limit must be numbers."
+    except OSError as e:
+        log.error("Error reading log [{}]: {}".format(logId, e))
+        return "ERROR: Unable to read log: {}".format(e)
+
+
+def log_event_stream(logId, start=None, level=None, thread=None, pattern=None):
+    # Server-sent events with records as they are written to the log
+    # Each event id is the offset to resume from, which the browser sends back
+    # as Last-Event-ID when it reconnects
+    yield "retry: {}\n\n".format(EVENT_STREAM_RETRY * 1000)
+    deadline = time.time() + EVENT_STREAM_TIMEOUT
+    lastSent = time.time()
+    for batch in logreader.follow(
+        logId, start, level, thread, pattern, stop=lambda: time.time() >= deadline
+    ):
+        if batch:
+            with EVENT_STREAMS_LOCK:
+                EVENT_STREAMS["events"] += 1
+
+            yield "id: {}\nevent: records\ndata: {}\n\n".format(
+                batch["end"], json.dumps(batch["records"])
+            )
+            lastSent = time.time()
+        elif time.time() - lastSent >= EVENT_STREAM_HEARTBEAT:
+            yield ": keepalive\n\n"
+            lastSent = time.time()
+
+
+def render_stats():
+    with RENDER_STATS_LOCK:
+        return {
+            k: dict(v, buckets=dict(v["buckets"])) for k, v in RENDER_STATS.items()
+        }
+
+
 def serve_page(templateName, **kwargs):
     """Look up and render template
     """
-    lookup = TemplateLookup(directories=[redball.TEMPLATE_PATH])
+    lookup = get_template_lookup()
+    start = time.time()
     try:
         template = lookup.get_template(templateName)
         return template.render(**kwargs)
@@ -37,9 +353,78 @@ def serve_page(templateName, **kwargs):
                 "errors": "Sorry! An error has occurred while rendering the web template.",
             }
             return lookup.get_template("error.mako").render(**args)
+    finally:
+        log_render_time(templateName, time.time() - start)
+
+
+def get_server_settings(webSettings):
+    # Thread pool and socket settings from Web/Security config
+    def val(key, default):
+        try:
+            return int(next(x["val"] for x in webSettings if x["key"] == key))
+        except (StopIteration, TypeError, ValueError):
+            return default
+
+    settings = {
+        "thread_pool": max(1, val("WEB_THREAD_POOL", 10)),
+        "thread_pool_max": val("WEB_THREAD_POOL_MAX", 30),
+        "socket_queue_size": max(1, val("WEB_SOCKET_QUEUE_SIZE", 20)),
+        "socket_timeout": max(1, val("WEB_SOCKET_TIMEOUT", 10)),
+        "keep_alive_conn_limit": max(0, val("WEB_KEEPALIVE_CONNECTIONS", 10)),
+    }
+    if settings["thread_pool_max"] <= 0:
+        # No limit
+        settings["thread_pool_max"] = -1
+    elif settings["thread_pool_max"] < settings["thread_pool"]:
+        settings["thread_pool_max"] = settings["thread_pool"]
+
+    return settings
+
+
+def get_event_stream_max(settings):
+    # Each open stream holds a server thread, so allow as many streams as the
+    # thread pool can grow to, less EVENT_STREAM_SPARE for page loads and API calls
+    if settings["thread_pool_max"] < 0:
+        # No limit
+        return -1
+
+    return max(1, settings["thread_pool_max"] - EVENT_STREAM_SPARE)
+
+
+def apply_server_settings(server, settings):
+    server.thread_pool = settings["thread_pool"]
+    server.thread_pool_max = settings["thread_pool_max"]
+    server.socket_queue_size = settings["socket_queue_size"]
+    server.socket_timeout = settings["socket_timeout"]
+    server.keepAliveConnLimit = settings["keep_alive_conn_limit"]
+
+
+def adjust_thread_pools():
+    # Grow a server's thread pool (up to WEB_THREAD_POOL_MAX) when every worker is
+    # busy, e.g. with open streams or a slow export, and shrink it back toward
+    # WEB_THREAD_POOL one thread at a time once the rush is over
+    for server in [cherrypy.server, redball.HTTPS_SERVER]:
+        httpserver = getattr(server, "httpserver", None) if server else None
+        pool = getattr(httpserver, "requests", None)
+        if not pool or not getattr(pool, "_threads", None):
+            continue
+
+        # Applied here since cheroot's server is created when it starts
+        httpserver.keep_alive_conn_limit = getattr(server, "keepAliveConnLimit", 10)
+        idle = pool.idle
+        if idle == 0 and len(pool._threads) < pool.max:
+            log.debug(
+                "All {} web server threads are busy, adding more...".format(
+                    len(pool._threads)
+                )
+            )
+            pool.grow(max(1, pool.min // 2))
+        elif idle > WEB_POOL_SPARE and len(pool._threads) > pool.min:
+            pool.shrink(1)
 
 
 def init_webserver(port=None):
+    global WEB_POOL_MONITOR, EVENT_STREAM_MAX
     webSettings = rbConfig.get_sys_config(category="Web/Security")
     proxy_on = next(x["val"] for x in webSettings if x["key"] == "HTTP_PROXY")
     socket_port = (
@@ -58,6 +443,16 @@ def init_webserver(port=None):
         next(int(x["val"]) for x in webSettings if x["key"] == "SESSION_TIMEOUT") * 60
     )
     secure_cookies = (proxy_on or https_on or http_disallow)
+    session_store = next(
+        (x["val"] for x in webSettings if x["key"] == "SESSION_STORE"), "RAM"
+    )
+    server_settings = get_server_settings(webSettings)
+    EVENT_STREAM_MAX = get_event_stream_max(server_settings)
+    gzip_on = next((x["val"] for x in webSettings if x["key"] == "WEB_GZIP"), True)
+    static_cache_seconds = next(
+        (int(x["val"]) for x in webSettings if x["key"] == "WEB_STATIC_CACHE_SECONDS"),
+        86400,
+    )
     log.info(
         "Starting web server on port {} with web root: {}{}{}...".format(
             socket_port,
@@ -70,7 +465,10 @@ def init_webserver(port=None):
         "global": {
             "server.socket_host": "0.0.0.0",
             "server.socket_port": socket_port,
-            "server.thread_pool": 10,
+            "server.thread_pool": server_settings["thread_pool"],
+            "server.thread_pool_max": server_settings["thread_pool_max"],
+            "server.socket_queue_size": server_settings["socket_queue_size"],
+            "server.socket_timeout": server_settings["socket_timeout"],
             "engine.autoreload.on": False,
             "log.screen": False,
             "log.access_file": "",
@@ -78,6 +476,7 @@ def init_webserver(port=None):
             "tools.proxy.on": proxy_on,
             "error_page.default": handle_error,
             "request.error_response": handle_error,
+            "tools.metrics.on": True,
         }
     }
     conf = {
@@ -85,10 +484,20 @@ def init_webserver(port=None):
             "tools.sessions.on": True,
             "tools.sessions.timeout": session_timeout,
             "tools.sessions.secure": secure_cookies,
+            "tools.sessions.storage_class": (
+                sessions.SqliteSession
+                if session_store == "SQLite"
+                else cherrypy.lib.sessions.RamSession
+            ),
             "tools.encode.on": True,
             "tools.decode.on": True,
             "tools.encode.encoding": "utf-8",
+            "tools.gzip.on": gzip_on,
+            "tools.gzip.mime_types": GZIP_MIME_TYPES,
         },
+        # Compressing would hold back events until the buffer fills
+        "/botevents": {"tools.gzip.on": False},
+        "/logfollow": {"tools.gzip.on": False},
         "/favicon.ico": {
             "tools.staticfile.on": True,
             "tools.staticfile.filename": os.path.join(
@@ -112,6 +521,24 @@ def init_webserver(port=None):
             "tools.staticdir.dir": os.path.join(redball.WEB_ROOT, "css"),
         },
     }
+    for x in ["/images", "/img", "/css"]:
+        # Static files don't need a session, and browsers can reuse them
+        # (base.mako adds the version to the stylesheet URL for upgrades)
+        conf[x].update({"tools.sessions.on": False})
+        if static_cache_seconds > 0:
+            conf[x].update(
+                {
+                    "tools.expires.on": True,
+                    "tools.expires.secs": static_cache_seconds,
+                    "tools.response_headers.on": True,
+                    "tools.response_headers.headers": [
+                        (
+                            "Cache-Control",
+                            "public, max-age={}".format(static_cache_seconds),
+                        )
+                    ],
+                }
+            )
 
     if auth_type == "Basic":
         log.debug("Enabling basic authentication.")
@@ -133,11 +560,26 @@ def init_webserver(port=None):
             "tools.sessions.on": False,
             "tools.response_headers.on": True,
             "tools.response_headers.headers": [("Content-Type", "text/json")],
+            "tools.gzip.on": gzip_on,
+            "tools.gzip.mime_types": GZIP_MIME_TYPES,
         }
     }
     cherrypy.config.update(global_conf)
+    apply_server_settings(cherrypy.server, server_settings)
     cherrypy.tree.mount(WebInterface(), config=conf)
     cherrypy.tree.mount(APIv1(), "/api/v1", config=api_conf)
+    cherrypy.tree.mount(
+        Metrics(),
+        "/metrics",
+        config={
+            "/": {
+                "tools.sessions.on": False,
+                "tools.trailing_slash.on": False,
+                "tools.gzip.on": gzip_on,
+                "tools.gzip.mime_types": GZIP_MIME_TYPES,
+            }
+        },
+    )
     if https_on:
         if http_disallow:
             log.info("Disabling HTTP web server per HTTPS_ONLY setting.")
@@ -161,6 +603,7 @@ def init_webserver(port=None):
             redball.HTTPS_SERVER.ssl_certificate = https_cert
             redball.HTTPS_SERVER.ssl_private_key = https_key
             redball.HTTPS_SERVER.ssl_certificate_chain = https_chain
+            apply_server_settings(redball.HTTPS_SERVER, server_settings)
             redball.HTTPS_SERVER.subscribe()
         except Exception as e:
             log.debug("Error starting HTTPS server: {}".format(e))
@@ -169,7 +612,22 @@ def init_webserver(port=None):
         # we need to turn off the HTTPS web server
         redball.HTTPS_SERVER.unsubscribe()
 
+    log.debug(
+        "Web server settings: {}; event stream limit: {}".format(
+            server_settings, EVENT_STREAM_MAX
+        )
+    )
+    if not WEB_POOL_MONITOR:
+        WEB_POOL_MONITOR = cherrypy.process.plugins.Monitor(
+            cherrypy.engine,
+            adjust_thread_pools,
+            frequency=WEB_POOL_CHECK_INTERVAL,
+            name="rb-web-pool",
+        )
+        WEB_POOL_MONITOR.subscribe()
+
     cherrypy.engine.start()
+    adjust_thread_pools()
 
 
 def restart_webServer():
@@ -184,15 +642,16 @@ def restart_webServer():
 
 
 def check_auth(*args, **kwargs):
-    webSettings = rbConfig.get_sys_config(category="Web/Security")
-    auth_type = next(x["val"] for x in webSettings if x["key"] == "AUTH_TYPE")
+    auth_type = rbConfig.get_sys_config(category="Web/Security", key="AUTH_TYPE")[0][
+        "val"
+    ]
     if auth_type != "Form":
         return True
 
     log.debug("Checking authentication against session: {}".format(cherrypy.session.items()))
     u = cherrypy.session.get("_cp_username")
     if u:
-        if not user.check_privilege(u, "rb_web", refresh=True,):
+        if not user.check_privilege(u, "rb_web"):
             log.warning(
                 "User [{}] has insufficient privileges for access to web UI.".format(u,)
             )
@@ -208,6 +667,43 @@ def check_auth(*args, **kwargs):
         raise cherrypy.HTTPRedirect("/login?r={}".format(r))
 
 
+def authorize_apikey(key):
+    # Return True if key belongs to a user with API access
+    if key in ["", None]:
+        return False
+
+    u = user.get_apikey_user(key)
+    if u in [None, {}]:
+        return False
+
+    if not user.check_privilege(u.get("userid"), "rb_api"):
+        log.warning(
+            "Received API call, but user [{}] has insufficient privileges ({}).".format(
+                u.get("userid"), u.get("privileges"),
+            )
+        )
+        return False
+    else:
+        log.debug("API call authorized for user [{}].".format(u["userid"]))
+        return True
+
+
+def get_stats():
+    # Runtime stats for the platform, returned by /api/v1/stats
+    return {
+        "database": {"connections": database.pool_stats()},
+        "config_cache": rbConfig.cache_stats(),
+        "auth_cache": user.auth_cache_stats(),
+        "api_cache": apicache.cache_stats(),
+        "identity_cache": user.identity_cache_stats(),
+        "sessions": sessions.session_stats(),
+        "bot_modules": bot.get_bot_module_info(),
+        "templates": render_stats(),
+        "event_streams": event_stream_stats(),
+        "log_queues": logger.queue_stats(),
+    }
+
+
 def handle_error(**kwargs):
     args = {
         "title": "Error: {}".format(kwargs.get("status")),
@@ -305,6 +801,7 @@ class WebInterface(object):
                                 userid
                             )
                         )
+                        user.rehash_password(u["id"], kwargs["login|password"], pwh)
                         local_args.update(
                             {
                                 "info": "You have successfully logged in as {}. Welcome!".format(
@@ -318,16 +815,7 @@ class WebInterface(object):
                             {"_cp_username": userid, "_cp_loginTime": time.time()}
                         )
                         cherrypy.request.login = userid
-                        redball.LOGGED_IN_USERS.update(
-                            {
-                                userid: {
-                                    "PRIVS": user.get_user_info(
-                                        userid=userid, field="privileges"
-                                    ),
-                                    "privDate": time.time(),
-                                }
-                            }
-                        )
+                        user.load_identity(userid, u)
                         user.log_login(u["id"])
                         if r:
                             log.debug("redirecting to {}".format(r))
@@ -355,8 +843,7 @@ class WebInterface(object):
         u = cherrypy.session.get("_cp_username")
         cherrypy.session.clear()
         cherrypy.request.login = None
-        if u in redball.LOGGED_IN_USERS.keys():
-            redball.LOGGED_IN_USERS.pop(u)
+        user.clear_identity(u)
 
         raise cherrypy.HTTPRedirect("/login?from=logout")
 
@@ -381,9 +868,9 @@ class WebInterface(object):
                     "Received start command for bot id {}, but user [{}] has insufficient privileges: {}.".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -431,9 +918,9 @@ class WebInterface(object):
                     "Received stop command for bot id {}, but user [{}] has insufficient privileges: {}.".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -478,9 +965,9 @@ class WebInterface(object):
                 log.warning(
                     "Received create bot command, but user [{}] has insufficient privileges: {}.".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -505,21 +992,12 @@ class WebInterface(object):
                     if cherrypy.session.get("_cp_username") != "authOff":
                         redball.BOTS.update({str(newBot.id): newBot})
                         # Grant rw access to the bot creator
-                        redball.LOGGED_IN_USERS[cherrypy.session.get("_cp_username")][
-                            "PRIVS"
-                        ].append("rb_bot_{}_rw".format(newBot.id))
-                        q = (
-                            "UPDATE rb_users SET privileges = ? WHERE userid=?;",
-                            (
-                                json.dumps(
-                                    redball.LOGGED_IN_USERS[
-                                        cherrypy.session.get("_cp_username")
-                                    ]["PRIVS"]
-                                ),
-                                cherrypy.session.get("_cp_username"),
-                            ),
+                        user.grant_privilege(
+                            cherrypy.session.get("_cp_username"),
+                            "rb_bot_{}_rw".format(newBot.id),
                         )
-                        database.db_qry(q, commit=True, closeAfter=True)
+                        user.clear_privilege_index()
+                        redball.notify_supervisor()
         elif kwargs.get("action") == "delete" and bot_id:
             if not user.check_privilege(
                 cherrypy.session.get("_cp_username"),
@@ -530,9 +1008,9 @@ class WebInterface(object):
                     "Received delete command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -554,9 +1032,9 @@ class WebInterface(object):
                     "Received edit command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -584,9 +1062,9 @@ class WebInterface(object):
                     "Received save command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -620,9 +1098,9 @@ class WebInterface(object):
                     "Received save config command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -679,9 +1157,9 @@ class WebInterface(object):
                     "Received add category command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -708,9 +1186,9 @@ class WebInterface(object):
                     "Received delete config command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -732,9 +1210,9 @@ class WebInterface(object):
                     "Received upload config command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -829,9 +1307,9 @@ class WebInterface(object):
                     "Received export config command for bot id {}, but user [{}] has insufficient privileges ({}).".format(
                         bot_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -888,6 +1366,30 @@ class WebInterface(object):
 
             return json.dumps(botStatus)
 
+    @cherrypy.expose()
+    @cherrypy.tools.auth()
+    def botevents(self, botId=None, detail=None):
+        # Push bot status (and detailedState summary if detail=1) as it changes,
+        # instead of polling botstatus and botdetailedstate
+        if botId and not redball.BOTS.get(botId):
+            raise cherrypy.HTTPError(404, "Bot not found.")
+
+        if not open_event_stream():
+            # Too many streams open, the page will fall back to polling
+            raise cherrypy.HTTPError(503, "Too many open status streams.")
+
+        cherrypy.response.headers["Content-Type"] = "text/event-stream"
+        cherrypy.response.headers["Cache-Control"] = "no-cache"
+        cherrypy.response.headers["X-Accel-Buffering"] = "no"
+        return bot_event_stream(
+            cherrypy.session.get("_cp_username"), botId, detail in ["1", "true"]
+        )
+
+    # Don't hold the session lock for the life of the stream
+    botevents._cp_config.update(
+        {"response.stream": True, "tools.sessions.locking": "explicit"}
+    )
+
     @cherrypy.expose()
     @cherrypy.tools.auth()
     def botdetailedstate(self, botId=None):
@@ -897,22 +1399,33 @@ class WebInterface(object):
             ):
                 return "{}"
 
-            return json.dumps(
-                {
-                    botId: redball.BOTS[botId].detailedState["summary"]
-                    if redball.BOTS[botId].detailedState
-                    else ""
-                }
+            b = redball.BOTS[botId]
+            check_etag('"{}-{}:{}"'.format(bot.STATE_EPOCH, b.id, b.summaryVersion))
+            return b.state_json(
+                "summary",
+                lambda: {
+                    botId: b.detailedState["summary"] if b.detailedState else ""
+                },
             )
         else:
-            botState = {}
-            for b in redball.BOTS.values():
+            bots = [
+                b
+                for b in list(redball.BOTS.values())
                 if user.check_privilege(
                     cherrypy.session.get("_cp_username"), "rb_bot_{}_ro".format(b.id)
-                ):
-                    botState.update(
-                        {b.id: b.detailedState["summary"] if b.detailedState else ""}
-                    )
+                )
+            ]
+            check_etag(
+                '"{}-{}"'.format(
+                    bot.STATE_EPOCH,
+                    ".".join("{}:{}".format(b.id, b.summaryVersion) for b in bots),
+                )
+            )
+            botState = {}
+            for b in bots:
+                botState.update(
+                    {b.id: b.detailedState["summary"] if b.detailedState else ""}
+                )
 
             return json.dumps(botState)
 
@@ -969,9 +1482,9 @@ class WebInterface(object):
                 log.warning(
                     "Received save config command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1010,6 +1523,16 @@ class WebInterface(object):
                             logSettings
                         )
                     )
+                    logger.set_queue_options(
+                        logSettings.get("LOG_QUEUE"),
+                        logSettings.get("LOG_QUEUE_SIZE"),
+                        logSettings.get("LOG_QUEUE_OVERFLOW"),
+                    )
+                    logger.set_format_options(
+                        logSettings.get("LOG_FORMAT"),
+                        logSettings.get("LOG_RATE_LIMIT"),
+                        logSettings.get("LOG_RATE_INTERVAL"),
+                    )
                     redball.log = logger.init_logger(
                         logger_name="",
                         log_to_console=logSettings["LOG_TO_CONSOLE"],
@@ -1064,9 +1587,9 @@ class WebInterface(object):
                 log.warning(
                     "Received create bot type command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1096,9 +1619,9 @@ class WebInterface(object):
                 log.warning(
                     "Received delete bot type command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1117,9 +1640,9 @@ class WebInterface(object):
                 log.warning(
                     "Received edit bot type command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1144,9 +1667,9 @@ class WebInterface(object):
                 log.warning(
                     "Received save bot type command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1169,9 +1692,9 @@ class WebInterface(object):
                 log.warning(
                     "Received create reddit auth command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1204,9 +1727,9 @@ class WebInterface(object):
                 log.warning(
                     "Received delete reddit auth command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1225,9 +1748,9 @@ class WebInterface(object):
                 log.warning(
                     "Received edit reddit auth command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1250,9 +1773,9 @@ class WebInterface(object):
                 log.warning(
                     "Received save reddit auth command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1278,9 +1801,9 @@ class WebInterface(object):
                 log.warning(
                     "Received authorize reddit auth command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1314,9 +1837,9 @@ class WebInterface(object):
                 log.warning(
                     "Received create user command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1359,9 +1882,9 @@ class WebInterface(object):
                     "Received edit user {} command, but user [{}] has insufficient privileges ({}).".format(
                         user_id,
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1384,9 +1907,9 @@ class WebInterface(object):
                 log.warning(
                     "Received save user command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1420,9 +1943,9 @@ class WebInterface(object):
                 log.warning(
                     "Received delete user command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1479,9 +2002,9 @@ class WebInterface(object):
                 log.warning(
                     "Received save user command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1521,9 +2044,9 @@ class WebInterface(object):
                 log.warning(
                     "Received download log command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1552,9 +2075,9 @@ class WebInterface(object):
                 log.warning(
                     "Received delete log command, but user [{}] has insufficient privileges ({}).".format(
                         cherrypy.session.get("_cp_username"),
-                        redball.LOGGED_IN_USERS.get(
-                            cherrypy.session.get("_cp_username"), {}
-                        ).get("PRIVS", []),
+                        user.get_identity_privileges(
+                            cherrypy.session.get("_cp_username")
+                        ),
                     )
                 )
                 local_args.update(
@@ -1594,6 +2117,52 @@ class WebInterface(object):
 
         return serve_page(templateName="logs.mako", **local_args)
 
+    @cherrypy.expose()
+    @cherrypy.tools.auth()
+    def logdata(self, logId=None, mode="tail", **kwargs):
+        # Part of a log as JSON, see read_log()
+        if not user.check_privilege(cherrypy.session.get("_cp_username"), "rb_log_ro"):
+            return json.dumps({"error": "Insufficient privileges."})
+
+        result = read_log(logId, mode, **kwargs)
+        if isinstance(result, str):
+            return json.dumps({"error": result.replace("ERROR: ", "", 1)})
+
+        return json.dumps(result)
+
+    @cherrypy.expose()
+    @cherrypy.tools.auth()
+    def logfollow(self, logId=None, start=None, level=None, thread=None, q=None):
+        # Stream records as they are written to the log, starting at byte offset
+        # start (default: the end of the log), filtered by level, thread and q
+        if not user.check_privilege(cherrypy.session.get("_cp_username"), "rb_log_ro"):
+            raise cherrypy.HTTPError(403, "Insufficient privileges.")
+
+        if not logreader.get_log_path(logId):
+            raise cherrypy.HTTPError(404, "Invalid log specified.")
+
+        try:
+            logreader.get_filter(level, thread, q)
+            if cherrypy.request.headers.get("Last-Event-ID"):
+                start = int(cherrypy.request.headers["Last-Event-ID"])
+            elif start not in [None, ""]:
+                start = int(start)
+        except ValueError as e:
+            raise cherrypy.HTTPError(400, str(e))
+
+        if not open_event_stream():
+            raise cherrypy.HTTPError(503, "Too many open streams.")
+
+        cherrypy.response.headers["Content-Type"] = "text/event-stream"
+        cherrypy.response.headers["Cache-Control"] = "no-cache"
+        cherrypy.response.headers["X-Accel-Buffering"] = "no"
+        return log_event_stream(logId, start, level, thread, q)
+
+    # Don't hold the session lock for the life of the stream
+    logfollow._cp_config.update(
+        {"response.stream": True, "tools.sessions.locking": "explicit"}
+    )
+
     @cherrypy.expose()
     @cherrypy.tools.auth()
     def password(self, user_id=None, *args, **kwargs):
@@ -1627,9 +2196,7 @@ class WebInterface(object):
             log.warning(
                 "Received change password command (with user_id specified), but user [{}] has insufficient privileges ({}).".format(
                     cherrypy.session.get("_cp_username"),
-                    redball.LOGGED_IN_USERS.get(
-                        cherrypy.session.get("_cp_username"), {}
-                    ).get("PRIVS", []),
+                    user.get_identity_privileges(cherrypy.session.get("_cp_username")),
                 )
             )
             user_id = None
@@ -1689,6 +2256,7 @@ class WebInterface(object):
                     (user.hash_password(kwargs["password|new"]), u["id"],),
                 )
                 pwresult = database.db_qry(pwq, commit=True, closeAfter=True)
+                user.clear_auth_cache()
                 if isinstance(pwresult, str):
                     local_args.update(
                         {
@@ -1717,9 +2285,7 @@ class WebInterface(object):
             log.warning(
                 "Received reddit authorization callback, but user [{}] has insufficient privileges ({}).".format(
                     cherrypy.session.get("_cp_username"),
-                    redball.LOGGED_IN_USERS.get(
-                        cherrypy.session.get("_cp_username"), {}
-                    ).get("PRIVS", []),
+                    user.get_identity_privileges(cherrypy.session.get("_cp_username")),
                 )
             )
             return serve_page(
@@ -1781,7 +2347,7 @@ class APIv1(object):
         response = {}
         errors = []
         if kwargs.get("apikey") and self._authorize(kwargs["apikey"]):
-            u = user.get_user_info(apikey=kwargs["apikey"])
+            u = user.get_apikey_user(kwargs["apikey"])
             if len(args):
                 try:
                     if args[0].lower() == "bots":
@@ -1811,6 +2377,34 @@ class APIv1(object):
                                 # Insufficient privileges
                                 errors.append(self._status(403))
                                 return self._prep(errors=errors)
+                            elif redball.BOTS.get(args[1]):
+                                # Serialize the bot only when its state, info,
+                                # config or status changed
+                                b = redball.BOTS[args[1]]
+                                key = (
+                                    "api",
+                                    b.infoVersion,
+                                    rbConfig.get_cache_gen(args[1]),
+                                    "r" if b.isRunning() else "s",
+                                )
+                                check_etag(b.state_etag(*key[1:]))
+
+                                def build():
+                                    bt = bot.get_bots(args[1])
+                                    bt.update(
+                                        {
+                                            "config": rbConfig.get_bot_config(
+                                                args[1],
+                                                excludeSysFields=True,
+                                                sortByCategory=True,
+                                            )
+                                        }
+                                    )
+                                    return {"bots": [bt]}
+
+                                return self._prep(
+                                    rawResponse=b.state_json(key, build)
+                                )
                             else:
                                 bt = bot.get_bots(args[1])
                                 bt.update(
@@ -1979,9 +2573,59 @@ class APIv1(object):
                                 # Too many args
                                 errors.append(self._status(400))
                                 return self._prep(errors=errors)
+                    elif args[0].lower() == "logs":
+                        if not user.check_privilege(u["userid"], "rb_log_ro"):
+                            log.warning(
+                                "Received API call for logs, but user [{}] has insufficient privileges ({}).".format(
+                                    u["userid"], u["privileges"],
+                                )
+                            )
+                            # Insufficient privileges
+                            errors.append(self._status(403))
+                            return self._prep(errors=errors)
+                        elif len(args) == 1:
+                            # List log files
+                            response.update({"logs": logreader.list_logs()})
+                        elif len(args) == 2:
+                            # Read part of a log
+                            if not logreader.get_log_path(args[1]):
+                                errors.append(self._status(404))
+                                return self._prep(errors=errors)
+
+                            result = read_log(
+                                args[1], kwargs.pop("mode", "tail"), **kwargs
+                            )
+                            if isinstance(result, str):
+                                errors.extend([self._status(400), result])
+                                return self._prep(errors=errors)
+
+                            response.update({"log": result})
+                        else:
+                            # Too many args
+                            errors.append(self._status(400))
+                            return self._prep(errors=errors)
+                    elif args[0].lower() == "stats":
+                        if not user.check_privilege(u["userid"], "rb_config_ro"):
+                            log.warning(
+                                "Received API call for platform stats, but user [{}] has insufficient privileges ({}).".format(
+                                    u["userid"], u["privileges"],
+                                )
+                            )
+                            # Insufficient privileges
+                            errors.append(self._status(403))
+                            return self._prep(errors=errors)
+                        elif len(args) == 1:
+                            response.update({"stats": get_stats()})
+                        else:
+                            # Too many args
+                            errors.append(self._status(400))
+                            return self._prep(errors=errors)
                     else:
                         errors.append(self._status(400))
                         return self._prep(errors=errors)
+                except cherrypy.HTTPRedirect:
+                    # 304 Not Modified
+                    raise
                 except Exception as e:
                     # Exception encountered while processing request
                     log.debug("Error processing API call: {}".format(e))
@@ -2010,7 +2654,7 @@ class APIv1(object):
         response = {}
         errors = []
         if kwargs.get("apikey") and self._authorize(kwargs["apikey"]):
-            u = user.get_user_info(apikey=kwargs["apikey"])
+            u = user.get_apikey_user(kwargs["apikey"])
             if len(args):
                 try:
                     if args[0].lower() == "bots":
@@ -2047,21 +2691,11 @@ class APIv1(object):
                                     redball.BOTS.update({str(newBot.id): newBot})
                                     response.update({"bots": [{"id": newBot.id}]})
                                     # Grant rw access to the bot creator
-                                    redball.LOGGED_IN_USERS[
-                                        cherrypy.session.get("_cp_username")
-                                    ]["PRIVS"].append("rb_bot_{}_rw".format(newBot.id))
-                                    q = (
-                                        "UPDATE rb_users SET privileges = ? WHERE userid=?;",
-                                        (
-                                            json.dumps(
-                                                redball.LOGGED_IN_USERS[
-                                                    cherrypy.session.get("_cp_username")
-                                                ]["PRIVS"]
-                                            ),
-                                            cherrypy.session.get("_cp_username"),
-                                        ),
+                                    user.grant_privilege(
+                                        u["userid"], "rb_bot_{}_rw".format(newBot.id)
                                     )
-                                    database.db_qry(q, commit=True, closeAfter=True)
+                                    user.clear_privilege_index()
+                                    redball.notify_supervisor()
                         elif len(args) == 3:
                             if not user.check_privilege(
                                 u["userid"], "rb_bot_{}_rw".format(args[1])
@@ -2202,7 +2836,7 @@ class APIv1(object):
         response = {}
         errors = []
         if kwargs.get("apikey") and self._authorize(kwargs["apikey"]):
-            u = user.get_user_info(apikey=kwargs["apikey"])
+            u = user.get_apikey_user(kwargs["apikey"])
             if len(args):
                 try:
                     if args[0].lower() == "bots":
@@ -2390,7 +3024,7 @@ class APIv1(object):
         response = {}
         errors = []
         if kwargs.get("apikey") and self._authorize(kwargs["apikey"]):
-            u = user.get_user_info(apikey=kwargs["apikey"])
+            u = user.get_apikey_user(kwargs["apikey"])
             if len(args):
                 try:
                     if args[0].lower() == "bots":
@@ -2495,30 +3129,10 @@ class APIv1(object):
         return self._prep(response=response, errors=errors)
 
     def _authorize(self, key):
-        if key in ["", None]:
-            return False
-
-        u = user.get_user_info(apikey=key)
-        if u in [None, {}]:
-            return False
+        return authorize_apikey(key)
 
-        if u["userid"] not in redball.LOGGED_IN_USERS.keys():
-            redball.LOGGED_IN_USERS.update(
-                {u["userid"]: {"PRIVS": u["privileges"], "privDate": time.time()}}
-            )
-
-        if not user.check_privilege(u.get("userid"), "rb_api"):
-            log.warning(
-                "Received API call, but user [{}] has insufficient privileges ({}).".format(
-                    u.get("userid"), u.get("privileges"),
-                )
-            )
-            return False
-        else:
-            log.debug("API call authorized for user [{}].".format(u["userid"]))
-            return True
-
-    def _prep(self, response=None, errors=None):
+    def _prep(self, response=None, errors=None, rawResponse=None):
+        # rawResponse = response already serialized to JSON
         data = {
             "meta": {"api_version": 1, "timestamp": time.time()},
             "errors": "",
@@ -2530,6 +3144,11 @@ class APIv1(object):
         if response:
             data.update({"response": response})
 
+        if rawResponse:
+            # response is the last key, so splice the JSON in place of it
+            data.update({"response": None})
+            return json.dumps(data)[: -len("null}")] + rawResponse + "}"
+
         return json.dumps(data)
 
     def _status(self, status_code=200):
@@ -2555,3 +3174,34 @@ class APIv1(object):
             cherrypy.response.status = code_lookup[status_code]
 
         return code_lookup[status_code]
+
+
+class Metrics(object):
+    # Metrics for Prometheus to scrape, in its text format.
+    # Unless web authentication is disabled, requires the API key of a user with
+    # rb_api and rb_config_ro privileges, as ?apikey=<key>
+    # or an Authorization: Bearer <key> header.
+    @cherrypy.expose()
+    def index(self, apikey=None):
+        if (
+            rbConfig.get_sys_config(category="Web/Security", key="AUTH_TYPE")[0]["val"]
+            != "None"
+        ):
+            authHeader = cherrypy.request.headers.get("Authorization", "")
+            if not apikey and authHeader.lower().startswith("bearer "):
+                apikey = authHeader[7:].strip()
+
+            if not apikey or not authorize_apikey(apikey):
+                raise cherrypy.HTTPError(401, "Valid API key required.")
+
+            u = user.get_apikey_user(apikey)
+            if not user.check_privilege(u["userid"], "rb_config_ro"):
+                log.warning(
+                    "Received metrics request, but user [{}] has insufficient privileges ({}).".format(
+                        u["userid"], u["privileges"],
+                    )
+                )
+                raise cherrypy.HTTPError(403, "Insufficient privileges.")
+
+        cherrypy.response.headers["Content-Type"] = metrics.CONTENT_TYPE
+        return metrics.render()
@@ -2,8 +2,6 @@
     import cherrypy
     import redball
     from redball import config, user
-    if cherrypy.session.get("_cp_username") and cherrypy.session["_cp_username"] in redball.LOGGED_IN_USERS.keys():
-        user.refresh_user_privileges(cherrypy.session["_cp_username"])
     auth_type = config.get_sys_config(category="Web/Security", key="AUTH_TYPE")
     wideOpen = auth_type[0]["val"] == "None"
     basicAuth = auth_type[0]["val"] == "Basic"
@@ -18,7 +16,7 @@
 <head>
 <meta http-equiv="Content-Type" content="text/html; charset=utf-8" />
 <title>${title} | <%block name="siteHeader">redball</%block></title>
-<link href="/css/style.css" rel="stylesheet" type="text/css" />
+<link href="/css/style.css?v=${redball.__version__}" rel="stylesheet" type="text/css" />
 <script src="//ajax.googleapis.com/ajax/libs/jquery/3.4.1/jquery.min.js"></script>
 <link rel="stylesheet" href="//ajax.googleapis.com/ajax/libs/jqueryui/1.12.1/themes/smoothness/jquery-ui.css" />
 <script src="//ajax.googleapis.com/ajax/libs/jqueryui/1.12.1/jquery-ui.min.js"></script>
@@ -4,24 +4,29 @@
 	import redball
 	from redball import config, user
 
-	if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_rw'):
-		priv = 3
-	elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_startstop'):
-		priv = 2
-	elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_ro'):
-		priv = 1
-	else:
-		priv = 0
+	# Module-level code runs once per compiled template, so privileges are checked per render
+	def get_privs():
+		if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_rw'):
+			priv = 3
+		elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_startstop'):
+			priv = 2
+		elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_all_ro'):
+			priv = 1
+		else:
+			priv = 0
 
-	explicitPrivCount = sum(1 for x in redball.BOTS.values() if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_{}_startstop'.format(x.id)) or user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_{}_ro'.format(x.id)))
+		explicitPrivCount = sum(1 for x in redball.BOTS.values() if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_{}_startstop'.format(x.id)) or user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_bot_{}_ro'.format(x.id)))
+		return (priv, explicitPrivCount)
 %>
 
 <%block name="topright">
+<% (priv, explicitPrivCount) = get_privs() %>
 	% if priv > 0 or explicitPrivCount > 0:
 	<div id="botStatus_autoRefresh" name="botStatus_autoRefresh" class="refreshInterval">
 		<label for="botStatus_refreshInterval">Auto Refresh Bot Status:</label>
 		<select name="botStatus_refreshInterval" id="botStatus_refreshInterval" class="text ui-widget-content ui-corner-all" title="Warning: enabling auto refresh will prevent your session from timing out.">
 			<option value="0" selected="selected">None</option>
+			<option value="live">Live</option>
 			<option value="5">5 Seconds</option>
 			<option value="15">15 Seconds</option>
 			<option value="30">30 Seconds</option>
@@ -37,6 +42,7 @@
 </%block>
 
 <%block name="content">
+<% (priv, explicitPrivCount) = get_privs() %>
 	% if priv > 0 or explicitPrivCount > 0:
 	<% redditAuths = config.get_redditAuths() %>
 	% if bot_id == None:
@@ -346,90 +352,121 @@
 	% endif
 </%block>
 <%block name="pagejs">
+<% (priv, explicitPrivCount) = get_privs() %>
 % if priv > 0 or explicitPrivCount > 0:
 <script>
+	function applyBotStatus(botStatus) {
+		Object.keys(botStatus).forEach( function(botId) {
+			if (botStatus.hasOwnProperty(botId)) {
+				var oldStatus = $('#botStatus_'+botId).html()
+				if (botStatus[botId] != oldStatus) {
+					$('#botStatus_'+botId).html(botStatus[botId]);
+					if (botStatus[botId] == 'Running') {
+						$('#botStatus_'+botId).removeClass('redBold').addClass('greenBold');
+						$('#botStatus_'+botId).effect("highlight", {color:'#0f0'}, 3000);
+					}
+					else {
+						$('#botStatus_'+botId).removeClass('greenBold').addClass('redBold');
+						$('#botStatus_'+botId).effect("highlight", {color:'#f00'}, 3000);
+					}
+				} else {
+					$('#botStatus_'+botId).effect("highlight", {color:'#ddd'}, 500);
+				}
+			}
+		});
+	}
 	function refreshBotStatus(extraParam='') {
 		if(extraParam != ''){sep = '&'}
 		else{sep = ''}
 		$.ajax({
 			url: '/botstatus?' + extraParam + sep + '${'botId={}'.format(bot_id) if bot_id != None else ''}', 
 			success: function(data) {
-				var botStatus = JSON.parse(data)
-				Object.keys(botStatus).forEach( function(botId) {
-					if (botStatus.hasOwnProperty(botId)) {
-						var oldStatus = $('#botStatus_'+botId).html()
-						if (botStatus[botId] != oldStatus) {
-							$('#botStatus_'+botId).html(botStatus[botId]);
-							if (botStatus[botId] == 'Running') {
-								$('#botStatus_'+botId).removeClass('redBold').addClass('greenBold');
-								$('#botStatus_'+botId).effect("highlight", {color:'#0f0'}, 3000);
-							}
-							else {
-								$('#botStatus_'+botId).removeClass('greenBold').addClass('redBold');
-								$('#botStatus_'+botId).effect("highlight", {color:'#f00'}, 3000);
-							}
-						} else {
-							$('#botStatus_'+botId).effect("highlight", {color:'#ddd'}, 500);
-						}
-					}
-				});
+				applyBotStatus(JSON.parse(data));
 			}
 		});
 	}
 	% if bot_id is not None:
+	function applyBotDetailedState(botStatus) {
+		Object.keys(botStatus).forEach( function(botId) {
+			if (botStatus.hasOwnProperty(botId)) {
+				var oldStatus = $('#botDetailedStateSummary_'+botId).html()
+				if (botStatus[botId]['html'] != oldStatus) {
+					$('#botDetailedStateSummary_'+botId).html(botStatus[botId]['html']);
+					$('#botDetailedStateSummary_'+botId).effect("highlight", {color:'#ddd'}, 3000);
+				} else {
+					$('#botDetailedStateSummary_'+botId).effect("highlight", {color:'#ddd'}, 500);
+				}
+			}
+		});
+	}
 	function refreshBotDetailedState(extraParam='') {
 		if(extraParam != ''){sep = '&'}
 		else{sep = ''}
 		$.ajax({
 			url: '/botdetailedstate?' + extraParam + sep + '${'botId={}'.format(bot_id) if bot_id != None else ''}', 
 			success: function(data) {
-				var botStatus = JSON.parse(data)
-				Object.keys(botStatus).forEach( function(botId) {
-					if (botStatus.hasOwnProperty(botId)) {
-						var oldStatus = $('#botDetailedStateSummary_'+botId).html()
-						if (botStatus[botId]['html'] != oldStatus) {
-							$('#botDetailedStateSummary_'+botId).html(botStatus[botId]['html']);
-							$('#botDetailedStateSummary_'+botId).effect("highlight", {color:'#ddd'}, 3000);
-						} else {
-							$('#botDetailedStateSummary_'+botId).effect("highlight", {color:'#ddd'}, 500);
-						}
-					}
-				});
+				applyBotDetailedState(JSON.parse(data));
 			}
 		});
 	}
 	% endif
+	var refreshTimeout;
+	% if bot_id is not None:
+	var refreshTimeout_detailedState;
+	% endif
+	var botEvents;
+	function startPolling(interval) {
+		refreshTimeout = setInterval(refreshBotStatus, interval*1000);
+		% if bot_id is not None:
+		refreshTimeout_detailedState = setInterval(refreshBotDetailedState, interval*1000);
+		% endif
+	}
+	function startBotEvents() {
+		// server pushes status changes as they happen; poll if the stream is unavailable
+		if (typeof(EventSource) == 'undefined') {
+			startPolling(15);
+			return;
+		}
+		botEvents = new EventSource('/botevents?${'botId={}&detail=1'.format(bot_id) if bot_id != None else ''}');
+		botEvents.addEventListener('status', function(e) {
+			applyBotStatus(JSON.parse(e.data));
+		});
+		% if bot_id is not None:
+		botEvents.addEventListener('summary', function(e) {
+			applyBotDetailedState(JSON.parse(e.data));
+		});
+		% endif
+		botEvents.onerror = function() {
+			if (botEvents.readyState == EventSource.CLOSED) {
+				botEvents = undefined;
+				startPolling(15);
+			}
+		};
+	}
+	function startAutoRefresh() {
+		clearInterval(refreshTimeout);
+		% if bot_id is not None:
+		clearInterval(refreshTimeout_detailedState);
+		% endif
+		if (botEvents != undefined) {
+			botEvents.close();
+			botEvents = undefined;
+		}
+		var interval = $("#botStatus_refreshInterval").val();
+		if (interval == 'live') {
+			startBotEvents();
+		} else if (interval && interval != '0') {
+			startPolling(parseInt(interval));
+		}
+	}
 	$(document).ready(function() {
 		// bot status auto refresh settings
 		if (Cookies.get('rb_autoRefreshInterval') != undefined) {
 			$("#botStatus_refreshInterval").val(Cookies.get('rb_autoRefreshInterval'));
 		}
-		if ($("#botStatus_refreshInterval").val() == '0') {
-			var refreshTimeout;
-			% if bot_id is not None:
-			var refreshTimeout_detailedState;
-			% endif
-		} else {
-			var refreshTimeout = setInterval(refreshBotStatus, parseInt($("#botStatus_refreshInterval").val())*1000);
-			% if bot_id is not None:
-			var refreshTimeout_detailedState = setInterval(refreshBotDetailedState, parseInt($("#botStatus_refreshInterval").val())*1000);
-			% endif
-		}
+		startAutoRefresh();
 		botStatus_refreshInterval.onchange = function() {
-												clearInterval(refreshTimeout);
-												% if bot_id is not None:
-												clearInterval(refreshTimeout_detailedState);
-												% endif
-												if ($("#botStatus_refreshInterval").val() == '0') {
-													// do nothing
-												} else {
-													clearInterval(refreshTimeout);
-													refreshTimeout = setInterval(refreshBotStatus, parseInt($('#botStatus_refreshInterval').val())*1000);
-													% if bot_id is not None:
-													clearInterval(refreshTimeout_detailedState);
-													refreshTimeout_detailedState = setInterval(refreshBotDetailedState, parseInt($('#botStatus_refreshInterval').val())*1000);
-													% endif
-												}
+												startAutoRefresh();
 												Cookies.set('rb_autoRefreshInterval', $("#botStatus_refreshInterval").val());
 											};
 
@@ -2,17 +2,20 @@
 <%! 
 	import cherrypy
 	import redball
-	from redball import config, user
+	from redball import bot, config, user
 
-	if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_config_rw'):
-		priv = 2
-	elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_config_ro'):
-		priv = 1
-	else:
-		priv = 0
+	# Module-level code runs once per compiled template, so privileges are checked per render
+	def get_priv():
+		if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_config_rw'):
+			return 2
+		elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_config_ro'):
+			return 1
+		else:
+			return 0
 %>
 
 <%block name="content">
+<% priv = get_priv() %>
 	% if priv > 0:
 	% if botType_id == None and redditAuth_id == None and user_id == None:
 		<div id="sysConfigGrid" class="configGrid layoutGrid">
@@ -130,6 +133,14 @@
 							<form id="botType-${x['id']}" method="post" action="/config?botType_id=${str(x['id'])}">
 								<strong>Description</strong>: ${x['description']}<br />
 								<strong>Module Name</strong>: ${x['moduleName']}<br />
+								<% modInfo = bot.get_bot_module_info(x['moduleName']) %>
+								% if modInfo and modInfo['loaded']:
+								<strong>Import Time</strong>: ${'{:.2f}'.format(modInfo['importTime'])} seconds (${modInfo['source']})<br />
+								% elif modInfo and modInfo['error']:
+								<strong>Import Error</strong>: ${modInfo['error']}<br />
+								% else:
+								<strong>Import Time</strong>: not imported yet<br />
+								% endif
 								% if priv > 1:
 								<button type="Submit" name="action" value="edit_botType" class="ui-button ui-widget ui-corner-all button-wrench">Edit</button></form>
 								<form id="deleteBotType" method="post" action="/config?botType_id=${str(x['id'])}" onsubmit="return in_use('botType',${str(x['id'])});">
@@ -335,6 +346,7 @@
 	% endif
 </%block>
 <%block name="pagejs">
+<% priv = get_priv() %>
 % if priv > 0:
 <script type='text/javascript'>
 	function copyText(field) {
@@ -5,25 +5,53 @@
 	import redball
 	from redball import user
 
-	if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_log_rw'):
-		priv = 2
-	elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_log_ro'):
-		priv = 1
-	else:
-		priv = 0
+	# Module-level code runs once per compiled template, so privileges are checked per render
+	def get_priv():
+		if user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_log_rw'):
+			return 2
+		elif user.check_privilege(cherrypy.session.get("_cp_username"), 'rb_log_ro'):
+			return 1
+		else:
+			return 0
 %>
 
 <%block name="content">
+<% priv = get_priv() %>
 	% if priv > 0:
 	<% logDirList = os.listdir(redball.LOG_PATH) %>
 	<% used = [] %>
+	<div id="logViewer" class="logViewer hide">
+		<span class="logType" id="logViewer_title"></span>
+		<div class="logViewer_controls">
+			<label for="logViewer_lines">Lines:</label>
+			<input type="text" id="logViewer_lines" value="200" size="5" class="text ui-widget-content ui-corner-all" />
+			<label for="logViewer_level">Level:</label>
+			<select id="logViewer_level" class="text ui-widget-content ui-corner-all">
+				<option value="">All</option>
+				<option value="INFO">Info+</option>
+				<option value="WARNING">Warning+</option>
+				<option value="ERROR">Error+</option>
+			</select>
+			<label for="logViewer_thread">Thread:</label>
+			<input type="text" id="logViewer_thread" size="15" class="text ui-widget-content ui-corner-all" />
+			<label for="logViewer_q">Regex:</label>
+			<input type="text" id="logViewer_q" size="25" class="text ui-widget-content ui-corner-all" />
+			<button type="button" id="logViewer_tail" class="ui-button ui-widget ui-corner-all button-refresh" title="Show the last lines of the log">Tail</button>
+			<button type="button" id="logViewer_search" class="ui-button ui-widget ui-corner-all button-search" title="Search the last 10 MB of the log">Search</button>
+			<input type="checkbox" id="logViewer_follow" />
+			<label for="logViewer_follow" title="Show new records as they are written">Follow</label>
+			<button type="button" id="logViewer_close" class="ui-button ui-widget ui-corner-all button-close">Close</button>
+		</div>
+		<pre id="logViewer_output" class="logViewer_output"></pre>
+	</div>
 	<div id="logsConfigGrid" class="logsGrid layoutGrid">
 		<div class="logs gridItem">
 			<div class="gridItemContent">
 				<span class="logType">System</span>
 				% for f in (f for f in logDirList if 'redball.log' in f):
 					<span class="logFile">
-						<a href="/logs?action=downloadLog&logId=${f}" class="ui-icon ui-widget ui-icon-disk"></a> 
+						<a href="/logs?action=downloadLog&logId=${f}" class="ui-icon ui-widget ui-icon-disk"></a>
+						<a href="#" class="ui-icon ui-widget ui-icon-search" title="View" onclick="return viewLog('${f}');"></a>
 						% if f[-4:] != '.log' and priv > 1:
 							<a href="/logs?action=deleteLog&logId=${f}" class="ui-icon ui-widget ui-icon-trash" onclick="return confirm('Are you sure you want to permanently delete this log file?');"></a>
 						% endif
@@ -39,6 +67,7 @@
 				% for f in (f for f in logDirList if 'access.log' in f or 'error.log' in f):
 					<span class="logFile">
 						<a href="/logs?action=downloadLog&logId=${f}" class="ui-icon ui-widget ui-icon-disk"></a>
+						<a href="#" class="ui-icon ui-widget ui-icon-search" title="View" onclick="return viewLog('${f}');"></a>
 						% if f[-4:] != '.log' and priv > 1:
 							<a href="/logs?action=deleteLog&logId=${f}" class="ui-icon ui-widget ui-icon-trash" onclick="return confirm('Are you sure you want to permanently delete this log file?');"></a>
 						% endif
@@ -56,6 +85,7 @@
 						% for f in (f for f in logDirList if f.find('bot-{}-'.format(b.id))!=-1):
 							<span class="logFile">
 								<a href="/logs?action=downloadLog&logId=${f}" class="ui-icon ui-widget ui-icon-disk"></a>
+								<a href="#" class="ui-icon ui-widget ui-icon-search" title="View" onclick="return viewLog('${f}');"></a>
 								% if (f[-4:] != '.log' or b.name.replace(' ','-') not in f) and priv > 1:
 									<a href="/logs?action=deleteLog&logId=${f}" class="ui-icon ui-widget ui-icon-trash" onclick="return confirm('Are you sure you want to permanently delete this log file?');"></a>
 								% endif
@@ -74,6 +104,7 @@
 					% for f in (f for f in logDirList if f not in used):
 						<span class="logFile">
 							<a href="/logs?action=downloadLog&logId=${f}" class="ui-icon ui-widget ui-icon-disk"></a>
+							<a href="#" class="ui-icon ui-widget ui-icon-search" title="View" onclick="return viewLog('${f}');"></a>
 							% if priv > 1:
 							<a href="/logs?action=deleteLog&logId=${f}" class="ui-icon ui-widget ui-icon-trash" onclick="return confirm('Are you sure you want to permanently delete this log file?');"></a>
 							% endif
@@ -88,4 +119,105 @@
 % else:
 Insufficient privileges.
 % endif
-</%block>
\ No newline at end of file
+</%block>
+<%block name="pagejs">
+<% priv = get_priv() %>
+% if priv > 0:
+<script>
+	var logViewer_logId;
+	var logViewer_events;
+	function logViewer_filters() {
+		return {
+			level: $('#logViewer_level').val(),
+			thread: $('#logViewer_thread').val(),
+			q: $('#logViewer_q').val()
+		};
+	}
+	function logViewer_show(lines, append) {
+		var output = $('#logViewer_output');
+		var atBottom = output.scrollTop() + output.innerHeight() >= output[0].scrollHeight - 5;
+		if (append) {
+			output.text(output.text() + lines.join('\n') + '\n');
+		} else {
+			output.text(lines.length ? lines.join('\n') + '\n' : '');
+		}
+		if (atBottom || !append) {
+			output.scrollTop(output[0].scrollHeight);
+		}
+	}
+	function logViewer_stopFollow() {
+		if (logViewer_events != undefined) {
+			logViewer_events.close();
+			logViewer_events = undefined;
+		}
+	}
+	function logViewer_follow(start) {
+		// new records are pushed by the server as they are written
+		logViewer_stopFollow();
+		if (!$('#logViewer_follow').is(':checked') || typeof(EventSource) == 'undefined') {
+			return;
+		}
+		var params = $.extend({logId: logViewer_logId, start: start}, logViewer_filters());
+		logViewer_events = new EventSource('/logfollow?' + $.param(params));
+		logViewer_events.addEventListener('records', function(e) {
+			var records = JSON.parse(e.data);
+			logViewer_show([].concat.apply([], records), true);
+		});
+	}
+	function logViewer_read(params, follow) {
+		logViewer_stopFollow();
+		$.ajax({
+			url: '/logdata?' + $.param($.extend({logId: logViewer_logId}, params)),
+			success: function(data) {
+				var result = JSON.parse(data);
+				if (result.error) {
+					logViewer_show(['Error: ' + result.error], false);
+					return;
+				}
+				if (result.records) {
+					logViewer_show([].concat.apply([], result.records.map(function(r) { return r.lines; })), false);
+				} else {
+					logViewer_show(result.lines, false);
+				}
+				if (follow) {
+					logViewer_follow(result.size);
+				}
+			}
+		});
+	}
+	function logViewer_tail() {
+		logViewer_read({mode: 'tail', lines: $('#logViewer_lines').val()}, true);
+	}
+	function logViewer_search() {
+		// search the last 10 MB of the log
+		logViewer_read($.extend({mode: 'search', start: -10485760, limit: $('#logViewer_lines').val()}, logViewer_filters()), true);
+	}
+	function viewLog(logId) {
+		logViewer_logId = logId;
+		$('#logViewer_title').text(logId);
+		$('#logViewer').removeClass('hide');
+		logViewer_tail();
+		return false;
+	}
+	$(document).ready(function() {
+		$(".button-search").button({
+			icon: "ui-icon-search"
+		});
+		$('#logViewer_follow').checkboxradio();
+		$('#logViewer_tail').click(logViewer_tail);
+		$('#logViewer_search').click(logViewer_search);
+		$('#logViewer_follow').change(function() {
+			if ($(this).is(':checked')) {
+				logViewer_tail();
+			} else {
+				logViewer_stopFollow();
+			}
+		});
+		$('#logViewer_close').click(function() {
+			logViewer_stopFollow();
+			$('#logViewer').addClass('hide');
+		});
+	});
+</script>
+% endif
+</%block>